@@ -0,0 +1,143 @@
+"""Delta-sync of static files into the output directory.
+
+A destination file is left alone when it already matches its source:
+same inode, or same size and mtime, or (when only the mtime differs) the
+same content hash. Changed files are cloned (reflink, on filesystems that
+support copy-on-write), hardlinked when enabled, or copied, always via a
+temporary file and an atomic rename so a linked output is never modified
+in place. Trees are mirrored by deleting only the stale files.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# ioctl(2) request for a copy-on-write clone of a whole file (linux/fs.h)
+FICLONE = 0x40049409
+
+
+def _digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class AssetSync:
+    """Copies only what changed; counts what it did for the build log."""
+
+    def __init__(self, hardlink: bool = False):
+        self.hardlink = hardlink
+        self.written = 0  # files created or replaced
+        self.unchanged = 0
+        self.removed = 0
+        self.bytes_written = 0
+        self.methods: dict[str, int] = {}  # reflink / hardlink / copy / write -> count
+        self._reflink_ok = fcntl is not None
+        self._hardlink_ok = hardlink
+
+    def matches(self, src: Path, dest: Path) -> bool:
+        """True if dest already has src's content (cheapest test first)."""
+        try:
+            s, d = src.stat(), dest.stat()
+        except FileNotFoundError:
+            return False
+        if (s.st_dev, s.st_ino) == (d.st_dev, d.st_ino):
+            return True
+        if s.st_size != d.st_size:
+            return False
+        if s.st_mtime_ns == d.st_mtime_ns:
+            return True
+        if _digest(src) == _digest(dest):
+            # Same bytes, different mtime: align it so the next run is stat-only.
+            os.utime(dest, ns=(d.st_atime_ns, s.st_mtime_ns))
+            return True
+        return False
+
+    def file(self, src: Path | str, dest: Path | str) -> bool:
+        """Bring dest up to date with src. Returns True if it was written."""
+        src, dest = Path(src), Path(dest)
+        if self.matches(src, dest):
+            self.unchanged += 1
+            return False
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.sync-tmp")
+        tmp.unlink(missing_ok=True)
+        method = self._transfer(src, tmp)
+        tmp.replace(dest)
+        self._count(method, src.stat().st_size)
+        return True
+
+    def write(self, dest: Path | str, content: str | bytes) -> bool:
+        """Write generated content unless dest already holds exactly that."""
+        dest = Path(dest)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        try:
+            if dest.stat().st_size == len(data) and dest.read_bytes() == data:
+                self.unchanged += 1
+                return False
+        except FileNotFoundError:
+            pass
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.sync-tmp")
+        tmp.write_bytes(data)
+        tmp.replace(dest)
+        self._count("write", len(data))
+        return True
+
+    def tree(self, src_dir: Path | str, dest_dir: Path | str) -> None:
+        """Mirror src_dir into dest_dir, deleting only files src_dir lacks."""
+        src_dir, dest_dir = Path(src_dir), Path(dest_dir)
+        wanted = set()
+        for src in src_dir.rglob("*"):
+            if src.is_file():
+                rel = src.relative_to(src_dir)
+                wanted.add(rel)
+                self.file(src, dest_dir / rel)
+        if not dest_dir.exists():
+            return
+        for dest in sorted(dest_dir.rglob("*"), reverse=True):
+            rel = dest.relative_to(dest_dir)
+            if dest.is_file() and rel not in wanted:
+                dest.unlink()
+                self.removed += 1
+            elif dest.is_dir() and not any(dest.iterdir()):
+                dest.rmdir()
+
+    def summary(self) -> str:
+        methods = ", ".join(f"{n} {m}" for m, n in sorted(self.methods.items()))
+        text = f"{self.written} updated, {self.unchanged} unchanged"
+        if self.removed:
+            text += f", {self.removed} removed"
+        if methods:
+            text += f"; {methods}"
+        return text
+
+    def _count(self, method: str, size: int) -> None:
+        self.written += 1
+        self.bytes_written += size
+        self.methods[method] = self.methods.get(method, 0) + 1
+
+    def _transfer(self, src: Path, tmp: Path) -> str:
+        if self._reflink_ok:
+            try:
+                with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                shutil.copystat(src, tmp)
+                return "reflink"
+            except OSError:
+                tmp.unlink(missing_ok=True)
+                self._reflink_ok = False  # not supported here; don't retry
+        if self._hardlink_ok:
+            try:
+                os.link(src, tmp)
+                return "hardlink"
+            except OSError:
+                self._hardlink_ok = False  # e.g. across filesystems
+        shutil.copy2(src, tmp)
+        return "copy"
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Build benchmarks with regression thresholds.
+
+Generates a synthetic site (see synthetic_site.py) and times the build
+stages on it, cold (empty caches, fresh objects) and warm (caches and
+compiled templates in place):
+
+    load_all_data       SiteBuilder.load_all_data
+    parse_page          SiteBuilder.parse_page over every page
+    build_page          SiteBuilder.build_page over every page
+    copy_static_files   SiteBuilder.copy_static_files (CSS, JS, images)
+    validate_all        SiteValidator.validate_all (warm = cache replay)
+
+Warm timings are the best of --repeat runs. Results are compared against
+benchmarks/baselines.json; a metric regresses when it is slower than its
+baseline by more than its threshold (default from the file, overridable
+with --threshold, per-metric overrides under "thresholds").
+
+Usage:
+    python benchmarks/run.py --scale small
+    python benchmarks/run.py --scale medium --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from build import SiteBuilder  # noqa: E402
+from data_loader import DataLoader  # noqa: E402
+from validator import SiteValidator  # noqa: E402
+
+from synthetic_site import SCALES, generate  # noqa: E402
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_THRESHOLD = 0.25
+
+
+def _timed(fn) -> float:
+    """Run fn with the builder's console output suppressed; return seconds."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        fn()
+        return time.perf_counter() - started
+
+
+def _best(fn, repeat: int) -> float:
+    return min(_timed(fn) for _ in range(repeat))
+
+
+def _builder(root: Path) -> SiteBuilder:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return SiteBuilder(project_root=root, data_loader=DataLoader())
+
+
+def run_benchmarks(root: Path, repeat: int = 3) -> dict[str, float]:
+    """Time each stage cold and warm on the site at root."""
+    results: dict[str, float] = {}
+    cache_dir = root / ".build-cache"
+    output_dir = root / "docs"
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    output_dir.mkdir()
+
+    # Data: cold parses every file, warm is a new loader reading the disk cache
+    builder = _builder(root)
+    results["load_all_data.cold"] = _timed(builder.load_all_data)
+    results["load_all_data.warm"] = _best(lambda: _builder(root).load_all_data(), repeat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = builder.load_all_data()
+
+    pages = sorted((root / "content" / "pages").glob("*.md"))
+
+    # Markdown: first pass on a fresh converter, then repeated passes
+    builder = _builder(root)
+    parse_all = lambda: [builder.parse_page(p) for p in pages]  # noqa: E731
+    results["parse_page.cold"] = _timed(parse_all)
+    results["parse_page.warm"] = _best(parse_all, repeat)
+
+    # Static assets before pages, as in SiteBuilder.build (asset() URLs)
+    builder = _builder(root)
+    results["copy_static_files.cold"] = _timed(builder.copy_static_files)
+    results["copy_static_files.warm"] = _best(builder.copy_static_files, repeat)
+
+    # Rendering: cold compiles every template, warm reuses the environment
+    build_all = lambda: [builder.build_page(p.name, data) for p in pages]  # noqa: E731
+    results["build_page.cold"] = _timed(build_all)
+    results["build_page.warm"] = _best(build_all, repeat)
+
+    # Validation: cold checks every file, warm replays the result cache
+    validation_cache = cache_dir / "validation-cache.json"
+    results["validate_all.cold"] = _timed(
+        lambda: SiteValidator(output_dir, cache_path=validation_cache).validate_all())
+    results["validate_all.warm"] = _best(
+        lambda: SiteValidator(output_dir, cache_path=validation_cache, use_cache=True).validate_all(), repeat)
+
+    return results
+
+
+def load_baselines(path: Path = BASELINES) -> dict:
+    if not path.exists():
+        return {"thresholds": {"default": DEFAULT_THRESHOLD}, "scales": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(results: dict[str, float], baselines: dict, scale: str,
+            threshold: float | None = None) -> list[str]:
+    """Print the comparison table; return the metrics that regressed."""
+    thresholds = baselines.get("thresholds", {})
+    default = threshold if threshold is not None else thresholds.get("default", DEFAULT_THRESHOLD)
+    baseline = baselines.get("scales", {}).get(scale, {})
+
+    regressions = []
+    print(f"\n{'metric':<26} {'time':>10} {'baseline':>10} {'change':>9}")
+    print("-" * 58)
+    for metric, seconds in results.items():
+        base = baseline.get(metric)
+        if base is None:
+            print(f"{metric:<26} {seconds * 1000:>8.1f}ms {'—':>10} {'':>9}")
+            continue
+        limit = thresholds.get(metric, default) if threshold is None else threshold
+        change = (seconds - base) / base if base else 0.0
+        flag = ""
+        if change > limit:
+            regressions.append(metric)
+            flag = f"  ❌ > +{limit:.0%}"
+        print(f"{metric:<26} {seconds * 1000:>8.1f}ms {base * 1000:>8.1f}ms {change:>+8.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the site build on a synthetic site")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=3, help="Warm runs per metric (best is kept)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Allowed slowdown as a fraction (overrides baselines.json)")
+    parser.add_argument("--site", help="Generate the synthetic site here and keep it (default: temp dir)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the baseline for --scale")
+    args = parser.parse_args()
+
+    counts = SCALES[args.scale]
+    print(f"📊 Benchmark: {args.scale} ({counts['pages']} pages, {counts['faqs']} FAQs, {counts['images']} images)")
+
+    with tempfile.TemporaryDirectory(prefix="site-bench-") as tmp:
+        root = Path(args.site) if args.site else Path(tmp) / "site"
+        started = time.perf_counter()
+        generate(root, args.scale, args.seed)
+        print(f"   ✓ Generated synthetic site in {time.perf_counter() - started:.1f}s")
+        results = run_benchmarks(root, repeat=args.repeat)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    baselines = load_baselines()
+    regressions = compare(results, baselines, args.scale, args.threshold)
+
+    if args.update_baseline:
+        baselines.setdefault("scales", {})[args.scale] = {k: round(v, 4) for k, v in results.items()}
+        BASELINES.write_text(json.dumps(baselines, indent=2) + "\n", encoding="utf-8")
+        print(f"\n💾 Baseline for '{args.scale}' updated in {BASELINES.name}")
+    elif regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+    else:
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
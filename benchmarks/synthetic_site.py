@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Synthetic site generator for the build benchmarks.
+
+Produces a project tree SiteBuilder can build (content/, static/,
+site.config.yaml) at a given scale. Pages are derived from the real
+home/services pages with generated Markdown bodies, faq.yaml keeps the
+real category/question/answer shape with thousands of entries, and
+images are generated photos/graphics of mixed sizes. Templates, CSS and
+JS are the real ones, so the numbers reflect this site's actual work.
+
+Usage:
+    python benchmarks/synthetic_site.py /tmp/bench-site --scale medium
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+from pathlib import Path
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SCALES = {
+    # pages, FAQ entries, images
+    "small": {"pages": 60, "faqs": 300, "images": 20},
+    "medium": {"pages": 300, "faqs": 2000, "images": 100},
+    "large": {"pages": 1000, "faqs": 5000, "images": 300},
+}
+
+# Keep the image pipeline representative but quick enough to run cold.
+IMAGE_OPTIMIZER_SETTINGS = {
+    "enabled": True,
+    "quality": 80,
+    "formats": ["webp", "jpg"],
+    "widths": [400, 800],
+    "max_width": 1600,
+    "jobs": 0,
+}
+
+WORDS = (
+    "puerto rico home property video tour neighborhood buyer inspection "
+    "flood zone school commute beach market report offer closing realtor "
+    "walkthrough kitchen roof generator cistern permit title survey san juan "
+    "dorado rincon humacao condo villa investment rental remote due diligence"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 18)) for _ in range(rng.randint(2, 5)))
+
+
+def markdown_body(rng: random.Random, sections: int) -> str:
+    """A Markdown body exercising the extensions build.py enables."""
+    out = [f"# {_sentence(rng, 5)[:-1]}", "", _paragraph(rng), ""]
+    for i in range(sections):
+        out += [f"## {_sentence(rng, 4)[:-1]}", "", _paragraph(rng), ""]
+        kind = i % 3
+        if kind == 0:
+            out += [f"- **{rng.choice(WORDS).title()}**: {_sentence(rng, 8)}" for _ in range(5)]
+        elif kind == 1:
+            out += ["| Area | Visits | Notes |", "|------|--------|-------|"]
+            out += [f"| {rng.choice(WORDS).title()} | {rng.randint(1, 40)} | {_sentence(rng, 5)} |"
+                    for _ in range(4)]
+        else:
+            out += ["```python", "def schedule(visit):", "    return visit.confirm()", "```"]
+        out.append("")
+    return "\n".join(out)
+
+
+def faq_data(rng: random.Random, entries: int, template: dict) -> dict:
+    """faq.yaml with `entries` questions spread over the real categories."""
+    data = dict(template)
+    categories = list(template["faqs"].items())
+    faqs = {key: {**cat, "questions": []} for key, cat in categories}
+    for i in range(entries):
+        key = categories[i % len(categories)][0]
+        faqs[key]["questions"].append({
+            "question": _sentence(rng, rng.randint(6, 12))[:-1] + "?",
+            "answer": "".join(f"<p>{_paragraph(rng)}</p>" for _ in range(rng.randint(1, 3))),
+        })
+    data["faqs"] = faqs
+    return data
+
+
+def write_images(rng: random.Random, dest: Path, count: int) -> None:
+    """Generated JPEG photos and PNG graphics (some with alpha)."""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    dest.mkdir(parents=True, exist_ok=True)
+    sizes = [(640, 480), (1200, 800), (1600, 1067), (2400, 1600)]
+    for i in range(count):
+        width, height = sizes[i % len(sizes)]
+        graphic = i % 5 == 4
+        background = tuple(rng.randrange(256) for _ in range(3))
+        image = Image.new("RGBA" if graphic else "RGB", (width, height),
+                          background + (0,) if graphic else background)
+        draw = ImageDraw.Draw(image)
+        for _ in range(40):
+            x, y = rng.randrange(width), rng.randrange(height)
+            r = rng.randint(20, width // 4)
+            color = tuple(rng.randrange(256) for _ in range(len(image.mode)))
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+        if graphic:
+            image.save(dest / f"graphic-{i:04d}.png", optimize=True)
+        else:
+            image = image.filter(ImageFilter.GaussianBlur(2))
+            image.save(dest / f"photo-{i:04d}.jpg", quality=90)
+
+
+def generate(root: Path | str, scale: str = "small", seed: int = 0, images: bool = True) -> Path:
+    """(Re)create a synthetic site at `root` and return the path."""
+    counts = SCALES[scale]
+    rng = random.Random(seed)
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+
+    # Config: the real one, with templates read from this checkout
+    config = yaml.safe_load((REPO_ROOT / "content/config.yaml").read_text(encoding="utf-8"))
+    config["build"].update({
+        "output_dir": "docs",
+        "static_dir": "static",
+        "template_dir": str(REPO_ROOT / config["build"]["template_dir"]),
+        "cache_dir": ".build-cache",
+    })
+    (root / "content/data").mkdir(parents=True)
+    (root / "content/pages").mkdir(parents=True)
+    (root / "content/config.yaml").write_text(yaml.safe_dump(config, sort_keys=False), encoding="utf-8")
+    (root / "site.config.yaml").write_text(
+        yaml.safe_dump({"tools": {"image_optimizer": IMAGE_OPTIMIZER_SETTINGS}}), encoding="utf-8")
+
+    # Data: real files, FAQ scaled up
+    for data_file in (REPO_ROOT / "content/data").glob("*.yaml"):
+        shutil.copy2(data_file, root / "content/data" / data_file.name)
+    faq = yaml.safe_load((REPO_ROOT / "content/data/faq.yaml").read_text(encoding="utf-8"))
+    (root / "content/data/faq.yaml").write_text(
+        yaml.safe_dump(faq_data(rng, counts["faqs"], faq), allow_unicode=True, sort_keys=False),
+        encoding="utf-8")
+
+    # Pages: real frontmatter, generated bodies
+    sources = sorted((REPO_ROOT / "content/pages").glob("*.md"))
+    for i in range(counts["pages"]):
+        text = sources[i % len(sources)].read_text(encoding="utf-8")
+        _, frontmatter, _ = text.split("---", 2)
+        meta = yaml.safe_load(frontmatter)
+        meta["title"] = f"{meta.get('title', 'Page')} #{i}"
+        body = markdown_body(rng, sections=rng.randint(3, 12))
+        (root / "content/pages" / f"page-{i:04d}.md").write_text(
+            f"---\n{yaml.safe_dump(meta, allow_unicode=True, sort_keys=False)}---\n\n{body}\n", encoding="utf-8")
+
+    # Static: real CSS/JS/SEO files, generated images
+    static = root / "static"
+    for name in ("css", "js"):
+        shutil.copytree(REPO_ROOT / "static" / name, static / name)
+    for name in ("robots.txt", "sitemap.xml", "CNAME"):
+        if (REPO_ROOT / "static" / name).exists():
+            shutil.copy2(REPO_ROOT / "static" / name, static / name)
+    if images:
+        write_images(rng, static / "images" / "bench", counts["images"])
+    else:
+        (static / "images").mkdir(parents=True)
+
+    return root
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic site for build benchmarks")
+    parser.add_argument("root", help="Directory to (re)create")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-images", action="store_true", help="Skip image generation")
+    args = parser.parse_args()
+
+    root = generate(args.root, args.scale, args.seed, images=not args.no_images)
+    counts = SCALES[args.scale]
+    print(f"✅ Generated {args.scale} site at {root} "
+          f"({counts['pages']} pages, {counts['faqs']} FAQs, {0 if args.no_images else counts['images']} images)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,44 @@ Legs on the Ground - Static Site Generator
 A simple, elegant build system for content-driven sites
 """
 
+import os
+import re
 import sys
+import json
+import time
+import hashlib
 import shutil
-import yaml
-import markdown
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, ModuleLoader, meta, select_autoescape
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 import argparse
 
+from asset_sync import AssetSync
+from build_cache import BuildManifest, DigestCache, file_digest, text_digest
+from critical_css import DEFAULT_MAX_BYTES, DEFAULT_SELECTORS, critical_rules, fold_vocabulary, inline_critical_css
+from css_purge import PURGE_VERSION, UsedSelectors, collect_html, collect_script, purge_css
+from data_loader import DataLoader, load_text
+from faq_index import build_index
+from fragment_cache import FragmentCacheExtension
+from html_minify import minify_html
+from js_pipeline import bundle_js
+from markdown_cache import MarkdownCache
+from precompress import Precompressor, available_formats
+from profiler import Profiler, span
+from template_cache import bytecode_cache, precompiled_archive, templates_digest
+
+
+MARKDOWN_EXTENSIONS = ['meta', 'extra', 'codehilite', 'toc']
+
+# Helper modules whose code shapes rendered pages (hashed like build.py)
+RENDER_MODULES = ['html_minify.py', 'critical_css.py', 'css_purge.py', 'fragment_cache.py', 'markdown_cache.py']
+
+# Manifest input standing for SiteBuilder.render_options()
+RENDER_OPTIONS_KEY = '<render options>'
+
 
 def _minify_css_conservative(css: str) -> str:
     """Conservative CSS minification.
@@ -35,12 +64,76 @@ def _minify_css_conservative(css: str) -> str:
         out.append(ln)
     return '\n'.join(out).strip() + '\n'
 
+
+@dataclass
+class BuildResult:
+    """Outcome of SiteBuilder.build (and validate, when run)"""
+    output_dir: Path
+    pages_written: list[str] = field(default_factory=list)
+    pages_skipped: int = 0
+    bytes_written: int = 0  # bytes of pages written by this build
+    output_bytes: int = 0  # total size of the output directory
+    timings: dict[str, float] = field(default_factory=dict)  # phase -> seconds
+    validation: list = field(default_factory=list)  # validator.ValidationResult
+    valid: bool | None = None  # None when validation didn't run
+    elapsed: float = 0.0  # wall time of build(), seconds
+    
+    @property
+    def success(self):
+        return self.valid is not False
+    
+    def __bool__(self):
+        return self.success
+
+
+# Per-process state for parallel page rendering (see SiteBuilder.build_pages)
+_worker_builder = None
+_worker_data = None
+
+
+def _init_render_worker(project_root, config_path, data, assets, images, profile=False, minify_html=False,
+                        precompiled=False, fragment_salt=''):
+    """Give each worker its own Jinja2 environment and Markdown converter"""
+    global _worker_builder, _worker_data
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    _worker_builder = SiteBuilder(config_path, project_root=project_root)
+    _worker_builder.assets = assets
+    _worker_builder.images = images
+    _worker_builder.minify_html = minify_html
+    if precompiled and not _worker_builder.precompiled_templates:
+        _worker_builder.use_precompiled_templates()
+    _worker_builder.fragments.reset(fragment_salt)
+    if profile:
+        _worker_builder.profiler = Profiler()
+    _worker_data = data
+
+
+def _render_page_in_worker(page_file):
+    """Build one page; returns (build_page result, spans, HTML minify report,
+    fragment cache (hits, misses, keys used), fold vocabulary cache entry)"""
+    built = _worker_builder.build_page(page_file, _worker_data)
+    profiler = _worker_builder.profiler
+    report, _worker_builder.html_minify_report = _worker_builder.html_minify_report, []
+    fragments = _worker_builder.fragments
+    usage = (fragments.hits, fragments.misses, fragments.used)
+    fragments.reset(fragments.salt)
+    fold = _worker_builder._fold_vocabulary.get(built[0]) if built else None
+    return built, profiler.drain() if profiler else [], report, usage, fold
+
+
 class SiteBuilder:
     """Main site builder class"""
     
-    def __init__(self, config_path='content/config.yaml'):
-        """Initialize the builder"""
-        self.project_root = Path(__file__).parent
+    def __init__(self, config_path='content/config.yaml', data_loader=None, project_root=None):
+        """Initialize the builder
+        
+        Pass a data_loader.DataLoader to share parsed YAML with the caller.
+        project_root defaults to this checkout; benchmarks point it at a
+        generated site.
+        """
+        self.project_root = Path(project_root) if project_root else Path(__file__).parent
+        self.config_path = self.project_root / config_path
+        self.data_loader = data_loader or DataLoader()
         self.config = self.load_yaml(config_path)
         
         # Directories
@@ -48,46 +141,138 @@ class SiteBuilder:
         self.template_dir = self.project_root / self.config['build']['template_dir']
         self.static_dir = self.project_root / self.config['build']['static_dir']
         self.output_dir = self.project_root / self.config['build']['output_dir']
+        self.cache_dir = self.project_root / self.config['build'].get('cache_dir', '.build-cache')
+        if self.data_loader.cache_dir is None:
+            self.data_loader.cache_dir = self.cache_dir / 'yaml'
         
-        # Setup Jinja2
+        # Setup Jinja2. Compiled templates are cached on disk by source
+        # checksum, and not stat-checked per get_template: build() drops
+        # the ones whose source changed (see refresh_templates).
+        # {% cache %} fragments are kept in .build-cache/fragments.
+        template_settings = self.config['build'].get('templates') or {}
+        self.source_loader = FileSystemLoader(str(self.template_dir))
         self.jinja_env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
+            loader=self.source_loader,
             autoescape=select_autoescape(['html', 'xml']),
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            auto_reload=False,
+            extensions=[FragmentCacheExtension],
+            bytecode_cache=(bytecode_cache(self.cache_dir / 'jinja')
+                            if template_settings.get('bytecode_cache', True) else None),
         )
+        self.precompiled_templates = False
+        self._template_archive = None
+        self.fragments = self.jinja_env.fragment_cache
+        self.fragments.cache_dir = self.cache_dir / 'fragments'
+        
+        # Logical asset name -> fingerprinted filename (see fingerprint_assets)
+        self.assets = {}
+        self.jinja_env.globals['asset'] = self.asset_url
+        
+        # Site-relative image path -> variants (see process_images)
+        self.images = {}
+        self.jinja_env.globals['image_info'] = self.image_info
+        self.jinja_env.globals['image_srcset'] = self.image_srcset
+        
+        # Setup Markdown (conversions cached by source + extension config)
+        self.markdown = MarkdownCache(MARKDOWN_EXTENSIONS, cache_dir=self.cache_dir / 'markdown')
+        self.md = self.markdown.md
         
-        # Setup Markdown
-        self.md = markdown.Markdown(extensions=[
-            'meta',
-            'extra',
-            'codehilite',
-            'toc'
-        ])
+        # Template name -> (templates it pulls in, variables it reads)
+        self._template_deps = {}
+        
+        # Set to a profiler.Profiler to record spans (build.py --profile)
+        self.profiler = None
+        
+        # Selectors the CSS bundle is purged against (see purge_unused_css)
+        self._css_used = None
+        self.css_purge_report = []  # (part file, bytes before, bytes after)
+        self._critical_css = {}  # (bundle, fold vocabulary) -> critical CSS
+        self._fold_vocabulary = {}  # output file -> (rendered HTML digest, fold vocabulary)
+        
+        # HTML minification of rendered pages (performance.minify_html)
+        self.minify_html = False
+        self.html_minify_report = []  # (output file, bytes before, bytes after)
         
         print("🏗️  Legs on the Ground - Site Builder")
         print("=" * 50)
+        
+        if template_settings.get('precompiled', False):
+            self.use_precompiled_templates()
+    
+    def use_precompiled_templates(self):
+        """Render from templates compiled ahead of time into a module zip
+        
+        The archive is keyed by a digest of all template sources, so it is
+        rebuilt only when a template changes (see template_cache.py).
+        """
+        current = self.jinja_env.loader
+        self.jinja_env.loader = self.source_loader
+        archive, built = precompiled_archive(self.jinja_env, self.template_dir, self.cache_dir / 'templates')
+        if self.precompiled_templates and archive == self._template_archive:
+            self.jinja_env.loader = current
+            return
+        print(f"   ✓ {'Compiled' if built else 'Using'} precompiled templates ({archive.name})")
+        self.jinja_env.loader = ModuleLoader(str(archive))
+        self.jinja_env.cache.clear()
+        self._template_archive = archive
+        self.precompiled_templates = True
+    
+    def refresh_templates(self):
+        """Forget compiled templates whose source changed since they were loaded"""
+        if self.precompiled_templates:
+            self.use_precompiled_templates()
+        else:
+            cache = self.jinja_env.cache
+            for key, template in list(cache.items()):
+                if not template.is_up_to_date:
+                    del cache[key]
+        self._template_deps = {}
+    
+    def fragment_salt(self):
+        """Digest of what every {% cache %} fragment implicitly depends on
+        
+        All template sources (a fragment's macros and includes can live in
+        other files) and the asset/image manifests its URLs come from.
+        """
+        h = hashlib.sha256(templates_digest(self.template_dir, self.jinja_env).encode())
+        h.update(json.dumps([self.assets, self.images], sort_keys=True, default=str).encode())
+        return h.hexdigest()
+    
+    def report_fragments(self, pruned=0):
+        """Print how many {% cache %} fragments were rendered vs reused"""
+        fragments = self.fragments
+        if fragments.hits or fragments.misses:
+            line = f"   ♻️  Cached fragments: {fragments.misses} rendered, {fragments.hits} reused"
+            if pruned:
+                line += f", {pruned} stale removed"
+            print(line)
     
     def load_yaml(self, path):
         """Load and parse YAML file"""
         try:
-            with open(self.project_root / path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return self.data_loader.load(self.project_root / path)
         except Exception as e:
             print(f"❌ Error loading {path}: {e}")
             sys.exit(1)
     
+    def data_files(self):
+        """Map normalized data keys to their YAML files"""
+        data_dir = self.content_dir / 'data'
+        # Normalize hyphens to underscores
+        return {f.stem.replace('-', '_'): f for f in sorted(data_dir.glob('*.yaml'))}
+    
     def load_all_data(self):
         """Load all data files"""
-        data_dir = self.content_dir / 'data'
         data = {}
         
         print("\n📦 Loading content data...")
         
-        for yaml_file in data_dir.glob('*.yaml'):
+        for key_normalized, yaml_file in self.data_files().items():
             key = yaml_file.stem
-            key_normalized = key.replace('-', '_')  # Normalize hyphens to underscores
-            content = self.load_yaml(f'content/data/{yaml_file.name}')
+            with self.span(f'load {yaml_file.name}', 'data'):
+                content = self.load_yaml(f'content/data/{yaml_file.name}')
             
             # If the YAML file has a top-level key matching the filename (with either - or _), unwrap it
             if isinstance(content, dict):
@@ -104,16 +289,15 @@ class SiteBuilder:
         
         return data
     
-    def parse_page(self, page_path):
-        """Parse a markdown page with frontmatter"""
+    def split_frontmatter(self, page_path):
+        """Read a page and split it into (frontmatter, markdown)"""
         with open(page_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Split frontmatter and content
         if content.startswith('---'):
             parts = content.split('---', 2)
             if len(parts) >= 3:
-                frontmatter = yaml.safe_load(parts[1])
+                frontmatter = load_text(parts[1])
                 markdown_content = parts[2].strip()
             else:
                 frontmatter = {}
@@ -122,33 +306,107 @@ class SiteBuilder:
             frontmatter = {}
             markdown_content = content
         
-        # Convert markdown to HTML
-        html_content = self.md.convert(markdown_content)
+        return frontmatter or {}, markdown_content
+    
+    def render_markdown(self, page_path):
+        """Return (frontmatter, markdown_cache.RenderedMarkdown) for a page
+        
+        Unchanged page bodies come from the Markdown cache; otherwise the
+        converter is reset and run, so meta/toc state doesn't leak between
+        pages.
+        """
+        frontmatter, markdown_content = self.split_frontmatter(page_path)
+        
+        with self.span(f'markdown {Path(page_path).name}', 'markdown'):
+            rendered = self.markdown.convert(markdown_content, Path(page_path).name)
         
-        return frontmatter, html_content
+        return frontmatter, rendered
+    
+    def parse_page(self, page_path):
+        """Parse a markdown page with frontmatter"""
+        frontmatter, rendered = self.render_markdown(page_path)
+        return frontmatter, rendered.html
+    
+    def output_name(self, page_file):
+        """Output filename for a page source"""
+        if page_file == 'home.md':
+            return 'index.html'
+        return Path(page_file).stem + '.html'
+    
+    def template_dependencies(self, name):
+        """Return (templates, variables) reachable from a template.
+        
+        Follows extends/include/import/from statically. A dynamic template
+        name makes every template a dependency.
+        """
+        if name in self._template_deps:
+            return self._template_deps[name]
+        
+        templates, variables = {name}, set()
+        self._template_deps[name] = (templates, variables)  # guards cycles
+        
+        source, _, _ = self.source_loader.get_source(self.jinja_env, name)
+        ast = self.jinja_env.parse(source)
+        variables.update(meta.find_undeclared_variables(ast))
+        for ref in meta.find_referenced_templates(ast):
+            if ref is None:
+                templates.update(t for t in self.source_loader.list_templates() if t.endswith('.html'))
+                continue
+            ref_templates, ref_variables = self.template_dependencies(ref)
+            templates.update(ref_templates)
+            variables.update(ref_variables)
+        
+        return templates, variables
+    
+    def page_inputs(self, page_path, layout):
+        """Files a page's output depends on, as project-relative paths"""
+        templates, variables = self.template_dependencies(f'{layout}.html')
+        data_files = self.data_files()
+        inputs = {
+            Path(__file__).resolve(),
+            self.config_path,
+            page_path,
+            self.output_dir / 'asset-manifest.json',
+            self.output_dir / 'images' / 'image-manifest.json',
+        }
+        inputs.update(Path(__file__).resolve().parent / m for m in RENDER_MODULES)
+        inputs.update(self.template_dir / t for t in templates)
+        inputs.update(data_files[v] for v in variables if v in data_files)
+        return sorted(inputs)
+    
+    def render_options(self):
+        """Options of this build that change rendered pages but live in no input file"""
+        build = self.config['build']
+        return {
+            'minify_html': self.minify_html,
+            'precompiled_templates': self.precompiled_templates,
+            'critical_css': build.get('critical_css') or {},
+            'purge_css': build.get('purge_css', False),
+            'css_safelist': build.get('css_safelist') or [],
+        }
     
     def build_page(self, page_file, data):
-        """Build a single page"""
+        """Build a single page
+        
+        Returns (output_file, input_paths), or None if the page is missing.
+        """
         page_path = self.content_dir / 'pages' / page_file
         
         if not page_path.exists():
             print(f"   ⚠️  Page not found: {page_file}")
-            return
+            return None
         
         print(f"   📄 Building {page_file}...")
         
         # Parse the page
-        frontmatter, content = self.parse_page(page_path)
+        frontmatter, rendered = self.render_markdown(page_path)
+        content = rendered.html
         
         # Determine output filename
-        if page_file == 'home.md':
-            output_file = 'index.html'
-        else:
-            output_file = page_path.stem + '.html'
+        output_file = self.output_name(page_file)
         
         # Get layout template
         layout = frontmatter.get('layout', 'default')
-        template = self.jinja_env.get_template(f'{layout}.html')
         
         # Build context
         context = {
@@ -163,73 +421,502 @@ class SiteBuilder:
         }
         
         # Render template
-        html = template.render(**context)
+        with self.span(f'render {page_file}', 'render', layout=layout):
+            template = self.jinja_env.get_template(f'{layout}.html')
+            html = template.render(**context)
+        
+        with self.span(f'critical css {page_file}', 'render'):
+            html = self.apply_critical_css(html, output_file)
+        
+        if self.minify_html:
+            with self.span(f'minify html {page_file}', 'render'):
+                before = len(html.encode('utf-8'))
+                html = minify_html(html)
+                self.html_minify_report.append((output_file, before, len(html.encode('utf-8'))))
         
         # Write output
         output_path = self.output_dir / output_file
         output_path.write_text(html, encoding='utf-8')
         
         print(f"      ✓ Generated {output_file}")
+        
+        return output_file, self.page_inputs(page_path, layout)
+    
+    def write_faq_shards(self, faq, settings):
+        """Write each FAQ category's answers to faq/<category>.<hash>.json
+        
+        Pages keep the questions; main.js fetches a category's shard the
+        first time one of its questions is opened, and each answer links to
+        the fallback page that has them all inline. Returns the faq_shards
+        template variable. Shards from earlier builds are removed.
+        """
+        shard_dir = self.output_dir / 'faq'
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        sync = AssetSync()
+        urls = {}
+        for category_key, category_data in (faq.get('faqs') or {}).items():
+            answers = [q.get('answer', '') for q in category_data.get('questions') or []]
+            shard = json.dumps({'answers': answers}, ensure_ascii=False, separators=(',', ':'))
+            name = f"{category_key}.{hashlib.sha256(shard.encode('utf-8')).hexdigest()[:8]}.json"
+            sync.write(shard_dir / name, shard)
+            urls[category_key] = f"faq/{name}"
+        
+        for old in shard_dir.glob('*.json'):
+            if f"faq/{old.name}" not in urls.values():
+                old.unlink()
+        
+        print(f"   ✓ Wrote {len(urls)} FAQ answer shards")
+        return {'fallback_page': settings.get('fallback_page', 'faq.html'), 'urls': urls}
     
-    def copy_static_files(self, minify_css: bool = False):
-        """Copy static assets to output"""
+    def write_faq_index(self, faq):
+        """Write the FAQ search index (see faq_index.py) as faq-index.<hash>.json
+        
+        Returns its URL, the faq_search template variable. main.js loads it
+        the first time the search box is focused.
+        """
+        index = json.dumps(build_index(faq), ensure_ascii=False, separators=(',', ':'))
+        name = f"faq-index.{hashlib.sha256(index.encode('utf-8')).hexdigest()[:8]}.json"
+        AssetSync().write(self.output_dir / name, index)
+        
+        for old in self.output_dir.glob('faq-index.*.json'):
+            if old.name != name:
+                old.unlink()
+        
+        print(f"   ✓ Wrote FAQ search index {name} ({len(index.encode('utf-8')) / 1024:.1f} KB)")
+        return name
+    
+    def precompress_outputs(self, settings, jobs=1):
+        """Write .gz/.br siblings of text outputs (see precompress.py)"""
+        formats = settings.get('formats') or ['gzip', 'brotli']
+        missing = [f for f in formats if f not in available_formats([f])]
+        if missing:
+            print(f"   ⚠️  Skipping {', '.join(missing)} precompression (pip install brotli)")
+        precompressor = Precompressor(
+            self.output_dir,
+            self.cache_dir / 'precompress.json',
+            formats=formats,
+            jobs=settings.get('jobs') or max(jobs, os.cpu_count() or 1),
+        )
+        with self.span('precompress', 'static', formats=','.join(precompressor.formats)):
+            stats = precompressor.run()
+        print(f"   🗜️  Precompressed outputs ({stats.summary()})")
+    
+    def report_html_minification(self):
+        """Print before/after sizes of the pages minified in this build"""
+        if not self.html_minify_report:
+            return
+        print("   🗜️  Minified HTML:")
+        total_before = total_after = 0
+        for output_file, before, after in sorted(self.html_minify_report):
+            total_before += before
+            total_after += after
+            print(f"      {output_file}: {before / 1024:.1f} KB → {after / 1024:.1f} KB "
+                  f"(-{(before - after) / before:.0%})")
+        if len(self.html_minify_report) > 1:
+            print(f"      total: {total_before / 1024:.1f} KB → {total_after / 1024:.1f} KB "
+                  f"(-{(total_before - total_after) / total_before:.0%})")
+    
+    def copy_static_files(self, minify_css: bool = False, images: bool = True, minify_js: bool = False):
+        """Copy static assets to output
+        
+        images=False skips the image pipeline and reuses the existing
+        docs/images (used by the dev server when no image changed).
+        JS is bundled per build.js_bundles (see js_bundles).
+        
+        Files are delta-synced (see asset_sync.py): outputs that already
+        match their source are not rewritten, stale ones are removed.
+        """
         print("\n📁 Copying static assets...")
         
         if not self.static_dir.exists():
             print(f"   ⚠️  Static directory not found: {self.static_dir}")
             return
         
+        sync = AssetSync(hardlink=self.config['build'].get('hardlink_static', True))
+        
+        # Top-level CSS/JS outputs, fingerprinted below
+        assets = []
+        
         # Copy / bundle CSS
-        css_src = self.static_dir / 'css'
-        css_dest = self.output_dir
-        if css_src.exists():
-            parts_dir = css_src / 'parts'
-            part_files = sorted(parts_dir.glob('*.css')) if parts_dir.exists() else []
-
-            if part_files:
-                bundled = "\n".join(
-                    p.read_text(encoding='utf-8').rstrip() for p in part_files
-                ).rstrip() + "\n"
-                if minify_css:
-                    bundled = _minify_css_conservative(bundled)
-                (css_dest / 'styles.css').write_text(bundled, encoding='utf-8')
-                print(f"   ✓ Bundled styles.css ({len(part_files)} parts)")
-
-                # Copy any additional standalone CSS files except styles.css
-                for css_file in css_src.glob('*.css'):
-                    if css_file.name == 'styles.css':
-                        continue
-                    shutil.copy2(css_file, css_dest / css_file.name)
-                    print(f"   ✓ Copied {css_file.name}")
-            else:
-                for css_file in css_src.glob('*.css'):
-                    shutil.copy2(css_file, css_dest / css_file.name)
-                    print(f"   ✓ Copied {css_file.name}")
+        with self.span('bundle css', 'static'):
+            css_src = self.static_dir / 'css'
+            css_dest = self.output_dir
+            if css_src.exists():
+                parts_dir = css_src / 'parts'
+                part_files = sorted(parts_dir.glob('*.css')) if parts_dir.exists() else []
+
+                if part_files:
+                    if self.config['build'].get('purge_css', False):
+                        # Purge against the last build's pages; purge_unused_css
+                        # redoes it after rendering if they changed
+                        usage = self.load_css_usage()
+                        self._css_used = self.css_vocabulary(usage) if usage else None
+                    bundled = self.bundle_css(part_files, minify_css)
+                    if sync.write(css_dest / 'styles.css', bundled):
+                        print(f"   ✓ Bundled styles.css ({len(part_files)} parts)")
+                    assets.append('styles.css')
+
+                    # Copy any additional standalone CSS files except styles.css
+                    for css_file in css_src.glob('*.css'):
+                        if css_file.name == 'styles.css':
+                            continue
+                        if sync.file(css_file, css_dest / css_file.name):
+                            print(f"   ✓ Copied {css_file.name}")
+                        assets.append(css_file.name)
+                else:
+                    for css_file in css_src.glob('*.css'):
+                        if sync.file(css_file, css_dest / css_file.name):
+                            print(f"   ✓ Copied {css_file.name}")
+                        assets.append(css_file.name)
         
-        # Copy JS
+        # Bundle / copy JS
         js_src = self.static_dir / 'js'
         js_dest = self.output_dir
         if js_src.exists():
-            for js_file in js_src.glob('*.js'):
-                shutil.copy2(js_file, js_dest / js_file.name)
-                print(f"   ✓ Copied {js_file.name}")
+            with self.span('bundle js', 'static'):
+                for name, sources in self.js_bundles(js_src).items():
+                    if len(sources) == 1 and not minify_js:
+                        changed = sync.file(sources[0], js_dest / name)
+                    else:
+                        changed = sync.write(js_dest / name, bundle_js(sources, minify_js))
+                    if changed:
+                        before = sum(f.stat().st_size for f in sources)
+                        after = (js_dest / name).stat().st_size
+                        detail = f"{before / 1024:.1f} KB → {after / 1024:.1f} KB" if after != before else f"{after / 1024:.1f} KB"
+                        print(f"   ✓ Bundled {name} ({len(sources)} file(s), {detail})")
+                    assets.append(name)
         
-        # Copy images
+        # Optimize / copy images
         img_src = self.static_dir / 'images'
         img_dest = self.output_dir / 'images'
-        if img_src.exists():
-            if img_dest.exists():
-                shutil.rmtree(img_dest)
-            shutil.copytree(img_src, img_dest)
-            print("   ✓ Copied images/ directory")
+        if img_src.exists() and (images or not img_dest.exists()):
+            with self.span('images', 'static'):
+                self.process_images(img_src, img_dest, sync)
+        elif not self.images:
+            self.load_image_manifest(img_dest)
         
         # Copy SEO and deployment files
         seo_files = ['robots.txt', 'sitemap.xml', 'CNAME']
-        for seo_file in seo_files:
-            src = self.static_dir / seo_file
-            if src.exists():
-                shutil.copy2(src, self.output_dir / seo_file)
-                print(f"   ✓ Copied {seo_file}")
+        with self.span('copy seo files', 'static'):
+            for seo_file in seo_files:
+                src = self.static_dir / seo_file
+                if src.exists() and sync.file(src, self.output_dir / seo_file):
+                    print(f"   ✓ Copied {seo_file}")
+        
+        if self.config['build'].get('fingerprint_assets', True):
+            with self.span('fingerprint assets', 'static'):
+                self.fingerprint_assets(assets, sync)
+        
+        print(f"   ✓ Synced static files ({sync.summary()})")
+    
+    def page_fold_vocabulary(self, html, output_file, selectors):
+        """Above-the-fold vocabulary of a rendered page
+        
+        Kept per output file with a digest of the HTML, so re-rendering an
+        unchanged page doesn't parse it again.
+        """
+        digest = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        cached = self._fold_vocabulary.get(output_file)
+        if cached and cached[0] == digest:
+            return cached[1]
+        used = fold_vocabulary(html, selectors)
+        self._fold_vocabulary[output_file] = (digest, used)
+        return used
+    
+    def apply_critical_css(self, html, output_file, reinline=False):
+        """Inline the page's above-the-fold CSS (build.critical_css)
+        
+        The rest of styles.css then loads without blocking render. Falls
+        back to the page as rendered (blocking stylesheet) if no fold region
+        is found, extraction fails, or the result exceeds max_bytes.
+        
+        reinline=True is for a page that was already written: the fold
+        vocabulary recorded when it was rendered (by this build or, via
+        css-usage.json, an earlier one) is reused instead of parsing the
+        page again.
+        """
+        settings = self.config['build'].get('critical_css') or {}
+        if not settings.get('enabled', False):
+            return html
+        styles = self.output_dir / 'styles.css'
+        try:
+            css = styles.read_text(encoding='utf-8')
+            if reinline and output_file in self._fold_vocabulary:
+                used = self._fold_vocabulary[output_file][1]
+            else:
+                used = self.page_fold_vocabulary(html, output_file, settings.get('selectors') or DEFAULT_SELECTORS)
+            if used is None:
+                print(f"      ⚠️  No above-the-fold region in {output_file}; keeping blocking CSS")
+                return html
+            key = (css, used.key())
+            if key not in self._critical_css:
+                self._critical_css = {k: v for k, v in self._critical_css.items() if k[0] == css}
+                self._critical_css[key] = critical_rules(css, used)
+            critical = self._critical_css[key]
+        except Exception as e:
+            print(f"      ⚠️  Critical CSS extraction failed for {output_file} ({e}); keeping blocking CSS")
+            return html
+        
+        max_bytes = settings.get('max_bytes', DEFAULT_MAX_BYTES)
+        size = len(critical.encode('utf-8'))
+        if size > max_bytes:
+            print(f"      ⚠️  Critical CSS for {output_file} is {size / 1024:.1f} KB "
+                  f"(cap {max_bytes / 1024:.1f} KB); keeping blocking CSS")
+            return html
+        
+        inlined = inline_critical_css(html, critical, self.asset_url('styles.css'))
+        if inlined is None:
+            return html
+        print(f"      ✓ Inlined {size / 1024:.1f} KB critical CSS")
+        return inlined
+    
+    def bundle_css(self, part_files, minify_css=False):
+        """Concatenate CSS part files, purged against self._css_used if set"""
+        self.css_purge_report = []
+        texts = []
+        for part in part_files:
+            text = part.read_text(encoding='utf-8').rstrip()
+            if self._css_used is not None:
+                purged = purge_css(text, self._css_used).rstrip()
+                self.css_purge_report.append((part.name, len(text.encode('utf-8')), len(purged.encode('utf-8'))))
+                text = purged
+            texts.append(text)
+        bundled = "\n".join(texts).rstrip() + "\n"
+        if minify_css:
+            bundled = _minify_css_conservative(bundled)
+        return bundled
+    
+    def load_css_usage(self):
+        """Per-page selector usage recorded by the last build: {output: UsedSelectors}
+        
+        Also restores the pages' fold vocabularies (for re-inlining
+        critical CSS) where this builder hasn't computed them itself.
+        """
+        try:
+            payload = json.loads((self.cache_dir / 'css-usage.json').read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+        if payload.get('version') != PURGE_VERSION:
+            return {}
+        for name, (digest, fold) in payload.get('fold', {}).items():
+            self._fold_vocabulary.setdefault(name, (digest, UsedSelectors.from_json(fold) if fold else None))
+        return {name: UsedSelectors.from_json(u) for name, u in payload.get('pages', {}).items()}
+    
+    def save_css_usage(self, usage):
+        path = self.cache_dir / 'css-usage.json'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fold = {name: [digest, u.to_json() if u else None]
+                for name, (digest, u) in sorted(self._fold_vocabulary.items()) if name in usage}
+        payload = {'version': PURGE_VERSION, 'pages': {name: u.to_json() for name, u in sorted(usage.items())},
+                   'fold': fold}
+        path.write_text(json.dumps(payload, sort_keys=True), encoding='utf-8')
+    
+    def css_vocabulary(self, usage):
+        """Everything a kept selector may reference: the pages' markup,
+        words from the site's JS (runtime-toggled classes) and build.css_safelist
+        """
+        used = UsedSelectors()
+        for page_usage in usage.values():
+            used.update(page_usage)
+        js_dir = self.static_dir / 'js'
+        for js_file in sorted(js_dir.glob('*.js')) if js_dir.exists() else []:
+            used.add_words(collect_script(js_file.read_text(encoding='utf-8')))
+        used.add_safelist(self.config['build'].get('css_safelist', []) or [])
+        return used
+    
+    def purge_unused_css(self, page_outputs, written, manifest, digests, minify_css=False):
+        """Drop CSS rules no rendered page can match
+        
+        Selector usage is recorded per page, so only pages written by this
+        build are re-scanned. If the vocabulary differs from the one the
+        static phase purged with, styles.css is rebuilt, re-fingerprinted
+        and the pages' references (and their manifest entries) updated.
+        """
+        usage = {name: u for name, u in self.load_css_usage().items() if name in page_outputs}
+        for name in page_outputs:
+            if name in written or name not in usage:
+                html_path = self.output_dir / name
+                if html_path.exists():
+                    usage[name] = collect_html(html_path.read_text(encoding='utf-8'))
+        self.save_css_usage(usage)
+        
+        used = self.css_vocabulary(usage)
+        if self._css_used is None or used.key() != self._css_used.key():
+            self._css_used = used
+            parts_dir = self.static_dir / 'css' / 'parts'
+            styles = self.output_dir / 'styles.css'
+            sync = AssetSync()
+            sync.write(styles, self.bundle_css(sorted(parts_dir.glob('*.css')), minify_css))
+            
+            old = self.assets.get('styles.css')
+            if old and self.config['build'].get('fingerprint_assets', True):
+                self.fingerprint_assets(['styles.css'], sync)
+                new = self.assets['styles.css']
+                if new != old:
+                    self.rewrite_asset_references(page_outputs, old, new, manifest, digests)
+        
+        before = sum(b for _, b, _ in self.css_purge_report)
+        after = sum(a for _, _, a in self.css_purge_report)
+        print(f"   ✓ Purged unused CSS: {before / 1024:.1f} KB → {after / 1024:.1f} KB "
+              f"(-{(before - after) / 1024:.1f} KB)")
+        for part, b, a in self.css_purge_report:
+            if b != a:
+                print(f"      {part}: -{(b - a) / 1024:.1f} KB ({(b - a) / b:.0%})")
+    
+    def rewrite_asset_references(self, page_outputs, old, new, manifest, digests):
+        """Point already-written pages at a re-fingerprinted asset"""
+        manifest_key = digests.key(self.output_dir / 'asset-manifest.json')
+        digests.invalidate(manifest_key)
+        for name in page_outputs:
+            path = self.output_dir / name
+            if not path.exists():
+                continue
+            html = path.read_text(encoding='utf-8')
+            updated = self.apply_critical_css(html.replace(old, new), name, reinline=True)
+            if updated != html:
+                path.write_text(updated, encoding='utf-8')
+            key = digests.key(path)
+            digests.invalidate(key)
+            manifest.refresh(name, digests.digest(key), {manifest_key: digests.digest(manifest_key)})
+    
+    def process_images(self, img_src, img_dest, sync=None):
+        """Run the image pipeline (tools/image_optimizer.py) into the output
+        
+        Falls back to syncing the originals when Pillow is unavailable or
+        the optimizer is disabled in site.config.yaml.
+        """
+        try:
+            from tools.image_optimizer import load_settings, optimize_images
+        except ImportError as e:
+            print(f"   ⚠️  Image optimizer unavailable ({e}); copying images as-is")
+            settings = {'enabled': False}
+        else:
+            settings = load_settings(self.project_root)
+        
+        if not settings.get('enabled', True):
+            sync = sync or AssetSync()
+            written, removed = sync.written, sync.removed
+            sync.tree(img_src, img_dest)
+            self.images = {}
+            print(f"   ✓ Synced images/ directory ({sync.written - written} updated, "
+                  f"{sync.removed - removed} removed)")
+            return
+        
+        report = optimize_images(img_src, img_dest, self.cache_dir, settings, jobs=settings.get('jobs', 0),
+                                 install=sync.file if sync else None)
+        self.set_image_manifest(img_dest, report.manifest)
+        print(
+            f"   ✓ Optimized images/ ({report.processed} encoded, {report.cached} cached, "
+            f"{report.copied} copied, {report.bytes_out / 1024:.0f} KB)"
+        )
+    
+    def load_image_manifest(self, img_dest):
+        """Populate self.images from an existing image-manifest.json"""
+        manifest_path = img_dest / 'image-manifest.json'
+        if not manifest_path.exists():
+            return
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        self.set_image_manifest(img_dest, manifest)
+    
+    def set_image_manifest(self, img_dest, manifest):
+        """Index an image manifest by site-relative path for templates"""
+        prefix = img_dest.relative_to(self.output_dir).as_posix()
+        self.images = {
+            f"{prefix}/{rel}": {
+                **info,
+                'variants': [{**v, 'src': f"{prefix}/{v['path']}"} for v in info['variants']],
+            }
+            for rel, info in manifest.items()
+        }
+    
+    def js_bundles(self, js_src):
+        """Output name -> source files, from build.js_bundles
+        
+        Scripts not listed in any bundle are copied on their own, so with
+        no configuration every static/js/*.js is its own bundle.
+        """
+        bundles = {}
+        listed = set()
+        for name, sources in (self.config['build'].get('js_bundles') or {}).items():
+            files = []
+            for source in sources:
+                path = js_src / source
+                if not path.exists():
+                    print(f"   ⚠️  JS bundle {name}: {source} not found")
+                    continue
+                files.append(path)
+                listed.add(path.name)
+            if files:
+                bundles[name] = files
+        for js_file in sorted(js_src.glob('*.js')):
+            if js_file.name not in listed and js_file.name not in bundles:
+                bundles[js_file.name] = [js_file]
+        return bundles
+    
+    def image_info(self, src):
+        """Manifest entry (width, height, format, variants) for an image, or None"""
+        if not src:
+            return None
+        return self.images.get(str(src).lstrip('/'))
+    
+    def image_srcset(self, src, fmt=None):
+        """srcset string for one format of an image ('' if it has none)"""
+        info = self.image_info(src)
+        if not info:
+            return ''
+        fmt = fmt or info['format']
+        root = '/' if str(src).startswith('/') else ''
+        candidates = {}
+        for v in info['variants']:
+            if v['format'] == fmt:
+                candidates.setdefault(v['width'], f"{root}{v['src']}")
+        return ', '.join(f"{url} {width}w" for width, url in sorted(candidates.items()))
+    
+    def asset_url(self, name):
+        """URL for a static asset, fingerprinted when the build produced one"""
+        return self.assets.get(name, name)
+    
+    def fingerprint_assets(self, names, sync=None):
+        """Write content-hashed copies of assets and an asset manifest
+        
+        styles.css becomes styles.<hash>.css. Identical content keeps an
+        identical filename across builds, so these URLs can be cached
+        as immutable. The unhashed files are left in place.
+        """
+        sync = sync or AssetSync()
+        for name in names:
+            src = self.output_dir / name
+            hashed = f"{src.stem}.{file_digest(src)[:8]}{src.suffix}"
+            sync.file(src, self.output_dir / hashed)
+            self.assets[name] = hashed
+            
+            # Drop fingerprinted copies from earlier builds
+            pattern = re.compile(rf"{re.escape(src.stem)}\.[0-9a-f]{{8}}{re.escape(src.suffix)}")
+            for old in self.output_dir.glob(f"{src.stem}.*{src.suffix}"):
+                if old.name != hashed and pattern.fullmatch(old.name):
+                    old.unlink()
+        
+        manifest_path = self.output_dir / 'asset-manifest.json'
+        manifest = json.dumps(self.assets, indent=2, sort_keys=True) + '\n'
+        sync.write(manifest_path, manifest)
+        print(f"   ✓ Fingerprinted {len(names)} assets (asset-manifest.json)")
+    
+    def is_page_fresh(self, page_path, manifest, digests):
+        """True if a page's output is current according to the manifest"""
+        output_file = self.output_name(page_path.name)
+        return manifest.is_fresh(output_file, self.output_dir / output_file, digests)
+    
+    def prune_outputs(self, manifest, pages):
+        """Remove outputs whose source page no longer exists"""
+        sources = {p.relative_to(self.project_root).as_posix() for p in pages}
+        for output, entry in list(manifest.outputs.items()):
+            if entry.get('source') in sources:
+                continue
+            stale_output = self.output_dir / output
+            if stale_output.exists():
+                stale_output.unlink()
+                print(f"   🗑️  Removed {output}")
+            manifest.forget(output)
     
     def clean_output(self):
         """Clean the output directory"""
@@ -238,37 +925,184 @@ class SiteBuilder:
             shutil.rmtree(self.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def build(self, clean=True, minify_css: bool = False):
-        """Build the entire site"""
-        start_time = datetime.now()
+    def build_pages(self, page_files, data, jobs=1):
+        """Render pages, in a process pool when jobs > 1
+        
+        Data is shipped to each worker once, at pool start-up.
+        Returns the build_page results for pages that were built.
+        """
+        if jobs <= 1 or len(page_files) <= 1:
+            results = [self.build_page(page_file, data) for page_file in page_files]
+            return [r for r in results if r is not None]
+        
+        workers = min(jobs, len(page_files))
+        print(f"   ⚙️  Rendering {len(page_files)} pages with {workers} workers...")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(self.project_root, self.config_path, data, self.assets, self.images,
+                      self.profiler is not None, self.minify_html, self.precompiled_templates,
+                      self.fragments.salt),
+        ) as pool:
+            results = []
+            for built, spans, report, (hits, misses, used), fold in pool.map(_render_page_in_worker, page_files):
+                results.append(built)
+                if fold:
+                    self._fold_vocabulary[built[0]] = fold
+                self.html_minify_report.extend(report)
+                self.fragments.hits += hits
+                self.fragments.misses += misses
+                self.fragments.used |= used
+                if self.profiler:
+                    self.profiler.extend(spans)
+        
+        built = [r for r in results if r is not None]
+        for output_file, _ in built:
+            print(f"      ✓ Generated {output_file}")
+        return built
+    
+    def build(self, clean=True, minify_css: bool = False, incremental: bool = False, jobs: int = 1,
+              images: bool = True, minify_js: bool = False, minify_html: bool = False,
+              precompress: bool | None = None):
+        """Build the entire site
+        
+        With incremental=True the output directory is kept and only pages
+        whose recorded inputs changed are re-rendered. jobs > 1 renders
+        pages in that many worker processes. images=False skips the image
+        pipeline (see copy_static_files). minify_html strips comments and
+        collapses whitespace in rendered pages (see html_minify.py).
+        precompress overrides build.precompress.enabled.
+        
+        Returns a BuildResult.
+        """
+        started = time.perf_counter()
+        result = BuildResult(output_dir=self.output_dir)
         
         # Clean output directory
-        if clean:
-            self.clean_output()
+        with self.phase(result, 'clean'):
+            if clean and not incremental:
+                self.clean_output()
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Templates may have changed since the last build on this instance
+        self.refresh_templates()
+        self.minify_html = minify_html
+        self.html_minify_report = []
+        
+        # Static assets first so templates can resolve fingerprinted URLs
+        with self.phase(result, 'static'):
+            self.copy_static_files(minify_css=minify_css, images=images, minify_js=minify_js)
         
-        # Load all data
-        data = self.load_all_data()
+        # Fragments rendered by earlier builds stay valid while templates and assets match
+        self.fragments.reset(self.fragment_salt())
+        
+        manifest = BuildManifest(self.cache_dir / 'build-manifest.json')
+        digests = DigestCache(self.project_root)
+        # --minify-html etc. re-render pages built without them (and vice versa)
+        options = json.dumps(self.render_options(), sort_keys=True, default=str)
+        digests.put(RENDER_OPTIONS_KEY, text_digest(options))
+        
+        pages_dir = self.content_dir / 'pages'
+        pages = sorted(pages_dir.glob('*.md'))
+        
+        self.prune_outputs(manifest, pages)
+        stale = pages
+        if incremental:
+            stale = [p for p in pages if not self.is_page_fresh(p, manifest, digests)]
         
         # Build pages
         print("\n🔨 Building pages...")
-        pages_dir = self.content_dir / 'pages'
+        if stale:
+            # Load all data
+            with self.phase(result, 'data'):
+                data = self.load_all_data()
+                faq_shards = self.config['build'].get('faq_shards') or {}
+                if faq_shards.get('enabled', False) and data.get('faq'):
+                    data['faq_shards'] = self.write_faq_shards(data['faq'], faq_shards)
+                if self.config['build'].get('faq_search_index', False) and data.get('faq'):
+                    data['faq_search'] = self.write_faq_index(data['faq'])
+            
+            with self.phase(result, 'pages'):
+                sources = {self.output_name(p.name): p for p in stale}
+                built = self.build_pages([p.name for p in stale], data, jobs=jobs)
+                for output_file, inputs in built:
+                    output_path = self.output_dir / output_file
+                    manifest.record(
+                        output_file,
+                        digests.digest(digests.key(output_path)),
+                        {**{digests.key(p): digests.digest(digests.key(p)) for p in inputs},
+                         RENDER_OPTIONS_KEY: digests.digest(RENDER_OPTIONS_KEY)},
+                        source=digests.key(sources[output_file]),
+                    )
+                    result.pages_written.append(output_file)
+                    result.bytes_written += output_path.stat().st_size
+                self.report_html_minification()
+                # Every page was rendered, so unused fragments on disk are stale
+                self.report_fragments(self.fragments.prune() if len(stale) == len(pages) else 0)
         
-        for page_file in pages_dir.glob('*.md'):
-            self.build_page(page_file.name, data)
+        result.pages_skipped = len(pages) - len(stale)
+        if result.pages_skipped:
+            print(f"   ✓ {result.pages_skipped} page(s) up to date")
         
-        # Copy static files
-        self.copy_static_files(minify_css=minify_css)
+        if self.config['build'].get('purge_css', False) and (self.output_dir / 'styles.css').exists():
+            with self.phase(result, 'purge'):
+                self.purge_unused_css(
+                    [self.output_name(p.name) for p in pages],
+                    set(result.pages_written),
+                    manifest,
+                    digests,
+                    minify_css=minify_css,
+                )
         
-        # Build complete
-        elapsed = (datetime.now() - start_time).total_seconds()
+        manifest.save()
         
+        settings = self.config['build'].get('precompress') or {}
+        if precompress is None:
+            precompress = settings.get('enabled', False)
+        if precompress:
+            with self.phase(result, 'precompress'):
+                self.precompress_outputs(settings, jobs)
+        
+        result.output_bytes = sum(f.stat().st_size for f in self.output_dir.rglob('*') if f.is_file())
+        result.elapsed = time.perf_counter() - started
+        
+        # Build complete
         print("\n" + "=" * 50)
-        print(f"✅ Build complete in {elapsed:.2f}s")
+        print(f"✅ Build complete in {result.elapsed:.2f}s")
         print(f"📂 Output: {self.output_dir}")
         print("=" * 50)
+        
+        return result
     
-    def validate(self):
-        """Validate output HTML/CSS."""
+    @contextmanager
+    def phase(self, result, name):
+        """Accumulate the wall time of a build phase into result.timings"""
+        started = time.perf_counter()
+        try:
+            with self.span(name, 'phase'):
+                yield
+        finally:
+            result.timings[name] = result.timings.get(name, 0.0) + time.perf_counter() - started
+    
+    def span(self, name, cat='build', **args):
+        """Record a profiling span (no-op unless self.profiler is set)"""
+        return span(self.profiler, name, cat, **args)
+    
+    def validate(self, result=None, changed_only=False):
+        """Validate output HTML/CSS.
+        
+        When a BuildResult is passed, validator results, the pass/fail
+        outcome and the 'validate' timing are recorded on it. With
+        changed_only=True, files whose content hash is unchanged since the
+        last validation replay their cached results instead of re-parsing.
+        """
+        if result is None:
+            return self._validate(None, changed_only)
+        with self.phase(result, 'validate'):
+            result.valid = self._validate(result, changed_only)
+        return result.valid
+    
+    def _validate(self, result, changed_only=False):
         print("\n🔍 Validating output...")
 
         html_files = list(self.output_dir.glob('*.html'))
@@ -294,14 +1128,25 @@ class SiteBuilder:
             print("🔍 QUALITY VALIDATION")
             print("="*60)
 
-            validator = SiteValidator(self.output_dir)
+            validator = SiteValidator(
+                self.output_dir,
+                cache_path=self.cache_dir / 'validation-cache.json',
+                use_cache=changed_only,
+                profiler=self.profiler,
+            )
             results = validator.validate_all()
+            if result is not None:
+                result.validation = results
+            if validator.replayed:
+                print(f"   ✓ {len(validator.replayed)} unchanged file(s) replayed from cache, "
+                      f"{len(validator.checked)} checked")
 
-            report = validator.generate_report()
-            print(report)
+            with self.span('validation report', 'validate'):
+                report = validator.generate_report()
+                print(report)
 
-            report_path = self.project_root / 'validation-report.json'
-            validator.save_report(report_path)
+                report_path = self.project_root / 'validation-report.json'
+                validator.save_report(report_path)
 
             total_errors = sum(len(r.errors) for r in results)
             if total_errors > 0:
@@ -319,16 +1164,65 @@ def main():
     parser = argparse.ArgumentParser(description='Build the Legs on the Ground website')
     parser.add_argument('--no-clean', action='store_true', help='Do not clean output directory')
     parser.add_argument('--validate', action='store_true', help='Run validation after build')
-    parser.add_argument('--minify-css', action='store_true', help='Conservatively minify bundled CSS output')
+    parser.add_argument('--changed-only', action='store_true',
+                        help='With --validate, only re-check outputs whose content changed since the last validation')
+    # Minification defaults to performance.* in site.config.yaml, as for `site.py build`
+    parser.add_argument('--minify-css', action=argparse.BooleanOptionalAction,
+                        help='Conservatively minify bundled CSS output')
+    parser.add_argument('--minify-js', action=argparse.BooleanOptionalAction,
+                        help='Strip comments and whitespace from JS bundles')
+    parser.add_argument('--minify-html', action=argparse.BooleanOptionalAction,
+                        help='Strip comments and collapse whitespace in pages')
+    parser.add_argument('--precompiled-templates', action='store_true',
+                        help='Render from templates compiled ahead of time into a zip (CI/production)')
+    parser.add_argument('--precompress', action='store_true',
+                        help='Write .gz/.br siblings of text outputs (for CDN or `site.py serve` deploys)')
+    parser.add_argument('--incremental', action='store_true', help='Only rebuild pages whose inputs changed (implies --no-clean)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Render pages in N worker processes (0 = one per CPU core)')
+    parser.add_argument('--profile', nargs='?', const='.build-cache/build-trace.json', metavar='TRACE',
+                        help='Record per-phase/per-page spans and write a Chrome trace '
+                             '(default: .build-cache/build-trace.json)')
+    parser.add_argument('--profile-top', type=int, default=15, metavar='N',
+                        help='Number of slowest spans to list with --profile')
     args = parser.parse_args()
     
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
     try:
         builder = SiteBuilder()
-        builder.build(clean=not args.no_clean, minify_css=args.minify_css)
+        performance = {}
+        site_config = builder.project_root / 'site.config.yaml'
+        if site_config.exists():
+            performance = (builder.load_yaml(site_config) or {}).get('performance') or {}
+        for option in ('minify_css', 'minify_js', 'minify_html'):
+            if getattr(args, option) is None:
+                setattr(args, option, bool(performance.get(option, False)))
+        if args.precompiled_templates and not builder.precompiled_templates:
+            builder.use_precompiled_templates()
+        if args.profile:
+            builder.profiler = Profiler()
+        result = builder.build(
+            clean=not args.no_clean,
+            minify_css=args.minify_css,
+            minify_js=args.minify_js,
+            minify_html=args.minify_html,
+            incremental=args.incremental,
+            jobs=jobs,
+            precompress=args.precompress or None,
+        )
         
         if args.validate:
-            if not builder.validate():
-                sys.exit(1)
+            valid = builder.validate(result, changed_only=args.changed_only)
+        
+        if builder.profiler:
+            trace_path = builder.profiler.write_trace(builder.project_root / args.profile)
+            print("\n⏱️  Profile")
+            print(builder.profiler.summary(top=args.profile_top))
+            print(f"\n   Trace written to {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+        
+        if args.validate and not valid:
+            sys.exit(1)
         
         print("\n🎉 Success! Your site is ready.")
         
@@ -0,0 +1,120 @@
+"""Content-hash bookkeeping for incremental builds.
+
+The build records, for every generated output, the SHA-256 of each input it
+was rendered from (page source, layout and every template it pulls in, the
+data files it reads, config, the build code) plus a digest of the render
+options. On the next build an output is only
+re-rendered when one of those digests changed, the output went missing, or
+the output on disk no longer matches what was written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+MANIFEST_VERSION = 2
+
+# Digest recorded for an input that did not exist when the output was built,
+# so creating it later invalidates the output.
+MISSING = "missing"
+
+
+def file_digest(path: Path | str) -> str:
+    """Return the SHA-256 hex digest of a file, or MISSING if it is absent."""
+    path = Path(path)
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return MISSING
+
+
+def text_digest(text: str) -> str:
+    """Return the SHA-256 hex digest of a string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DigestCache:
+    """Memoizes file digests for the duration of one build."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._digests: dict[str, str] = {}
+
+    def key(self, path: Path | str) -> str:
+        """Return the manifest key (root-relative posix path) for a file."""
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def digest(self, key: str) -> str:
+        if key not in self._digests:
+            self._digests[key] = file_digest(self.root / key)
+        return self._digests[key]
+
+    def put(self, key: str, digest: str) -> None:
+        """Set the digest of an input that isn't a file (e.g. render options)."""
+        self._digests[key] = digest
+
+    def invalidate(self, key: str) -> None:
+        self._digests.pop(key, None)
+
+
+class BuildManifest:
+    """Persisted map of output -> input digests."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.outputs: dict[str, dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return
+        if payload.get("version") != MANIFEST_VERSION:
+            return
+        self.outputs = payload.get("outputs", {})
+
+    def is_fresh(self, output: str, output_path: Path, digests: DigestCache) -> bool:
+        """True if `output` was recorded and none of its inputs changed."""
+        entry = self.outputs.get(output)
+        if not entry:
+            return False
+        if file_digest(output_path) != entry.get("digest"):
+            return False
+        return all(
+            digests.digest(key) == recorded
+            for key, recorded in entry.get("inputs", {}).items()
+        )
+
+    def record(self, output: str, output_digest: str, inputs: dict[str, str], **extra: Any) -> None:
+        self.outputs[output] = {"digest": output_digest, "inputs": inputs, **extra}
+
+    def refresh(self, output: str, output_digest: str, inputs: dict[str, str]) -> None:
+        """Update a recorded output after a post-processing rewrite.
+
+        Only inputs the output already tracks are updated.
+        """
+        entry = self.outputs.get(output)
+        if not entry:
+            return
+        entry["digest"] = output_digest
+        for key, digest in inputs.items():
+            if key in entry.get("inputs", {}):
+                entry["inputs"][key] = digest
+
+    def forget(self, output: str) -> None:
+        self.outputs.pop(output, None)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": MANIFEST_VERSION, "outputs": self.outputs}
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
@@ -0,0 +1,283 @@
+"""Above-the-fold CSS extraction and inlining.
+
+The fold is approximated structurally: the subtrees of a page matching a
+few root selectors (top bar, header, hero, trust bar by default) plus
+their ancestors. The critical CSS is the bundle purged (see css_purge)
+against only the vocabulary of that region, so it keeps exactly the rules
+whose every class, id, element and attribute occur above the fold.
+
+inline_critical_css() puts it in a <style> in <head> and turns the
+blocking stylesheet link into a preload that applies itself on load,
+with a <noscript> link for browsers without JavaScript.
+"""
+
+from __future__ import annotations
+
+import re
+from html.parser import HTMLParser
+from typing import Iterable
+
+from css_purge import IMPLIED_TAGS, UsedSelectors, purge_css
+
+DEFAULT_SELECTORS = (".top-bar", ".header", ".hero", ".page-hero", ".trust-bar")
+
+# 14 KB fits in the first round trip of a new TCP connection (initcwnd 10).
+DEFAULT_MAX_BYTES = 14 * 1024
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+}
+
+
+_SIMPLE_SELECTOR_RE = re.compile(r"([a-zA-Z][\w-]*)?(?:([.#])([\w-]+))?")
+
+Selector = tuple[str | None, str | None, str | None]  # (tag, "." or "#", value)
+
+
+def _parse_selector(selector: str) -> Selector | None:
+    """Split a simple selector (tag, .class, #id or tag.class); None if unsupported."""
+    match = _SIMPLE_SELECTOR_RE.fullmatch(selector.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    name, kind, value = match.groups()
+    return (name.lower() if name else None), kind, value
+
+
+def _matches(tag: str, attrs: dict[str, str | None], selector: Selector) -> bool:
+    name, kind, value = selector
+    if name and name != tag:
+        return False
+    if kind == ".":
+        return value in (attrs.get("class") or "").split()
+    if kind == "#":
+        return attrs.get("id") == value
+    return True
+
+
+# Inside the value of this attribute, up to the end of the searched span
+_ATTR_VALUE_RE = {
+    attr: re.compile(rf"\b{attr}\s*=\s*[\"']?[^\"'=]*$", re.I) for attr in ("class", "id")
+}
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char in "_-"
+
+
+def _last_candidate_end(html: str, selector: Selector) -> int | None:
+    """End of the last tag in `html` that may match `selector`.
+
+    A superset: the last `<tag` for a tag selector, else the last
+    whole-word occurrence of the class/id that follows `class=`/`id=` in
+    the tag it sits in (the tag name isn't checked). The end is the next
+    `>`. None if there is no occurrence.
+    """
+    name, kind, value = selector
+    if kind is None:
+        tags = list(re.finditer(rf"<{re.escape(name)}(?![\w-])", html, re.I))
+        if not tags:
+            return None
+        close = html.find(">", tags[-1].end())
+        return len(html) if close < 0 else close + 1
+    # Class and id values are case-sensitive, like _matches
+    attr_re = _ATTR_VALUE_RE["class" if kind == "." else "id"]
+    end = len(html)
+    while (i := html.rfind(value, 0, end)) >= 0:
+        j = i + len(value)
+        end = j - 1
+        if (j < len(html) and _is_word_char(html[j])) or (i > 0 and _is_word_char(html[i - 1])):
+            continue
+        if not attr_re.search(html, html.rfind("<", 0, i) + 1, i):
+            continue
+        close = html.find(">", j)
+        return len(html) if close < 0 else close + 1
+    return None
+
+
+def _add_element(used: UsedSelectors, tag: str, attrs: dict[str, str | None]) -> None:
+    used.tags.add(tag)
+    for name, value in attrs.items():
+        used.attrs.add(name)
+        if value is None:
+            continue
+        if name == "class":
+            used.classes.update(value.split())
+        elif name == "id":
+            used.ids.add(value.strip())
+
+
+class _FoldParser(HTMLParser):
+    def __init__(self, selectors: Iterable[str]):
+        super().__init__(convert_charrefs=True)
+        self.selectors = [s for s in map(_parse_selector, selectors) if s]
+        self.used = UsedSelectors(tags=set(IMPLIED_TAGS))
+        self.stack: list[tuple[str, dict[str, str | None]]] = []
+        self.capture_depth: int | None = None  # stack depth of the current fold root
+        self.found = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k.lower(): v for k, v in attrs}
+        if self.capture_depth is None and any(_matches(tag, attrs, s) for s in self.selectors):
+            self.capture_depth = len(self.stack)
+            self.found += 1
+            for ancestor_tag, ancestor_attrs in self.stack:
+                _add_element(self.used, ancestor_tag, ancestor_attrs)
+        if self.capture_depth is not None:
+            _add_element(self.used, tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        attrs = {k.lower(): v for k, v in attrs}
+        if self.capture_depth is not None:
+            _add_element(self.used, tag, attrs)
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                del self.stack[depth:]
+                break
+        if self.capture_depth is not None and len(self.stack) <= self.capture_depth:
+            self.capture_depth = None
+
+
+# Parsing past the last fold root stops at the first chunk boundary after it.
+_FEED_CHUNK = 4096
+
+
+def fold_vocabulary(html: str, selectors: Iterable[str] = DEFAULT_SELECTORS) -> UsedSelectors | None:
+    """Vocabulary of the above-the-fold region, or None if no root matched.
+
+    Only the page up to the end of the last element that can be a fold root
+    is parsed (found by a string search over the raw HTML); the rest of
+    the page can't add to the vocabulary.
+    """
+    parser = _FoldParser(selectors)
+    ends = [e for e in (_last_candidate_end(html, s) for s in parser.selectors) if e is not None]
+    if not ends:
+        return None
+    last = max(ends)
+    parser.feed(html[:last])
+    fed = last
+    # Until that tag is handled and every open root has closed
+    while fed < len(html) and (fed - len(parser.rawdata) <= last or parser.capture_depth is not None):
+        parser.feed(html[fed:fed + _FEED_CHUNK])
+        fed += _FEED_CHUNK
+    if fed >= len(html):
+        parser.close()
+    return parser.used if parser.found else None
+
+
+_STRING_RE = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')")
+_CUSTOM_PROPERTY_RE = re.compile(r"(?<=[{;])(--[\w-]+):[^;{}]*(?:;|(?=}))")
+_VAR_RE = re.compile(r"var\(\s*(--[\w-]+)")
+
+
+def _compact(css: str) -> str:
+    """Drop comments and insignificant whitespace (strings untouched)."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    parts = _STRING_RE.split(css)
+    for i in range(0, len(parts), 2):  # even indexes are outside strings
+        text = re.sub(r"\s+", " ", parts[i])
+        parts[i] = re.sub(r"\s*([{};])\s*", r"\1", text)
+    return "".join(parts).strip()
+
+
+def _prune_custom_properties(css: str) -> str:
+    """Remove custom property definitions nothing in `css` reads.
+
+    The fold needs a handful of the design tokens in :root; a reference
+    from a kept definition keeps the one it points at.
+    """
+    definitions: dict[str, list[str]] = {}
+    for match in _CUSTOM_PROPERTY_RE.finditer(css):
+        definitions.setdefault(match.group(1), []).append(match.group(0))
+    body = _CUSTOM_PROPERTY_RE.sub("", css)
+    needed = set(_VAR_RE.findall(body))
+    pending = list(needed)
+    while pending:
+        for definition in definitions.get(pending.pop(), []):
+            for name in _VAR_RE.findall(definition):
+                if name not in needed:
+                    needed.add(name)
+                    pending.append(name)
+    css = _CUSTOM_PROPERTY_RE.sub(lambda m: m.group(0) if m.group(1) in needed else "", css)
+    # Rules (and groups) left empty
+    previous = None
+    while previous != css:
+        previous = css
+        css = re.sub(r"(^|[{};])[^{};]+\{\}", r"\1", css)
+    return css
+
+
+def _drop_print_rules(css: str) -> str:
+    """Remove `@media print` blocks; they never affect the first paint."""
+    out, i = [], 0
+    for match in re.finditer(r"@media print\{", css):
+        if match.start() < i:
+            continue
+        out.append(css[i:match.start()])
+        depth, j = 0, match.end() - 1
+        while j < len(css):
+            depth += {"{": 1, "}": -1}.get(css[j], 0)
+            j += 1
+            if depth == 0:
+                break
+        i = j
+    out.append(css[i:])
+    return "".join(out)
+
+
+def critical_rules(css: str, used: UsedSelectors) -> str:
+    """Rules of `css` that can match the fold vocabulary, compacted."""
+    css = _drop_print_rules(_compact(purge_css(css, used)))
+    return _prune_custom_properties(css) + "\n"
+
+
+def extract_critical_css(html: str, css: str, selectors: Iterable[str] = DEFAULT_SELECTORS) -> str | None:
+    """Rules of `css` that can apply above the fold, or None if no fold found."""
+    used = fold_vocabulary(html, selectors)
+    if used is None:
+        return None
+    return critical_rules(css, used)
+
+
+def _link_re(rel: str, href: str) -> re.Pattern:
+    return re.compile(
+        r"[ \t]*<link\b(?=[^>]*\brel=[\"']" + rel + r"[\"'])(?=[^>]*\bhref=[\"']"
+        + re.escape(href) + r"[\"'])[^>]*>[ \t]*\n?"
+    )
+
+
+_CRITICAL_BLOCK_RE = re.compile(r'(<style id="critical-css">\n).*?(\s*</style>)', re.S)
+
+
+def inline_critical_css(html: str, critical: str, href: str) -> str | None:
+    """Inline `critical` and load `href` without blocking render.
+
+    A page that already has inlined critical CSS gets its contents
+    replaced. Returns None (leave the page alone) if the stylesheet link
+    isn't found.
+    """
+    if _CRITICAL_BLOCK_RE.search(html):
+        return _CRITICAL_BLOCK_RE.sub(lambda m: m.group(1) + critical.rstrip("\n") + m.group(2), html, count=1)
+
+    stylesheet = _link_re("stylesheet", href)
+    match = stylesheet.search(html)
+    if not match:
+        return None
+    indent = re.match(r"[ \t]*", match.group(0)).group(0)
+    replacement = (
+        f"{indent}<style id=\"critical-css\">\n{critical}{indent}</style>\n"
+        f"{indent}<link rel=\"preload\" href=\"{href}\" as=\"style\" "
+        f"onload=\"this.onload=null;this.rel='stylesheet'\">\n"
+        f"{indent}<noscript><link rel=\"stylesheet\" href=\"{href}\"></noscript>\n"
+    )
+    html = html[:match.start()] + replacement + html[match.end():]
+    # The separate preload hint is now redundant.
+    preload = _link_re("preload", href)
+    first = preload.search(html)
+    if first and first.start() < html.find('<style id="critical-css">'):
+        html = html[:first.start()] + html[first.end():]
+    return html
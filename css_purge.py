@@ -0,0 +1,332 @@
+"""Remove CSS rules that no rendered page can match.
+
+The purge works from what the output actually contains: element names,
+classes, ids and attribute names collected from the rendered HTML, plus
+every word in the site's JavaScript (classes toggled at runtime such as
+`active`, `hidden` or `nav-open` appear there as string literals) and a
+configurable safelist.
+
+A selector is dropped only when it requires a class, id, element or
+attribute that never occurs. Pseudo-classes and their arguments (:not(),
+:is(), :has(), ...) are ignored, which can only keep a selector, never
+drop one. At-rules other than grouping rules (@media, @supports, ...) are
+kept as-is; grouping rules are purged recursively and dropped if empty.
+Kept rules are copied byte-for-byte.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Iterable
+
+# Bump when the matching rules change so cached usage is recollected.
+PURGE_VERSION = 1
+
+GROUPING_AT_RULES = {"media", "supports", "layer", "container", "document", "-moz-document"}
+
+# Always present in a parsed document even if the markup omits them.
+IMPLIED_TAGS = {"html", "head", "body"}
+
+_IDENT = r"(?:[\w-]|\\.)+"
+_CLASS_RE = re.compile(r"\.(" + _IDENT + r")")
+_ID_RE = re.compile(r"#(" + _IDENT + r")")
+_TAG_RE = re.compile(r"^([a-zA-Z][\w-]*)")
+_WORD_RE = re.compile(r"[A-Za-z_][\w-]*")
+_COMBINATOR_RE = re.compile(r"\s*[>+~]\s*|\s+")
+
+
+def _unescape(ident: str) -> str:
+    return re.sub(r"\\(.)", r"\1", ident)
+
+
+@dataclass
+class UsedSelectors:
+    """The vocabulary a selector may use and still match something."""
+    classes: set[str] = field(default_factory=set)
+    ids: set[str] = field(default_factory=set)
+    tags: set[str] = field(default_factory=set)
+    attrs: set[str] = field(default_factory=set)
+    patterns: list[re.Pattern] = field(default_factory=list)  # safelist regexes
+
+    def update(self, other: "UsedSelectors") -> None:
+        self.classes |= other.classes
+        self.ids |= other.ids
+        self.tags |= other.tags
+        self.attrs |= other.attrs
+        self.patterns.extend(p for p in other.patterns if p not in self.patterns)
+
+    def add_words(self, words: Iterable[str]) -> None:
+        """Treat each word as a possible class, id, element and attribute."""
+        for word in words:
+            self.classes.add(word)
+            self.ids.add(word)
+            self.tags.add(word.lower())
+            self.attrs.add(word.lower())
+
+    def add_safelist(self, entries: Iterable[str]) -> None:
+        """Plain names, or /regex/ matched against class and id names."""
+        for entry in entries:
+            if len(entry) > 2 and entry.startswith("/") and entry.endswith("/"):
+                self.patterns.append(re.compile(entry[1:-1]))
+            else:
+                self.add_words([entry])
+
+    def has_class(self, name: str) -> bool:
+        return name in self.classes or any(p.search(name) for p in self.patterns)
+
+    def has_id(self, name: str) -> bool:
+        return name in self.ids or any(p.search(name) for p in self.patterns)
+
+    def key(self) -> tuple:
+        """Comparable summary, to tell whether a purge would change."""
+        return (frozenset(self.classes), frozenset(self.ids), frozenset(self.tags),
+                frozenset(self.attrs), tuple(p.pattern for p in self.patterns))
+
+    def to_json(self) -> dict[str, list[str]]:
+        return {"classes": sorted(self.classes), "ids": sorted(self.ids),
+                "tags": sorted(self.tags), "attrs": sorted(self.attrs)}
+
+    @classmethod
+    def from_json(cls, data: dict[str, list[str]]) -> "UsedSelectors":
+        return cls(set(data.get("classes", [])), set(data.get("ids", [])),
+                   set(data.get("tags", [])), set(data.get("attrs", [])))
+
+
+class _UsageParser(HTMLParser):
+    def __init__(self, used: UsedSelectors):
+        super().__init__(convert_charrefs=True)
+        self.used = used
+
+    def handle_starttag(self, tag, attrs):
+        self.used.tags.add(tag.lower())
+        for name, value in attrs:
+            self.used.attrs.add(name.lower())
+            if value is None:
+                continue
+            if name == "class":
+                self.used.classes.update(value.split())
+            elif name == "id":
+                self.used.ids.add(value.strip())
+
+    handle_startendtag = handle_starttag
+
+
+def collect_html(html: str) -> UsedSelectors:
+    """Elements, classes, ids and attribute names used by a document."""
+    used = UsedSelectors(tags=set(IMPLIED_TAGS))
+    parser = _UsageParser(used)
+    parser.feed(html)
+    parser.close()
+    return used
+
+
+def collect_script(source: str) -> set[str]:
+    """Every identifier-like word in a script (purgecss-style extraction)."""
+    return set(_WORD_RE.findall(source))
+
+
+# -- selectors ---------------------------------------------------------------
+
+def _strip_brackets_and_pseudos(selector: str) -> tuple[str, list[str]]:
+    """Return the selector without [attr] and :pseudo parts, plus the attr names."""
+    out = []
+    attrs = []
+    i, n = 0, len(selector)
+    while i < n:
+        ch = selector[i]
+        if ch == "\\" and i + 1 < n:
+            out.append(selector[i:i + 2])
+            i += 2
+        elif ch == "[":
+            j = i + 1
+            quote = None
+            while j < n and (quote or selector[j] != "]"):
+                if quote:
+                    if selector[j] == "\\":
+                        j += 1
+                    elif selector[j] == quote:
+                        quote = None
+                elif selector[j] in "\"'":
+                    quote = selector[j]
+                j += 1
+            match = re.match(r"\s*(" + _IDENT + r")", selector[i + 1:j])
+            if match:
+                attrs.append(_unescape(match.group(1)).lower().split("|")[-1])
+            out.append("[]")  # keeps "a[x]" one compound
+            i = j + 1
+        elif ch == ":":
+            j = i + 1
+            if j < n and selector[j] == ":":
+                j += 1
+            while j < n and (selector[j].isalnum() or selector[j] in "-_"):
+                j += 1
+            if j < n and selector[j] == "(":
+                depth = 0
+                while j < n:
+                    if selector[j] == "(":
+                        depth += 1
+                    elif selector[j] == ")":
+                        depth -= 1
+                        if depth == 0:
+                            j += 1
+                            break
+                    j += 1
+            i = j
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out), attrs
+
+
+def selector_can_match(selector: str, used: UsedSelectors) -> bool:
+    """False only if the selector needs something the pages never contain."""
+    bare, attrs = _strip_brackets_and_pseudos(selector.strip())
+    if any(a not in used.attrs for a in attrs):
+        return False
+    for name in _CLASS_RE.findall(bare):
+        if not used.has_class(_unescape(name)):
+            return False
+    for name in _ID_RE.findall(bare):
+        if not used.has_id(_unescape(name)):
+            return False
+    for compound in _COMBINATOR_RE.split(bare):
+        match = _TAG_RE.match(compound)
+        if match and match.group(1).lower() not in used.tags:
+            return False
+    return True
+
+
+# -- stylesheet walking ------------------------------------------------------
+
+def _skip_comment_or_string(css: str, i: int) -> int:
+    """If css[i] starts a comment or string, return the index after it."""
+    if css.startswith("/*", i):
+        end = css.find("*/", i + 2)
+        return len(css) if end == -1 else end + 2
+    if css[i] in "\"'":
+        quote, j = css[i], i + 1
+        while j < len(css) and css[j] != quote:
+            j += 2 if css[j] == "\\" else 1
+        return j + 1
+    return i
+
+
+# Characters the scanners below stop at: braces, semicolons, string and comment starts
+_SCAN_RE = re.compile(r"[{};\"']|/\*")
+
+
+def _find(css: str, i: int, chars: str) -> int:
+    """Index of the first of `chars` at or after i, outside comments/strings."""
+    while (match := _SCAN_RE.search(css, i)) is not None:
+        i = match.start()
+        j = _skip_comment_or_string(css, i)
+        if j != i:
+            i = j
+            continue
+        if css[i] in chars:
+            return i
+        i += 1
+    return len(css)
+
+
+def _matching_brace(css: str, open_index: int) -> int:
+    depth = 0
+    i = open_index
+    while (match := _SCAN_RE.search(css, i)) is not None:
+        i = match.start()
+        j = _skip_comment_or_string(css, i)
+        if j != i:
+            i = j
+            continue
+        if css[i] == "{":
+            depth += 1
+        elif css[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(css) - 1
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    parts, depth, start, i = [], 0, 0, 0
+    while i < len(prelude):
+        j = _skip_comment_or_string(prelude, i)
+        if j != i:
+            i = j
+            continue
+        ch = prelude[i]
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(prelude[start:i])
+            start = i + 1
+        i += 1
+    parts.append(prelude[start:])
+    return parts
+
+
+def _only_comments(css: str) -> bool:
+    return not re.sub(r"/\*.*?\*/", "", css, flags=re.S).strip()
+
+
+def purge_css(css: str, used: UsedSelectors) -> str:
+    """Return css without the rules `used` shows can never match."""
+    out = []
+    i, n = 0, len(css)
+    while i < n:
+        # Copy whitespace and comments between rules through unchanged
+        # (whitespace alone is dropped along with a dropped rule).
+        j = i
+        while j < n:
+            if css[j].isspace():
+                j += 1
+            elif css.startswith("/*", j):
+                j = _skip_comment_or_string(css, j)
+            else:
+                break
+        gap = css[i:j]
+        out.append(gap)
+        i = j
+        if i >= n:
+            break
+
+        if css[i] == "}":  # stray brace; keep it rather than guess
+            out.append("}")
+            i += 1
+            continue
+
+        k = _find(css, i, "{;" if css[i] == "@" else "{")
+        if k >= n or css[k] == ";":  # statement at-rule (@import, @charset) or junk
+            out.append(css[i:k + 1])
+            i = k + 1
+            continue
+
+        end = _matching_brace(css, k)
+        prelude = css[i:k]
+        if css[i] == "@":
+            name = re.match(r"@([\w-]+)", prelude)
+            if name and name.group(1).lower() in GROUPING_AT_RULES:
+                inner = purge_css(css[k + 1:end], used)
+                if not _only_comments(inner):
+                    out.append(prelude + "{" + inner + "}")
+                elif not gap.strip():
+                    out.pop()
+            else:
+                out.append(css[i:end + 1])
+        else:
+            selectors = _split_selectors(prelude)
+            kept = [s for s in selectors if selector_can_match(s, used)]
+            if len(kept) == len(selectors):
+                out.append(css[i:end + 1])
+            elif kept:
+                trailing = prelude[len(prelude.rstrip()):]
+                out.append(",".join(kept).strip() + trailing + css[k:end + 1])
+            elif not gap.strip():
+                out.pop()
+        i = end + 1
+    return "".join(out)
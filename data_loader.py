@@ -0,0 +1,91 @@
+"""Cached YAML loading shared by the builder and project validation.
+
+Parses with libyaml's C loader when PyYAML was built with it, and keeps the
+parsed result both in memory (for the life of the loader) and on disk,
+keyed by the file's content hash. An unchanged data file is therefore
+parsed at most once, no matter how many times validation and the build
+ask for it.
+
+Every call returns its own copy, so a caller that modifies the data it
+got (e.g. adds defaults) doesn't change what later callers see.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML without libyaml
+    from yaml import SafeLoader
+
+# Bump if the cached representation changes.
+CACHE_VERSION = 1
+
+
+def load_text(text: str) -> Any:
+    """Parse a YAML string with the fastest available safe loader."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+class DataLoader:
+    """Loads YAML files through a memory + on-disk parse cache."""
+
+    def __init__(self, cache_dir: Path | str | None = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: dict[Path, tuple[str, Any]] = {}
+        self.parsed = 0  # files actually parsed (cache misses)
+
+    def _cache_file(self, path: Path) -> Path:
+        key = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{path.stem}-{key}.pickle"
+
+    def load(self, path: Path | str) -> Any:
+        """Return the parsed contents of a YAML file (a fresh copy per call).
+
+        Raises OSError / yaml.YAMLError like yaml.safe_load would.
+        """
+        path = Path(path).resolve()
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+
+        cached = self._memory.get(path)
+        if cached and cached[0] == digest:
+            return copy.deepcopy(cached[1])
+
+        data = self._read_disk_cache(path, digest)
+        if data is None:
+            data = load_text(raw.decode("utf-8"))
+            self.parsed += 1
+            self._write_disk_cache(path, digest, data)
+
+        self._memory[path] = (digest, data)
+        return copy.deepcopy(data)
+
+    def _read_disk_cache(self, path: Path, digest: str) -> Any:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_file(path), "rb") as f:
+                version, cached_digest, data = pickle.load(f)
+        except (FileNotFoundError, EOFError, ValueError, pickle.UnpicklingError):
+            return None
+        if version != CACHE_VERSION or cached_digest != digest:
+            return None
+        return data
+
+    def _write_disk_cache(self, path: Path, digest: str, data: Any) -> None:
+        if not self.cache_dir or data is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        target = self._cache_file(path)
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((CACHE_VERSION, digest, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(target)
@@ -0,0 +1,316 @@
+"""Watch mode and live reload for `site.py dev`.
+
+Watches content/, templates/ and static/ (inotify via watchdog when it is
+installed, mtime polling otherwise), debounces bursts of saves, rebuilds in
+process with SiteBuilder's incremental mode and notifies open browsers over
+Server-Sent Events. Stylesheet-only changes are hot-swapped without a page
+reload; pages with inlined critical CSS (#critical-css) get that block
+replaced from the rebuilt page as well. Editing a config file makes the
+next rebuild use a freshly configured builder.
+
+Pages are served by static_server.StaticServer, which injects the reload
+client into HTML responses, so nothing dev-only ends up in docs/.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+from static_server import DEFAULT_CACHE_CONTROL, StaticServer
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    Observer = None
+    FileSystemEventHandler = object
+
+LIVERELOAD_PATH = "/__livereload"
+
+# Editor temp/backup files that shouldn't trigger rebuilds.
+IGNORED_SUFFIXES = (".swp", ".swx", ".tmp", "~")
+IGNORED_PARTS = {"__pycache__", ".git"}
+
+LIVERELOAD_CLIENT = """<script>
+(function () {
+  var source = new EventSource('%s');
+  source.addEventListener('reload', function () { location.reload(); });
+  source.addEventListener('css', function (event) {
+    var assets = JSON.parse(event.data);
+    document.querySelectorAll('link[rel="stylesheet"], link[rel="preload"][as="style"]').forEach(function (link) {
+      var name = link.getAttribute('href').split('?')[0];
+      Object.keys(assets).forEach(function (logical) {
+        var stem = logical.replace(/\\.css$/, '');
+        if (name === logical || new RegExp('^' + stem + '\\\\.[0-9a-f]{8}\\\\.css$').test(name)) {
+          link.setAttribute('href', assets[logical] + '?t=' + Date.now());
+        }
+      });
+    });
+    // The inlined copy of the above-the-fold rules was rebuilt with the page
+    var inline = document.getElementById('critical-css');
+    if (inline) {
+      fetch(location.href, {cache: 'no-store'}).then(function (response) {
+        return response.text();
+      }).then(function (html) {
+        var fresh = new DOMParser().parseFromString(html, 'text/html').getElementById('critical-css');
+        if (fresh) {
+          inline.textContent = fresh.textContent;
+        }
+      });
+    }
+  });
+})();
+</script>
+""" % LIVERELOAD_PATH
+
+
+def _ignored(path: str) -> bool:
+    p = Path(path)
+    return p.name.endswith(IGNORED_SUFFIXES) or p.name.startswith(".#") or bool(IGNORED_PARTS & set(p.parts))
+
+
+class LiveReload:
+    """Fan-out of reload events to connected browsers.
+
+    Subscribers are asyncio queues on the server's event loop; publish()
+    is called from the watcher thread.
+    """
+
+    path = LIVERELOAD_PATH
+
+    def __init__(self):
+        self._clients: list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._clients.append((asyncio.get_running_loop(), q))
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue) -> None:
+        with self._lock:
+            self._clients = [(loop, c) for loop, c in self._clients if c is not q]
+
+    def publish(self, event: str, data: str = "") -> None:
+        with self._lock:
+            clients = list(self._clients)
+        for loop, q in clients:
+            loop.call_soon_threadsafe(q.put_nowait, (event, data))
+
+    @staticmethod
+    def inject(html: bytes) -> bytes:
+        """Add the reload client before </body>."""
+        marker = b"</body>"
+        index = html.rfind(marker)
+        client = LIVERELOAD_CLIENT.encode("utf-8")
+        if index == -1:
+            return html + client
+        return html[:index] + client + html[index:]
+
+
+class DebouncedWatcher:
+    """Collects changed paths and calls back once saves go quiet.
+
+    Roots are directories (watched recursively) or single files.
+    """
+
+    def __init__(self, roots: Iterable[Path], callback: Callable[[set[str]], None],
+                 debounce: float = 0.08, poll_interval: float = 0.25):
+        existing = [Path(r).resolve() for r in roots if Path(r).exists()]
+        self.roots = [r for r in existing if r.is_dir()]
+        self.files = [r for r in existing if r.is_file()]
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._pending: set[str] = set()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._observer = None
+
+    def notify(self, path: str) -> None:
+        if _ignored(path) or not self._watched(Path(path).resolve()):
+            return
+        with self._cond:
+            self._pending.add(path)
+            self._cond.notify()
+
+    def _watched(self, path: Path) -> bool:
+        # A file root's directory is watched too; skip its other entries
+        return path in self.files or any(_is_under(path, root) for root in self.roots)
+
+    def start(self) -> str:
+        """Start watching; returns the backend in use."""
+        threading.Thread(target=self._dispatch, daemon=True).start()
+        if Observer is not None:
+            handler = _WatchdogHandler(self)
+            self._observer = Observer()
+            for root in self.roots:
+                self._observer.schedule(handler, str(root), recursive=True)
+            for parent in {f.parent for f in self.files}:
+                self._observer.schedule(handler, str(parent), recursive=False)
+            self._observer.start()
+            return "inotify" if "inotify" in type(self._observer).__module__ else type(self._observer).__name__
+        threading.Thread(target=self._poll, daemon=True).start()
+        return "polling"
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                # Wait until no new events arrive for `debounce` seconds.
+                while True:
+                    seen = len(self._pending)
+                    self._cond.wait(self.debounce)
+                    if len(self._pending) == seen:
+                        break
+                changed, self._pending = self._pending, set()
+            self.callback(changed)
+
+    def _snapshot(self) -> dict[str, tuple[float, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if d not in IGNORED_PARTS]
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (st.st_mtime, st.st_size)
+        for path in self.files:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[str(path)] = (st.st_mtime, st.st_size)
+        return snapshot
+
+    def _poll(self) -> None:
+        previous = self._snapshot()
+        while not self._stopped:
+            time.sleep(self.poll_interval)
+            current = self._snapshot()
+            for path in set(previous) | set(current):
+                if previous.get(path) != current.get(path):
+                    self.notify(path)
+            previous = current
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    def __init__(self, watcher: DebouncedWatcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        self.watcher.notify(event.src_path)
+        dest = getattr(event, "dest_path", None)
+        if dest:
+            self.watcher.notify(dest)
+
+
+class DevServer:
+    """Serve docs/, watch sources and rebuild in process on change.
+
+    make_builder() returns a configured SiteBuilder; it is called again
+    when content/config.yaml or one of `config_files` changes.
+    build_options() gives the keyword arguments for SiteBuilder.build
+    (minification, jobs); the watch-mode ones are added on top.
+    """
+
+    def __init__(self, make_builder: Callable[[], object], host: str = "localhost", port: int = 8000,
+                 debounce: float = 0.08, poll_interval: float = 0.25, logger=None,
+                 build_options: Callable[[], dict] | None = None, config_files: Iterable[Path] = ()):
+        self.make_builder = make_builder
+        self.builder = builder = make_builder()
+        self.build_options = build_options or dict
+        self.config_files = {Path(f).resolve() for f in [builder.config_path, *config_files]}
+        self.host = host
+        self.port = port
+        self.logger = logger
+        self.livereload = LiveReload()
+        self.static_dir = builder.static_dir
+        self.watcher = DebouncedWatcher(
+            [builder.content_dir, builder.template_dir, builder.static_dir, *self.config_files],
+            self.rebuild,
+            debounce=debounce,
+            poll_interval=poll_interval,
+        )
+        self._build_lock = threading.Lock()
+
+    def _log(self, message: str) -> None:
+        if self.logger:
+            self.logger.info(message)
+        else:
+            print(message)
+
+    def rebuild(self, changed: set[str]) -> None:
+        """Incremental in-process rebuild, then push reload/CSS events."""
+        changed_paths = [Path(p).resolve() for p in changed]
+        static = self.static_dir.resolve()
+        images_changed = any(_is_under(p, static / "images") for p in changed_paths)
+        css_only = all(_is_under(p, static / "css") for p in changed_paths)
+
+        started = time.perf_counter()
+        with self._build_lock:
+            try:
+                if self.config_files & set(changed_paths):
+                    self._log("⚙️  Config changed; reloading it")
+                    self.builder = self.make_builder()
+                options = {**self.build_options(), "clean": False, "incremental": True,
+                           "images": images_changed, "precompress": False}
+                result = self.builder.build(**options)
+            except (Exception, SystemExit) as exc:  # keep watching after template/content errors
+                self._log(f"❌ Rebuild failed: {exc}")
+                return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        names = ", ".join(sorted(Path(p).name for p in changed)[:3])
+        self._log(
+            f"🔄 Rebuilt in {elapsed_ms:.0f} ms: {len(result.pages_written)} page(s) written "
+            f"({names}{'…' if len(changed) > 3 else ''})"
+        )
+        if css_only:
+            css_assets = {k: v for k, v in self.builder.assets.items() if k.endswith(".css")}
+            self.livereload.publish("css", json.dumps(css_assets or {"styles.css": "styles.css"}))
+        else:
+            self.livereload.publish("reload")
+
+    def serve_forever(self) -> None:
+        # Nothing cached while editing
+        no_store = {kind: "no-store" for kind in DEFAULT_CACHE_CONTROL}
+        server = StaticServer(self.builder.output_dir, self.host, self.port,
+                              cache_control=no_store, livereload=self.livereload)
+        backend = self.watcher.start()
+        self._log(f"👀 Watching content/, templates/, static/ ({backend})")
+        self._log(f"📡 Server running at http://{self.host}:{self.port} (live reload)")
+        try:
+            server.run()
+        finally:
+            self.watcher.stop()
+
+
+def _is_under(path: Path, root: Path) -> bool:
+    try:
+        path.relative_to(root)
+        return True
+    except ValueError:
+        return False
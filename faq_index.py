@@ -0,0 +1,115 @@
+"""Build-time search index for the FAQ section.
+
+The `#faq-search` box in main.js queries this index instead of scanning
+the DOM, so a keystroke costs a few lookups however long faq.yaml gets.
+
+Questions and answers (HTML stripped) are normalized the same way for
+English and Spanish:
+
+- fold: NFKD, combining marks dropped, lowercased ("Inundación" ->
+  "inundacion");
+- split into [a-z0-9] runs, dropping stop words and 1-character tokens;
+- stem: the first SUFFIX_RULES entry that matches and leaves at least
+  MIN_STEM characters is applied (plurals, gender, infinitives, -ing,
+  -ed, -ción, -mente, ...). The rules are light and language-agnostic
+  on purpose: queries and documents just have to land on the same term.
+
+The index maps each term to the docs containing it, as sorted positions
+in `docs` (the ids of the .faq-item elements). It also carries the stop
+words and suffix rules so the client normalizes queries exactly like
+this module does. A doc matches when it has every query word; the last
+word is matched as a prefix, since it may still be being typed (so it
+is kept even if it is a stop word or one character).
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from html.parser import HTMLParser
+from typing import Any
+
+# Bump when the index layout changes (main.js checks it).
+INDEX_VERSION = 1
+
+MIN_STEM = 3
+
+# (suffix, replacement); longest forms first, English and Spanish mixed.
+SUFFIX_RULES = [
+    ("amientos", ""), ("imientos", ""), ("amiento", ""), ("imiento", ""),
+    ("aciones", ""), ("iciones", ""), ("uciones", ""), ("acion", ""), ("icion", ""), ("ucion", ""),
+    ("ations", ""), ("ation", ""),
+    ("idades", ""), ("idad", ""), ("ities", ""), ("ity", ""),
+    ("amente", ""), ("mente", ""), ("ments", ""), ("ment", ""),
+    ("ingly", ""), ("edly", ""), ("ings", ""), ("ing", ""),
+    ("ies", "y"), ("ied", "y"),
+    ("ers", ""), ("es", ""), ("ed", ""), ("ly", ""), ("ar", ""), ("er", ""), ("ir", ""),
+    ("os", ""), ("as", ""), ("s", ""),
+    ("o", ""), ("a", ""), ("e", ""),
+]
+
+STOP_WORDS = frozenset("""
+    an and are as at be but by can do does for from how if in is it its me my of on or our so than
+    that the their them then there these they this to was we what when where which who why will with
+    you your
+    al como con de del el ella en es esta este la las lo los mas mi mis no para pero por que se si sin
+    su sus un una uno unos unas ya
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase without accents (á -> a, ñ -> n, ü -> u)."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.category(c).startswith("M")).lower()
+
+
+def stem(token: str) -> str:
+    for suffix, replacement in SUFFIX_RULES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            return token[: len(token) - len(suffix)] + replacement
+    return token
+
+
+def terms(text: str) -> list[str]:
+    """Index terms of a piece of plain text, in order."""
+    return [stem(t) for t in _TOKEN_RE.findall(fold(text)) if len(t) > 1 and t not in STOP_WORDS]
+
+
+class _TextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def html_text(markup: str) -> str:
+    parser = _TextParser()
+    parser.feed(markup)
+    parser.close()
+    return " ".join(parser.parts)
+
+
+def build_index(faq: dict[str, Any]) -> dict[str, Any]:
+    """Index the `faqs` of faq.yaml. Doc ids match the faq-item ids that
+    sections/faq.html renders (faq-<category>-<n>, n from 1)."""
+    docs: list[str] = []
+    postings: dict[str, set[int]] = {}
+    for category_key, category_data in (faq.get("faqs") or {}).items():
+        for n, question_data in enumerate(category_data.get("questions") or [], start=1):
+            doc = len(docs)
+            docs.append(f"faq-{category_key}-{n}")
+            text = question_data.get("question", "") + " " + html_text(question_data.get("answer", ""))
+            for term in terms(text):
+                postings.setdefault(term, set()).add(doc)
+    return {
+        "version": INDEX_VERSION,
+        "min_stem": MIN_STEM,
+        "suffixes": SUFFIX_RULES,
+        "stop_words": sorted(STOP_WORDS),
+        "docs": docs,
+        "terms": {term: sorted(found) for term, found in sorted(postings.items())},
+    }
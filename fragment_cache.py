@@ -0,0 +1,127 @@
+"""`{% cache %}` fragment caching for shared, data-driven template sections.
+
+    {% cache "faq", faq %} ... {% endcache %}
+
+renders the body once and reuses the HTML wherever the same fragment is
+rendered again with equal data. The key hashes:
+
+- the arguments: a name plus every value the body reads (they are
+  serialized as sorted JSON, so equal data gives an equal key);
+- the body's compiled form, so two fragments never collide;
+- a salt the builder sets per build: a digest of all template sources
+  (macros the body calls included) and the asset/image manifests.
+
+The body must not read anything that isn't in its arguments or the
+salt. For example, a fragment using `page.*` has to pass the values it
+uses.
+
+Rendered fragments are kept in memory for the build and on disk, so they
+are reused across builds and by render worker processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return str(value)  # dates, Undefined (-> ""), other scalars
+
+
+class FragmentCache:
+    """Rendered fragments by key, in memory and (optionally) on disk."""
+
+    def __init__(self, cache_dir: Path | str | None = None, salt: str = ""):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.salt = salt
+        self._memory: dict[str, str] = {}
+        self.used: set[str] = set()  # keys served since reset()
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self, salt: str) -> None:
+        """Start a build. A new salt makes every earlier fragment stale."""
+        if salt != self.salt:
+            self._memory.clear()
+        self.salt = salt
+        self.used = set()
+        self.hits = self.misses = 0
+
+    def key(self, body_id: str, values: list[Any]) -> str:
+        data = json.dumps(values, sort_keys=True, default=_json_default)
+        return hashlib.sha256(f"{self.salt}\0{body_id}\0{data}".encode("utf-8")).hexdigest()
+
+    def fetch(self, body_id: str, values: list[Any], render: Callable[[], str]) -> str:
+        key = self.key(body_id, values)
+        self.used.add(key)
+        html = self._memory.get(key)
+        if html is None and self.cache_dir:
+            try:
+                html = (self.cache_dir / f"{key}.html").read_text(encoding="utf-8")
+            except FileNotFoundError:
+                pass
+        if html is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            html = str(render())
+            self._store(key, html)
+        self._memory[key] = html
+        return html
+
+    def _store(self, key: str, html: str) -> None:
+        if not self.cache_dir:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            target = self.cache_dir / f"{key}.html"
+            tmp = target.with_name(f".{key}.{os.getpid()}.tmp")  # workers may race on a key
+            tmp.write_text(html, encoding="utf-8")
+            tmp.replace(target)
+        except OSError:
+            pass  # the cache is an optimization only
+
+    def prune(self) -> int:
+        """Delete on-disk fragments not used since reset(); returns the count."""
+        if not self.cache_dir or not self.cache_dir.exists():
+            return 0
+        removed = 0
+        for path in self.cache_dir.glob("*.html"):
+            if path.stem not in self.used:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+class FragmentCacheExtension(Extension):
+    """Adds {% cache name, value, ... %}...{% endcache %}."""
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache())
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        # Identifies the body by what it compiles to (node reprs carry no line numbers)
+        body_id = hashlib.sha256(repr(body).encode("utf-8")).hexdigest()[:16]
+        call = self.call_method("_cached", [nodes.Const(body_id), nodes.List(args)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _cached(self, body_id: str, values: list[Any], caller) -> Markup:
+        return Markup(self.environment.fragment_cache.fetch(body_id, values, caller))
@@ -0,0 +1,54 @@
+"""Whitespace and comment removal for rendered HTML pages.
+
+Only text between tags is touched: every run of whitespace collapses to a
+single space, or a single newline if it spanned lines, which renders the
+same under normal `white-space` handling. Tags (and so attribute values)
+are copied as they are, and so are the contents of <pre>, <textarea>,
+<script> (inline code and JSON-LD) and <style>. Comments are dropped
+except conditional comments (<!--[if ...]>) and any listed in `keep`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+RAW_TAGS = ("pre", "textarea", "script", "style")
+
+_TOKEN_RE = re.compile(
+    r"(?P<comment><!--.*?-->)"
+    r"|(?P<raw><(?P<raw_tag>" + "|".join(RAW_TAGS) + r")\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>.*?</(?P=raw_tag)\s*>)"
+    r"|(?P<tag><(?:[^>\"']|\"[^\"]*\"|'[^']*')*>)",
+    re.S | re.I,
+)
+# HTML whitespace only; \s would also eat non-breaking spaces.
+_SPACE_RE = re.compile(r"[ \t\n\r\f]+")
+
+
+def _collapse(text: str) -> str:
+    return _SPACE_RE.sub(lambda m: "\n" if "\n" in m.group(0) else " ", text)
+
+
+def _keep_comment(comment: str, keep: Iterable[str]) -> bool:
+    body = comment[4:-3]
+    return body.startswith("[if") or body.startswith("<![endif]") or any(k in body for k in keep)
+
+
+def minify_html(html: str, keep_comments: Iterable[str] = ()) -> str:
+    """Return html without comments and insignificant whitespace."""
+    keep = tuple(keep_comments)
+    out: list[str] = []
+    text: list[str] = []  # text since the last kept token; dropped comments join it
+    position = 0
+    for match in _TOKEN_RE.finditer(html):
+        text.append(html[position:match.start()])
+        position = match.end()
+        token = match.group(0)
+        if match.group("comment") and not _keep_comment(token, keep):
+            continue
+        out.append(_collapse("".join(text)))
+        text = []
+        out.append(token)
+    text.append(html[position:])
+    out.append(_collapse("".join(text)))
+    return "".join(out).strip() + "\n"
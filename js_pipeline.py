@@ -0,0 +1,194 @@
+"""JavaScript bundling and minification for static/js.
+
+Bundles are plain concatenations of scripts (build.js_bundles maps each
+output name to its sources); the site's scripts are classic scripts that
+share globals, so no module wrapping or tree-shaking is attempted.
+
+minify_js() is a whitespace and comment stripper that understands just
+enough JavaScript lexing (strings, template literals, regular expression
+literals) never to touch their contents. Line breaks are kept wherever
+automatic semicolon insertion could depend on them, so the output means
+the same thing as the input.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+# A space next to one of these is never needed.
+_TIGHT = set("{}()[];,=:?<>!&|*%^~")
+
+# After these a "/" starts a regular expression rather than a division.
+_REGEX_AFTER_CHARS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_AFTER_WORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+    "void", "throw", "instanceof", "yield", "await",
+}
+
+# A line break after / before these can't end a statement early.
+_JOIN_AFTER = set("{;,([")
+_JOIN_BEFORE = set("}])")
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch in "_$" or ord(ch) > 127
+
+
+def _skip_string(src: str, i: int) -> int:
+    """Index just past the quoted string starting at src[i]."""
+    quote, i = src[i], i + 1
+    while i < len(src) and src[i] != quote:
+        if src[i] == "\\":
+            i += 1
+        elif src[i] == "\n":  # unterminated; stop at the line end
+            return i
+        i += 1
+    return i + 1
+
+
+def _skip_template(src: str, i: int) -> int:
+    """Index just past the template literal starting at src[i]."""
+    i += 1
+    while i < len(src) and src[i] != "`":
+        if src[i] == "\\":
+            i += 2
+            continue
+        if src.startswith("${", i):
+            i = _skip_braces(src, i + 1)
+            continue
+        i += 1
+    return i + 1
+
+
+def _skip_braces(src: str, i: int) -> int:
+    """Index just past the {...} starting at src[i] (a ${} substitution)."""
+    depth = 0
+    while i < len(src):
+        ch = src[i]
+        if ch in "\"'":
+            i = _skip_string(src, i)
+            continue
+        if ch == "`":
+            i = _skip_template(src, i)
+            continue
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _skip_regex(src: str, i: int) -> int:
+    """Index just past the regular expression literal (and flags) at src[i]."""
+    i += 1
+    in_class = False
+    while i < len(src) and src[i] != "\n":
+        ch = src[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            i += 1
+            break
+        i += 1
+    while i < len(src) and _is_word(src[i]):
+        i += 1
+    return i
+
+
+def _regex_allowed(out: list[str]) -> bool:
+    """Whether a "/" following the emitted tokens begins a regex literal."""
+    text = "".join(out[-3:]).rstrip()
+    if not text:
+        return True
+    if text[-1] in _REGEX_AFTER_CHARS:
+        return True
+    if _is_word(text[-1]):
+        j = len(text)
+        while j > 0 and _is_word(text[j - 1]):
+            j -= 1
+        return text[j:] in _REGEX_AFTER_WORDS
+    return False
+
+
+def minify_js(source: str) -> str:
+    """Remove comments and insignificant whitespace from a script."""
+    src = source.replace("\r\n", "\n").replace("\r", "\n")
+    out: list[str] = []
+    pending = ""  # whitespace seen since the last token: "", " " or "\n"
+    last = ""  # last character emitted
+
+    def emit(token: str) -> None:
+        nonlocal pending, last
+        if pending and last:
+            first = token[0]
+            if pending == "\n" and (last in _JOIN_AFTER or first in _JOIN_BEFORE):
+                pending = " "
+            if pending == "\n":
+                out.append("\n")
+            elif not (last in _TIGHT or first in _TIGHT):
+                out.append(" ")
+        pending = ""
+        out.append(token)
+        last = token[-1]
+
+    i, n = 0, len(src)
+    while i < n:
+        ch = src[i]
+        if ch.isspace():
+            if ch == "\n":
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            i += 1
+        elif src.startswith("//", i):
+            end = src.find("\n", i)
+            i = n if end == -1 else end
+        elif src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            if "\n" in src[i:end]:
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            i = end
+        elif ch in "\"'":
+            j = _skip_string(src, i)
+            emit(src[i:j])
+            i = j
+        elif ch == "`":
+            j = _skip_template(src, i)
+            emit(src[i:j])
+            i = j
+        elif ch == "/" and _regex_allowed(out):
+            j = _skip_regex(src, i)
+            emit(src[i:j])
+            i = j
+        elif _is_word(ch):
+            j = i
+            while j < n and (_is_word(src[j]) or (src[j] == "." and src[j - 1].isdigit())):
+                j += 1
+            emit(src[i:j])
+            i = j
+        else:
+            emit(ch)
+            i += 1
+    return "".join(out).strip() + "\n"
+
+
+def bundle_js(sources: Iterable[Path], minify: bool = False) -> str:
+    """Concatenate scripts in order, minified if requested."""
+    parts = []
+    for path in sources:
+        text = path.read_text(encoding="utf-8")
+        parts.append(minify_js(text) if minify else text)
+    # The ";" keeps a script that ends without one from running into the next
+    return ";\n".join(p.rstrip("\n") for p in parts) + "\n" if len(parts) > 1 else "".join(parts)
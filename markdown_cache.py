@@ -0,0 +1,108 @@
+"""Memoized Markdown conversion for page bodies.
+
+A conversion is keyed by the SHA-256 of the Markdown source plus a
+fingerprint of the converter: the extension list and configuration and
+the versions of python-markdown and Pygments (codehilite output depends
+on both). The stored result holds the HTML, the table of contents (HTML
+and tokens) and the `meta` extension's metadata. Results are kept in memory
+for the life of the cache and on disk, one file per page (like
+data_loader.DataLoader), so an unchanged page skips Markdown entirely on
+the next build, including in a new process.
+
+The converter is reset before every conversion, and results are
+independent copies, so state can't leak from one page to the next.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import markdown
+
+try:
+    import pygments
+except ImportError:  # pragma: no cover - codehilite falls back without it
+    pygments = None
+
+# Bump if RenderedMarkdown changes.
+CACHE_VERSION = 2
+
+
+@dataclass
+class RenderedMarkdown:
+    html: str
+    meta: dict[str, list[str]] = field(default_factory=dict)
+
+
+class MarkdownCache:
+    """A Markdown converter whose results are cached by source + config."""
+
+    def __init__(self, extensions: list[str], extension_configs: dict[str, dict] | None = None,
+                 cache_dir: Path | str | None = None):
+        self.md = markdown.Markdown(extensions=extensions, extension_configs=extension_configs or {})
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        settings = (
+            CACHE_VERSION,
+            markdown.__version__,
+            getattr(pygments, "__version__", None),
+            list(extensions),
+            sorted((name, sorted(config.items())) for name, config in (extension_configs or {}).items()),
+        )
+        self.fingerprint = hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()
+        self._memory: dict[str, tuple[str, RenderedMarkdown]] = {}
+        self.converted = 0  # conversions actually run (cache misses)
+
+    def _key(self, source: str) -> str:
+        return hashlib.sha256((self.fingerprint + "\0" + source).encode("utf-8")).hexdigest()
+
+    def _cache_file(self, name: str) -> Path:
+        digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{Path(name).stem}-{digest}.pickle"
+
+    def convert(self, source: str, name: str) -> RenderedMarkdown:
+        """Render `source` (the body of page `name`), from cache if possible."""
+        key = self._key(source)
+        cached = self._memory.get(name)
+        if cached and cached[0] == key:
+            return copy.deepcopy(cached[1])
+
+        result = self._read_disk_cache(name, key)
+        if result is None:
+            self.md.reset()
+            html = self.md.convert(source)
+            result = RenderedMarkdown(
+                html=html,
+                meta=copy.deepcopy(getattr(self.md, "Meta", {})),
+            )
+            self.converted += 1
+            self._write_disk_cache(name, key, result)
+
+        self._memory[name] = (key, result)
+        return copy.deepcopy(result)
+
+    def _read_disk_cache(self, name: str, key: str) -> RenderedMarkdown | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._cache_file(name), "rb") as f:
+                stored_key, result = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            return None
+        return result if stored_key == key else None
+
+    def _write_disk_cache(self, name: str, key: str, result: RenderedMarkdown) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            target = self._cache_file(name)
+            tmp = target.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump((key, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(target)
+        except OSError:
+            pass  # the cache is an optimization only
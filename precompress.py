@@ -0,0 +1,162 @@
+"""Precompressed .gz / .br siblings for text outputs.
+
+Hosts that serve precompressed files (nginx gzip_static/brotli_static,
+Caddy precompressed, most CDNs, and `site.py serve`) pick index.html.gz or
+index.html.br next to index.html instead of compressing per request.
+
+Every compressible output is hashed; one whose digest matches the record
+in the cache file (and whose siblings are still there) is skipped, so a
+rebuild only compresses what changed. Compression runs in a thread pool:
+zlib and brotli release the GIL while they work. gzip output is
+reproducible (mtime 0, no file name). A sibling that would not be smaller
+than the original is not written. Brotli needs the optional `brotli`
+package; without it only gzip siblings are produced.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+PRECOMPRESS_VERSION = 1
+
+EXTENSIONS = {".html", ".css", ".js", ".mjs", ".svg", ".xml", ".json", ".webmanifest", ".txt"}
+
+SUFFIXES = {"gzip": ".gz", "brotli": ".br"}
+
+
+def available_formats(formats: Iterable[str]) -> list[str]:
+    """The requested formats this interpreter can produce, in order."""
+    return [f for f in formats if f in SUFFIXES and (f != "brotli" or brotli is not None)]
+
+
+def compress(data: bytes, fmt: str) -> bytes:
+    if fmt == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if fmt == "brotli":
+        return brotli.compress(data, quality=11)
+    raise ValueError(f"Unknown compression format '{fmt}'")
+
+
+@dataclass
+class PrecompressStats:
+    compressed: int = 0  # files (re)compressed
+    unchanged: int = 0
+    removed: int = 0  # stale siblings deleted
+    bytes_in: int = 0  # original size of compressed files
+    bytes_out: dict[str, int] = field(default_factory=dict)  # format -> total sibling size
+
+    def summary(self) -> str:
+        text = f"{self.compressed} compressed, {self.unchanged} unchanged"
+        if self.removed:
+            text += f", {self.removed} stale removed"
+        for fmt, size in sorted(self.bytes_out.items()):
+            text += f"; {fmt} {self.bytes_in / 1024:.1f} KB → {size / 1024:.1f} KB"
+        return text
+
+
+class Precompressor:
+    """Keeps .gz/.br siblings of text files under output_dir current."""
+
+    def __init__(self, output_dir: Path | str, cache_path: Path | str,
+                 formats: Iterable[str] = ("gzip", "brotli"), jobs: int | None = None):
+        self.output_dir = Path(output_dir)
+        self.cache_path = Path(cache_path)
+        self.formats = available_formats(formats)
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def candidates(self) -> list[Path]:
+        return sorted(
+            p for p in self.output_dir.rglob("*")
+            if p.suffix in EXTENSIONS and p.is_file() and not p.name.startswith(".")
+        )
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            payload = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        if payload.get("version") != PRECOMPRESS_VERSION or payload.get("formats") != self.formats:
+            return {}
+        return payload.get("files", {})
+
+    def _save(self, files: dict[str, dict]) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": PRECOMPRESS_VERSION, "formats": self.formats, "files": files}
+        self.cache_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+
+    def _process(self, path: Path, previous: dict | None) -> tuple[dict, dict[str, int] | None, int]:
+        """Compress one file unless it is unchanged.
+
+        Returns (cache entry, sibling sizes or None if skipped, siblings removed).
+        """
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        siblings = [path.with_name(path.name + SUFFIXES[f]) for f in (previous or {}).get("written", [])]
+        if previous and previous["digest"] == digest and all(s.exists() for s in siblings):
+            # Same bytes rewritten: keep the siblings at least as new as the
+            # file, which is how the static server tells they're current.
+            mtime = path.stat().st_mtime_ns
+            for sibling in siblings:
+                if sibling.stat().st_mtime_ns < mtime:
+                    os.utime(sibling, ns=(mtime, mtime))
+            return previous, None, 0
+
+        written, sizes, removed = [], {}, 0
+        for fmt in SUFFIXES:
+            sibling = path.with_name(path.name + SUFFIXES[fmt])
+            packed = compress(data, fmt) if fmt in self.formats else data
+            if len(packed) >= len(data):  # not worth it, or a format no longer produced
+                if sibling.exists():
+                    sibling.unlink()
+                    removed += 1
+                continue
+            tmp = sibling.with_name(f".{sibling.name}.tmp")
+            tmp.write_bytes(packed)
+            tmp.replace(sibling)
+            written.append(fmt)
+            sizes[fmt] = len(packed)
+        return {"digest": digest, "size": len(data), "written": written}, sizes, removed
+
+    def run(self) -> PrecompressStats:
+        stats = PrecompressStats()
+        previous = self._load()
+        files = self.candidates()
+        keys = [p.relative_to(self.output_dir).as_posix() for p in files]
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = list(pool.map(lambda p, k: self._process(p, previous.get(k)), files, keys))
+
+        entries = {}
+        for path, key, (entry, sizes, removed) in zip(files, keys, results):
+            entries[key] = entry
+            stats.removed += removed
+            if sizes is None:
+                stats.unchanged += 1
+                continue
+            stats.compressed += 1
+            stats.bytes_in += entry["size"]
+            for fmt, size in sizes.items():
+                stats.bytes_out[fmt] = stats.bytes_out.get(fmt, 0) + size
+
+        # Siblings of outputs that no longer exist
+        for key in set(previous) - set(entries):
+            for fmt in SUFFIXES:
+                sibling = self.output_dir / (key + SUFFIXES[fmt])
+                if sibling.exists():
+                    sibling.unlink()
+                    stats.removed += 1
+
+        self._save(entries)
+        return stats
@@ -0,0 +1,119 @@
+"""Span recording for `build.py --profile`.
+
+Spans are timed with the monotonic perf_counter clock, which is shared by
+all processes on the machine, so spans recorded in render/validator worker
+processes can be merged into the parent's timeline. The result is written
+as Chrome trace-event JSON (open it in chrome://tracing or ui.perfetto.dev)
+and summarized as a top-N table on the console.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Iterator
+
+# One recorded span: (name, category, start_ns, duration_ns, pid, tid, args)
+Span = tuple[str, str, int, int, int, int, dict[str, Any]]
+
+
+def span(profiler: "Profiler | None", name: str, cat: str = "build", **args: Any):
+    """profiler.span(...) when profiling, otherwise a no-op context."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name, cat, **args)
+
+
+class Profiler:
+    """Collects timed spans for one build."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self.origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, cat: str = "build", **args: Any) -> Iterator[None]:
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, cat, started, time.perf_counter_ns() - started, args)
+
+    def add(self, name: str, cat: str, start_ns: int, duration_ns: int,
+            args: dict[str, Any] | None = None) -> None:
+        record = (name, cat, start_ns, duration_ns, os.getpid(), threading.get_ident(), args or {})
+        with self._lock:
+            self.spans.append(record)
+
+    def extend(self, spans: list[Span]) -> None:
+        """Merge spans recorded in another process."""
+        with self._lock:
+            self.spans.extend(spans)
+
+    def drain(self) -> list[Span]:
+        """Return and forget the spans recorded so far (used by workers)."""
+        with self._lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+    def trace(self) -> dict[str, Any]:
+        """Chrome trace-event format ("X" complete events, microseconds)."""
+        main_pid = os.getpid()
+        events: list[dict[str, Any]] = []
+        for pid in sorted({s[4] for s in self.spans} | {main_pid}):
+            label = "build" if pid == main_pid else f"worker {pid}"
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}})
+        for name, cat, start_ns, duration_ns, pid, tid, args in sorted(self.spans, key=lambda s: s[2]):
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start_ns - self.origin) / 1000,
+                "dur": duration_ns / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.trace()), encoding="utf-8")
+        return path
+
+    def summary(self, top: int = 15) -> str:
+        """Per-category totals plus the `top` slowest individual spans.
+
+        Phase spans (category "phase") contain the others, so they are listed
+        separately and left out of the category totals and the ranking.
+        """
+        phases: dict[str, int] = {}
+        categories: dict[str, tuple[int, int]] = {}
+        leaves = []
+        for s in self.spans:
+            name, cat, _, duration_ns = s[:4]
+            if cat == "phase":
+                phases[name] = phases.get(name, 0) + duration_ns
+                continue
+            count, total = categories.get(cat, (0, 0))
+            categories[cat] = (count + 1, total + duration_ns)
+            leaves.append(s)
+
+        lines = ["Phases:"]
+        lines.extend(f"  {name:<24} {ns / 1e6:>10.1f} ms" for name, ns in phases.items())
+        lines.append("\nBy category:")
+        for cat, (count, total) in sorted(categories.items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"  {cat:<24} {total / 1e6:>10.1f} ms  ({count} spans)")
+        lines.append(f"\nTop {min(top, len(leaves))} spans:")
+        for name, cat, _, duration_ns, pid, _, _ in sorted(leaves, key=lambda s: -s[3])[:top]:
+            where = "" if pid == os.getpid() else f"  [worker {pid}]"
+            lines.append(f"  {duration_ns / 1e6:>10.1f} ms  {cat:<10} {name}{where}")
+        return "\n".join(lines)
@@ -4,12 +4,18 @@ Legs on the Ground - Unified CLI
 Main command interface for all project operations
 """
 
+import io
+import os
 import sys
 import argparse
+import contextlib
 import subprocess
 from pathlib import Path
 import yaml
 import logging
+
+from data_loader import DataLoader
+from snapshots import SnapshotStore
 from datetime import datetime
 import shutil
 
@@ -22,6 +28,10 @@ class SiteManager:
         self.config = self.load_config()
         self.setup_logging()
         
+        # Parsed YAML is shared between project validation and the build
+        cache_dir = self.config.get('build', {}).get('cache_dir', '.build-cache')
+        self.data_loader = DataLoader(self.root / cache_dir / 'yaml')
+        
     def load_config(self):
         """Load configuration"""
         if self.config_file.exists():
@@ -89,8 +99,7 @@ class SiteManager:
         
         for yaml_file in content_dir.glob('**/*.yaml'):
             try:
-                with open(yaml_file) as f:
-                    yaml.safe_load(f)
+                self.data_loader.load(yaml_file)
             except yaml.YAMLError as e:
                 errors.append(f"Invalid YAML in {yaml_file.name}: {str(e)}")
         
@@ -103,43 +112,123 @@ class SiteManager:
         # Simplified for now
         return errors
     
+    # Paths captured by backup snapshots
+    BACKUP_PATHS = ['content', 'templates', 'static', 'site.config.yaml']
+    
+    def snapshot_store(self):
+        """SnapshotStore at backup.location"""
+        backup_loc = self.root / self.config.get('backup', {}).get('location', 'backups')
+        return SnapshotStore(backup_loc, self.root)
+    
     def backup(self):
-        """Create backup of current state"""
+        """Create a content-addressed snapshot of the current state
+        
+        Only files changed since the last snapshot are hashed and only new
+        contents are stored, so the cost tracks what changed.
+        """
         if not self.config.get('backup', {}).get('enabled', True):
             self.logger.info("Backup disabled in config")
             return
         
         self.logger.info("💾 Creating backup...")
         
-        backup_loc = self.root / self.config.get('backup', {}).get('location', 'backups')
-        backup_loc.mkdir(exist_ok=True)
+        store = self.snapshot_store()
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_name = f"backup_{timestamp}"
-        backup_path = backup_loc / backup_name
+        # backup_* directory copies from before snapshots are left alone
+        legacy = store.legacy_directories()
+        if legacy:
+            self.logger.info(f"   {len(legacy)} pre-snapshot backup_* director{'y' if len(legacy) == 1 else 'ies'} "
+                             f"in {store.location.name}/ (import with: python site.py migrate-backups)")
         
-        # Backup critical files
-        important = ['content', 'templates', 'static', 'site.config.yaml']
-        backup_path.mkdir()
+        name, stored, stored_bytes = store.create(self.BACKUP_PATHS)
         
-        for item in important:
-            src = self.root / item
-            if src.exists():
-                if src.is_dir():
-                    shutil.copytree(src, backup_path / item)
-                else:
-                    shutil.copy2(src, backup_path / item)
+        # Keep only last N backups and M prerestore_* snapshots
+        # (unreferenced objects are removed)
+        backup_config = self.config.get('backup', {})
+        pruned, objects = store.prune(backup_config.get('keep_last', 5),
+                                      backup_config.get('keep_prerestore', 2))
+        if pruned:
+            self.logger.info(f"   Pruned {pruned} old snapshot(s), {objects} unreferenced object(s)")
         
-        # Keep only last N backups
-        keep_last = self.config.get('backup', {}).get('keep_last', 5)
-        backups = sorted(backup_loc.glob('backup_*'))
-        for old_backup in backups[:-keep_last]:
-            shutil.rmtree(old_backup)
+        self.logger.info(f"✅ Backup created: {name} ({stored} new file(s), {stored_bytes / 1024:.0f} KB stored)")
+        return name
+    
+    def migrate_backups(self, delete=False):
+        """Import pre-snapshot backup_* directories as snapshots
         
-        self.logger.info(f"✅ Backup created: {backup_name}")
+        The directories are kept unless delete is set.
+        """
+        store = self.snapshot_store()
+        migrated = store.migrate_legacy(remove=delete)
+        if not migrated:
+            self.logger.info("No backup_* directories to import")
+            return
+        for name in migrated:
+            self.logger.info(f"   Imported {name}")
+        left = [d.name for d in store.location.glob('backup_*') if d.is_dir()]
+        if left:
+            self.logger.info(f"✅ Imported {len(migrated)} backup(s); the original directories can now be removed "
+                             f"(or rerun with --delete)")
+        else:
+            self.logger.info(f"✅ Imported {len(migrated)} backup(s) and removed the directories")
+        return migrated
+    
+    def snapshots(self):
+        """List backup snapshots"""
+        store = self.snapshot_store()
+        names = store.names()
+        if not names:
+            print("No snapshots yet (run: python site.py backup)")
+            return
+        for name in names:
+            manifest = store.load(name)
+            size = sum(f['size'] for f in manifest['files'].values())
+            print(f"  {name}  {manifest['created']}  {len(manifest['files'])} files, {size / 1024 / 1024:.1f} MB")
+    
+    def diff(self, old='latest', new=None):
+        """Show what changed between two snapshots, or a snapshot and the working tree"""
+        store = self.snapshot_store()
+        old = store.resolve(old)
+        new = store.resolve(new) if new else None
+        changes = store.diff(old, new)
+        
+        print(f"📋 {old} → {new or 'working tree'}")
+        if not changes:
+            print("  No changes")
+            return changes
+        for label, marker, paths in (('added', '+', changes.added),
+                                     ('removed', '-', changes.removed),
+                                     ('modified', '~', changes.modified)):
+            for path in paths:
+                print(f"  {marker} {path}")
+        print(f"\n  {len(changes.added)} added, {len(changes.removed)} removed, {len(changes.modified)} modified")
+        return changes
+    
+    def restore(self, ref):
+        """Restore content/, templates/, static/ and site.config.yaml from a snapshot
+        
+        The current state is snapshotted first, so a restore can be undone.
+        """
+        store = self.snapshot_store()
+        name = store.resolve(ref)
+        
+        safety, _, _ = store.create(self.BACKUP_PATHS, name=datetime.now().strftime('prerestore_%Y%m%d_%H%M%S'))
+        self.logger.info(f"💾 Saved current state as {safety}")
+        
+        self.logger.info(f"⏪ Restoring {name}...")
+        changes = store.restore(name)
+        self.logger.info(
+            f"✅ Restored {name}: {len(changes.added)} file(s) recreated, "
+            f"{len(changes.modified)} reverted, {len(changes.removed)} removed"
+        )
+        return changes
     
     def build(self, validate_first=True):
-        """Build the site"""
+        """Build the site in-process
+        
+        Returns the BuildResult from build.SiteBuilder (falsy on failure),
+        or False if the build could not run.
+        """
         self.logger.info("🏗️  Building site...")
         
         # Auto-backup if enabled
@@ -151,55 +240,68 @@ class SiteManager:
             self.logger.error("❌ Build aborted due to validation errors")
             return False
         
-        # Run build
-        start_time = datetime.now()
-        
+        # Builder output is only shown when something goes wrong
+        output = io.StringIO()
         try:
-            cmd = ['python', 'build.py']
-
-            # Output validation (HTML/CSS) via build.py
-            if self.config.get('validation', {}).get('validate_output', True):
-                cmd.append('--validate')
-
-            # Optional CSS minification (bundled output only)
-            if self.config.get('performance', {}).get('minify_css', False):
-                cmd.append('--minify-css')
-
-            result = subprocess.run(
-                cmd,
-                cwd=self.root,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            build_time = (datetime.now() - start_time).total_seconds()
-            
-            self.logger.info(f"✅ Build completed in {build_time:.2f}s")
-            
-            # Track metrics
-            if self.config.get('performance', {}).get('track_build_time', True):
-                self._track_build_metrics(build_time)
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            details = (e.stderr or '').strip()
-            if e.stdout:
-                details = (details + "\n" + e.stdout.strip()).strip()
-            self.logger.error(f"❌ Build failed: {details}")
+            with contextlib.redirect_stdout(output):
+                builder = self.make_builder()
+                result = builder.build(**self.build_options())
+                
+                # Output validation (HTML/CSS)
+                validation = self.config.get('validation', {})
+                if validation.get('validate_output', True):
+                    builder.validate(result, changed_only=validation.get('changed_only', False))
+        except (Exception, SystemExit) as e:
+            self.logger.error(f"❌ Build failed: {e}\n{output.getvalue().strip()}")
             return False
+        
+        if not result:
+            self.logger.error(f"❌ Build failed validation:\n{output.getvalue().strip()}")
+            return result
+        
+        self.logger.info(
+            f"✅ Build completed in {result.elapsed:.2f}s "
+            f"({len(result.pages_written)} pages written, {result.pages_skipped} up to date)"
+        )
+        
+        # Track metrics
+        if performance.get('track_build_time', True):
+            self._track_build_metrics(result)
+        
+        return result
+    
+    def make_builder(self):
+        """SiteBuilder as `build` and `dev` use it: shared data loader, template mode from config"""
+        from build import SiteBuilder
+        
+        builder = SiteBuilder(data_loader=self.data_loader)
+        if self.config.get('build', {}).get('precompiled_templates', False):
+            builder.use_precompiled_templates()
+        return builder
+    
+    def build_options(self):
+        """SiteBuilder.build arguments from site.config.yaml"""
+        build_config = self.config.get('build', {})
+        performance = self.config.get('performance', {})
+        jobs = build_config.get('jobs', 1)
+        return {
+            # Only re-render pages whose inputs changed
+            'incremental': build_config.get('incremental', False),
+            # Parallel page rendering
+            'jobs': jobs if jobs > 0 else (os.cpu_count() or 1),
+            # Optional CSS minification (bundled output only)
+            'minify_css': performance.get('minify_css', False),
+            # JS bundles without comments/whitespace
+            'minify_js': performance.get('minify_js', False),
+            # Rendered pages without comments/extra whitespace
+            'minify_html': performance.get('minify_html', False),
+        }
     
-    def _track_build_metrics(self, build_time):
+    def _track_build_metrics(self, result):
         """Track build performance metrics"""
         metrics_file = self.root / "build_metrics.log"
         
-        output_dir = self.root / self.config.get('build', {}).get('output_dir', 'docs')
-        
-        # Calculate sizes
-        total_size = sum(f.stat().st_size for f in output_dir.rglob('*') if f.is_file())
-        
-        metrics = f"{datetime.now().isoformat()},{build_time:.2f},{total_size}\n"
+        metrics = f"{datetime.now().isoformat()},{result.elapsed:.2f},{result.output_bytes}\n"
         
         with open(metrics_file, 'a') as f:
             f.write(metrics)
@@ -214,28 +316,61 @@ class SiteManager:
         
         output_dir = self.root / self.config.get('build', {}).get('output_dir', 'docs')
         
+        # Precompressed files, ETags/304, ranges, keep-alive, Cache-Control
+        from static_server import StaticServer
+        server = StaticServer(
+            output_dir,
+            host=host,
+            port=port,
+            cache_control=config.get('cache_control'),
+            log=self.logger.info if config.get('access_log', False) else None,
+        )
+        
         self.logger.info(f"📡 Server running at http://{host}:{port}")
         self.logger.info("Press Ctrl+C to stop")
         
         try:
-            subprocess.run([
-                'python', '-m', 'http.server', str(port),
-                '--directory', str(output_dir)
-            ])
+            server.run()
         except KeyboardInterrupt:
             self.logger.info("\n👋 Server stopped")
     
     def dev(self):
-        """Development mode - build and serve with auto-reload"""
+        """Development mode - build, serve, and rebuild + live reload on change"""
         self.logger.info("🔧 Starting development mode...")
         
         # Initial build
         self.build(validate_first=True)
         
-        self.logger.info("💡 Tip: Edit files and run 'python site.py build' to rebuild")
+        dev_config = self.config.get('development', {})
+        server_config = dev_config.get('server', {})
+        if not server_config.get('auto_reload', True):
+            self.logger.info("💡 Tip: Edit files and run 'python site.py build' to rebuild")
+            self.serve()
+            return
         
-        # Start server
-        self.serve()
+        # Watch + in-process incremental rebuilds + live reload
+        from devserver import DevServer
+        
+        def make_builder():
+            # Called again when a config file changes, so re-read ours too
+            self.config = self.load_config()
+            return self.make_builder()
+        
+        watch_config = dev_config.get('watch', {})
+        server = DevServer(
+            make_builder,
+            build_options=self.build_options,
+            config_files=[self.config_file],
+            host=server_config.get('host', 'localhost'),
+            port=server_config.get('port', 8000),
+            debounce=watch_config.get('debounce_ms', 80) / 1000,
+            poll_interval=watch_config.get('poll_interval_ms', 250) / 1000,
+            logger=self.logger,
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.logger.info("\n👋 Server stopped")
     
     def clean(self):
         """Clean build artifacts"""
@@ -325,10 +460,9 @@ class SiteManager:
                 print(f"  Size: {size:,} bytes")
         
         # Backups
-        backup_loc = self.root / self.config.get('backup', {}).get('location', 'backups')
-        if backup_loc.exists():
-            backups = list(backup_loc.glob('backup_*'))
-            print(f"\n💾 Backups: {len(backups)}")
+        snapshots = self.snapshot_store().names()
+        if snapshots:
+            print(f"\n💾 Backups: {len(snapshots)} (latest: {snapshots[-1]})")
         
         print("\n" + "="*60)
         print("✅ Status check complete")
@@ -405,6 +539,18 @@ def main():
     # Backup command
     subparsers.add_parser('backup', help='Create backup')
     
+    # Snapshot commands
+    subparsers.add_parser('snapshots', help='List backup snapshots')
+    restore_parser = subparsers.add_parser('restore', help='Restore a backup snapshot')
+    restore_parser.add_argument('snapshot', help="Snapshot name, unique prefix/suffix, or 'latest'")
+    diff_parser = subparsers.add_parser('diff', help='Compare snapshots (or a snapshot and the working tree)')
+    diff_parser.add_argument('old', nargs='?', default='latest', help="Snapshot to compare from (default: latest)")
+    diff_parser.add_argument('new', nargs='?', help='Snapshot to compare to (default: working tree)')
+    migrate_parser = subparsers.add_parser('migrate-backups',
+                                           help='Import pre-snapshot backup_* directories as snapshots')
+    migrate_parser.add_argument('--delete', action='store_true',
+                                help='Remove each directory once it is stored as a snapshot')
+    
     # Analyze command
     subparsers.add_parser('analyze', help='Run visual analysis')
     
@@ -438,6 +584,10 @@ def main():
         'dev': manager.dev,
         'clean': manager.clean,
         'backup': manager.backup,
+        'snapshots': manager.snapshots,
+        'restore': lambda: manager.restore(args.snapshot),
+        'diff': lambda: manager.diff(args.old, args.new),
+        'migrate-backups': lambda: manager.migrate_backups(args.delete),
         'analyze': manager.analyze,
         'optimize': manager.optimize_images,
         'cleanup': lambda: manager.cleanup(args.aggressive if hasattr(args, 'aggressive') else False),
@@ -0,0 +1,284 @@
+"""Content-addressed backup snapshots for `site.py backup` / `restore`.
+
+Layout under the backup location:
+
+    objects/ab/cdef...     file contents, stored once per SHA-256
+    snapshots/<name>.json  per-snapshot manifest: path -> digest, size, mode, mtime
+
+A new snapshot only hashes files whose size or mtime differ from the
+previous snapshot and only stores objects it hasn't seen, so an unchanged
+tree costs a stat per file and a small JSON write. Pruning drops old
+manifests and then deletes objects no remaining snapshot references.
+
+Snapshots taken by `restore` (prerestore_*) are pruned separately from
+regular backups, so undo points never push real backups out. Plain
+directory copies left by the pre-snapshot `backup` (backup_<timestamp>/)
+can be imported as snapshots with migrate_legacy().
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+SNAPSHOT_VERSION = 1
+
+PRERESTORE_PREFIX = "prerestore_"
+LEGACY_PREFIX = "backup_"
+
+
+def _digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class SnapshotDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+
+class SnapshotStore:
+    """Snapshots of selected project paths, deduplicated by content."""
+
+    def __init__(self, location: Path | str, root: Path | str):
+        self.location = Path(location)
+        self.root = Path(root)
+        self.objects = self.location / "objects"
+        self.manifests = self.location / "snapshots"
+
+    # -- reading -----------------------------------------------------------
+
+    def names(self) -> list[str]:
+        """Snapshot names, oldest first (by when they were written)."""
+        if not self.manifests.exists():
+            return []
+        manifests = sorted(self.manifests.glob("*.json"), key=lambda p: (p.stat().st_mtime_ns, p.name))
+        return [p.stem for p in manifests]
+
+    def load(self, name: str) -> dict[str, Any]:
+        return json.loads((self.manifests / f"{name}.json").read_text(encoding="utf-8"))
+
+    def resolve(self, ref: str) -> str:
+        """Accept a full name, a unique prefix/suffix, or 'latest'."""
+        names = self.names()
+        if ref == "latest" and names:
+            return names[-1]
+        if ref in names:
+            return ref
+        matches = [n for n in names if n.startswith(ref) or n.endswith(ref)]
+        if len(matches) == 1:
+            return matches[0]
+        if not matches:
+            raise ValueError(f"No snapshot matches '{ref}'")
+        raise ValueError(f"'{ref}' is ambiguous: {', '.join(matches)}")
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    # -- writing -----------------------------------------------------------
+
+    def scan(self, paths: Iterable[str], previous: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Describe the current files under `paths` (relative to root).
+
+        Entries whose size and mtime match `previous` reuse its digest
+        instead of re-hashing the file.
+        """
+        previous = previous or {}
+        files: dict[str, Any] = {}
+        for item in paths:
+            src = self.root / item
+            if src.is_file():
+                candidates = [src]
+            elif src.is_dir():
+                candidates = sorted(p for p in src.rglob("*") if p.is_file())
+            else:
+                continue
+            for path in candidates:
+                rel = path.relative_to(self.root).as_posix()
+                st = path.stat()
+                old = previous.get(rel)
+                if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                    digest = old["digest"]
+                else:
+                    digest = _digest(path)
+                files[rel] = {
+                    "digest": digest,
+                    "size": st.st_size,
+                    "mode": st.st_mode & 0o777,
+                    "mtime_ns": st.st_mtime_ns,
+                }
+        return files
+
+    def create(self, paths: Iterable[str], name: str | None = None,
+               created: datetime | None = None, rehash: bool = False) -> tuple[str, int, int]:
+        """Snapshot `paths`. Returns (name, new objects, bytes stored).
+
+        `created` backdates the snapshot (it then sorts by that time).
+        rehash=True hashes every file instead of trusting size and mtime
+        matches against the latest snapshot.
+        """
+        names = self.names()
+        previous = self.load(names[-1])["files"] if names and not rehash else {}
+        files = self.scan(paths, previous)
+
+        stored = stored_bytes = 0
+        for rel, entry in files.items():
+            target = self.object_path(entry["digest"])
+            if target.exists():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(".tmp")
+            shutil.copyfile(self.root / rel, tmp)
+            tmp.replace(target)
+            stored += 1
+            stored_bytes += entry["size"]
+
+        name = name or datetime.now().strftime("backup_%Y%m%d_%H%M%S")
+        if name in names:
+            suffix = 1
+            while f"{name}_{suffix}" in names:
+                suffix += 1
+            name = f"{name}_{suffix}"
+
+        self.manifests.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "name": name,
+            "created": (created or datetime.now()).isoformat(timespec="seconds"),
+            "paths": list(paths),
+            "files": files,
+        }
+        tmp = self.manifests / f"{name}.json.tmp"
+        tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+        if created:
+            os.utime(tmp, (created.timestamp(), created.timestamp()))
+        tmp.replace(self.manifests / f"{name}.json")
+        return name, stored, stored_bytes
+
+    def legacy_directories(self) -> list[Path]:
+        """backup_<timestamp>/ directory copies that aren't snapshots yet."""
+        names = set(self.names())
+        return [d for d in sorted(self.location.glob(f"{LEGACY_PREFIX}*"))
+                if d.is_dir() and d.name not in names]
+
+    def migrate_legacy(self, remove: bool = False) -> list[str]:
+        """Import legacy_directories() as snapshots; returns the imported names.
+
+        Each keeps its name and date. The directories are left in place
+        unless `remove` is set, and even then only once every file of the
+        imported snapshot is in the object store.
+        """
+        migrated = []
+        for directory in self.legacy_directories():
+            try:
+                created = datetime.strptime(directory.name[len(LEGACY_PREFIX):][:15], "%Y%m%d_%H%M%S")
+            except ValueError:
+                created = datetime.fromtimestamp(directory.stat().st_mtime)
+            legacy = SnapshotStore(self.location, directory)
+            paths = sorted(p.name for p in directory.iterdir())
+            # A copy's size and mtime can match the live file's with other contents
+            name, _, _ = legacy.create(paths, name=directory.name, created=created, rehash=True)
+            migrated.append(name)
+            stored = self.load(name)["files"].values()
+            if remove and all(self.object_path(e["digest"]).stat().st_size == e["size"] for e in stored):
+                shutil.rmtree(directory)
+        return migrated
+
+    def prune(self, keep_last: int, keep_prerestore: int = 2) -> tuple[int, int]:
+        """Keep the newest `keep_last` backups and `keep_prerestore` prerestore_*
+        snapshots; returns (snapshots, objects) removed."""
+        names = self.names()
+        prerestore = [n for n in names if n.startswith(PRERESTORE_PREFIX)]
+        regular = [n for n in names if not n.startswith(PRERESTORE_PREFIX)]
+        doomed = regular[:-keep_last] if keep_last > 0 else regular
+        doomed += prerestore[:-keep_prerestore] if keep_prerestore > 0 else prerestore
+        for name in doomed:
+            (self.manifests / f"{name}.json").unlink()
+        if not doomed:
+            return 0, 0
+        return len(doomed), self.collect_garbage()
+
+    def collect_garbage(self) -> int:
+        """Delete objects that no snapshot references."""
+        live = set()
+        for name in self.names():
+            live.update(e["digest"] for e in self.load(name)["files"].values())
+        removed = 0
+        if not self.objects.exists():
+            return 0
+        for obj in self.objects.glob("*/*"):
+            if obj.parent.name + obj.name not in live:
+                obj.unlink()
+                removed += 1
+        return removed
+
+    def restore(self, name: str) -> SnapshotDiff:
+        """Make the snapshot's paths match it again.
+
+        Files the snapshot doesn't contain are removed from those paths.
+        Returns what changed, relative to the state before restoring.
+        """
+        manifest = self.load(name)
+        wanted = manifest["files"]
+        current = self.scan(manifest["paths"])
+        changes = self._compare(current, wanted)
+
+        for rel in changes.removed:  # present now, absent from the snapshot
+            (self.root / rel).unlink()
+        for rel in changes.added + changes.modified:
+            entry = wanted[rel]
+            dest = self.root / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(f".{dest.name}.restore-tmp")
+            shutil.copyfile(self.object_path(entry["digest"]), tmp)
+            os.chmod(tmp, entry["mode"])
+            tmp.replace(dest)
+            os.utime(dest, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+
+        # Drop directories emptied by removals
+        for item in manifest["paths"]:
+            base = self.root / item
+            if base.is_dir():
+                for d in sorted((p for p in base.rglob("*") if p.is_dir()), reverse=True):
+                    if not any(d.iterdir()):
+                        d.rmdir()
+        return changes
+
+    # -- comparing ---------------------------------------------------------
+
+    def diff(self, old: str, new: str | None = None) -> SnapshotDiff:
+        """Changes from snapshot `old` to snapshot `new` (or the working tree)."""
+        before = self.load(old)
+        if new is None:
+            names = self.names()
+            previous = self.load(names[-1])["files"] if names else {}
+            after = self.scan(before["paths"], previous)
+        else:
+            after = self.load(new)["files"]
+        return self._compare(before["files"], after)
+
+    @staticmethod
+    def _compare(before: dict[str, Any], after: dict[str, Any]) -> SnapshotDiff:
+        diff = SnapshotDiff()
+        for rel in sorted(set(before) | set(after)):
+            if rel not in before:
+                diff.added.append(rel)
+            elif rel not in after:
+                diff.removed.append(rel)
+            elif before[rel]["digest"] != after[rel]["digest"]:
+                diff.modified.append(rel)
+        return diff
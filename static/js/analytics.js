@@ -0,0 +1,393 @@
+/* ===================================
+   Legs on the Ground - Analytics Tracking
+   Loaded by main.js after the page is idle
+   =================================== */
+
+function initAnalytics() {
+    
+    // ===================================
+    // Enhanced Analytics Setup
+    // ===================================
+    
+    // Track all CTA buttons
+    function initCTATracking() {
+        // Primary CTAs (Book Property Visit, Contact buttons)
+        document.querySelectorAll('[data-cta="primary"], .cta-primary, .btn-primary').forEach(button => {
+            button.addEventListener('click', function(e) {
+                const section = this.getAttribute('data-section') || this.closest('section')?.className.split(' ')[0] || 'unknown';
+                const ctaText = this.textContent.trim();
+                const destination = this.getAttribute('href') || this.getAttribute('data-destination') || 'unknown';
+                
+                trackCTAClick('primary_cta', section, ctaText, destination);
+            });
+        });
+
+        // Secondary CTAs (View Services, Get Quote)
+        document.querySelectorAll('[data-cta="secondary"], .cta-secondary, .btn-secondary, .btn-outline').forEach(button => {
+            button.addEventListener('click', function(e) {
+                const section = this.getAttribute('data-section') || this.closest('section')?.className.split(' ')[0] || 'unknown';
+                const ctaText = this.textContent.trim();
+                const destination = this.getAttribute('href') || this.getAttribute('data-destination') || 'unknown';
+                
+                trackCTAClick('secondary_cta', section, ctaText, destination);
+            });
+        });
+
+        // Service-specific CTAs
+        document.querySelectorAll('.service-card .btn, .service-cta, [data-cta="service"]').forEach(button => {
+            button.addEventListener('click', function(e) {
+                const serviceCard = this.closest('.service-card');
+                const serviceName = this.getAttribute('data-service') || 
+                                  serviceCard?.querySelector('.service-title, h3')?.textContent.trim() || 'unknown';
+                const ctaText = this.textContent.trim();
+                const psychology = this.getAttribute('data-psychology') || 
+                                 serviceCard?.getAttribute('data-psychology') || 'none';
+                
+                trackCTAClick('service_inquiry', serviceName, ctaText, this.getAttribute('href') || '#contact');
+                trackServiceInterest(serviceName, 'cta_click', psychology);
+            });
+        });
+
+        // Package-specific CTAs with psychological tracking
+        document.querySelectorAll('.package-card .btn, [data-cta="package"]').forEach(button => {
+            button.addEventListener('click', function(e) {
+                const packageCard = this.closest('.package-card');
+                const packageName = this.getAttribute('data-package') || 
+                                  packageCard?.querySelector('.service-title, h4')?.textContent.trim() || 'unknown';
+                const ctaText = this.textContent.trim();
+                const psychology = this.getAttribute('data-psychology') || 
+                                 packageCard?.getAttribute('data-psychology') || 'none';
+                
+                trackCTAClick('package_inquiry', packageName, ctaText, this.getAttribute('href') || '#contact');
+                trackPackageInterest(packageName, 'cta_click', psychology);
+            });
+        });
+
+        // WhatsApp and phone links
+        document.querySelectorAll('a[href*="wa.me"], a[href*="whatsapp"], a[href^="tel:"]').forEach(link => {
+            link.addEventListener('click', function(e) {
+                const method = this.href.includes('wa.me') || this.href.includes('whatsapp') ? 'WhatsApp' : 'Phone';
+                const source = this.getAttribute('data-section') || 
+                              this.closest('section')?.className.split(' ')[0] || 'navigation';
+                
+                trackContactMethod(method, source);
+            });
+        });
+
+        // Email links
+        document.querySelectorAll('a[href^="mailto:"]').forEach(link => {
+            link.addEventListener('click', function(e) {
+                const source = this.getAttribute('data-section') || 
+                              this.closest('section')?.className.split(' ')[0] || 'navigation';
+                
+                gtag('event', 'email_click', {
+                    event_category: 'Contact',
+                    event_label: 'Email',
+                    source: source,
+                    value: 15
+                });
+            });
+        });
+
+        // Social media links
+        document.querySelectorAll('[data-cta="social"]').forEach(link => {
+            link.addEventListener('click', function(e) {
+                const platform = this.getAttribute('data-platform') || 'unknown';
+                const source = this.getAttribute('data-section') || 'unknown';
+                
+                gtag('event', 'social_click', {
+                    event_category: 'Social Media',
+                    event_label: platform,
+                    source: source,
+                    value: 3
+                });
+            });
+        });
+
+        // Navigation links
+        document.querySelectorAll('[data-cta="navigation"]').forEach(link => {
+            link.addEventListener('click', function(e) {
+                const destination = this.getAttribute('data-destination') || this.getAttribute('href');
+                
+                gtag('event', 'navigation_click', {
+                    event_category: 'Navigation',
+                    event_label: this.textContent.trim(),
+                    destination: destination,
+                    value: 2
+                });
+            });
+        });
+    }
+
+    // Track section visibility (for single-page navigation)
+    function initSectionTracking() {
+        const observer = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    const sectionName = entry.target.id || entry.target.className.split(' ')[0] || 'unknown';
+                    trackSectionView(sectionName);
+                }
+            });
+        }, {
+            threshold: 0.5, // Track when 50% of section is visible
+            rootMargin: '0px 0px -10% 0px'
+        });
+
+        document.querySelectorAll('section, .hero, .services, .testimonials').forEach(section => {
+            observer.observe(section);
+        });
+    }
+
+    // Track scroll depth
+    function initScrollTracking() {
+        let scrollDepthMarkers = [25, 50, 75, 90, 100];
+        let trackedMarkers = new Set();
+
+        window.addEventListener('scroll', function() {
+            const scrollPercent = Math.round((window.scrollY / (document.documentElement.scrollHeight - window.innerHeight)) * 100);
+            
+            scrollDepthMarkers.forEach(marker => {
+                if (scrollPercent >= marker && !trackedMarkers.has(marker)) {
+                    trackedMarkers.add(marker);
+                    trackScrollDepth(marker);
+                }
+            });
+        });
+    }
+
+    // Track form interactions
+    function initFormTracking() {
+        document.querySelectorAll('form').forEach(form => {
+            const formType = form.id || form.className || 'contact-form';
+            
+            // Track form start
+            form.addEventListener('focusin', function(e) {
+                if (e.target.tagName === 'INPUT' || e.target.tagName === 'TEXTAREA') {
+                    trackFormInteraction(formType, 'start', e.target.name || e.target.type);
+                }
+            }, { once: true });
+
+            // Track form submission
+            form.addEventListener('submit', function(e) {
+                trackFormInteraction(formType, 'submit', 'complete');
+                
+                // Track as conversion
+                gtag('event', 'conversion', {
+                    event_category: 'Forms',
+                    event_label: formType,
+                    value: 20
+                });
+            });
+
+            // Track field completions
+            form.querySelectorAll('input, textarea, select').forEach(field => {
+                field.addEventListener('blur', function() {
+                    if (this.value.trim() !== '') {
+                        trackFormInteraction(formType, 'field_complete', this.name || this.type);
+                    }
+                });
+            });
+        });
+    }
+
+    // Track service card interactions with journey phases
+    function initServiceTracking() {
+        document.querySelectorAll('.service-card').forEach(card => {
+            const serviceName = card.querySelector('.service-title, h3, h4')?.textContent.trim() || 'unknown';
+            const phase = card.getAttribute('data-phase') || 'unknown';
+            const isPackage = card.hasAttribute('data-package');
+            
+            // Track hover/focus interest with phase context
+            card.addEventListener('mouseenter', function() {
+                if (isPackage) {
+                    trackPackageInterest(serviceName, 'hover');
+                } else {
+                    trackServiceInterest(serviceName, 'hover', phase);
+                }
+            });
+
+            // Track detailed view with phase context
+            card.addEventListener('click', function(e) {
+                // Only track if not clicking a CTA button
+                if (!e.target.closest('.btn, .cta')) {
+                    if (isPackage) {
+                        trackPackageInterest(serviceName, 'card_click');
+                    } else {
+                        trackServiceInterest(serviceName, 'card_click', phase);
+                    }
+                }
+            });
+        });
+
+        // Track journey phase section views
+        document.querySelectorAll('.journey-phase').forEach(phase => {
+            const phaseType = phase.getAttribute('data-phase') || 'unknown';
+            const phaseTitle = phase.querySelector('.phase-title')?.textContent.trim() || phaseType;
+            
+            // Create intersection observer for phase visibility
+            const observer = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) {
+                        gtag('event', 'journey_phase_view', {
+                            event_category: 'Journey',
+                            event_label: phaseType,
+                            phase_title: phaseTitle,
+                            phase_type: phaseType
+                        });
+                    }
+                });
+            }, { threshold: 0.5 });
+            
+            observer.observe(phase);
+        });
+    }
+
+    // Enhanced navigation tracking
+    function initNavigationTracking() {
+        document.querySelectorAll('a[href^="#"]').forEach(link => {
+            link.addEventListener('click', function(e) {
+                const targetSection = this.getAttribute('href').replace('#', '');
+                
+                gtag('event', 'internal_navigation', {
+                    event_category: 'Navigation',
+                    event_label: targetSection,
+                    destination: targetSection
+                });
+            });
+        });
+    }
+
+    // Initialize all tracking
+    initCTATracking();
+    initSectionTracking();
+    initScrollTracking();
+    initFormTracking();
+    initServiceTracking();
+    initNavigationTracking();
+}
+
+// ===================================
+// Analytics Tracking Helper Functions
+// ===================================
+
+// Track CTA button clicks with enhanced data
+function trackCTAClick(ctaType, section, ctaText, destination) {
+    gtag('event', 'cta_click', {
+        event_category: 'CTA',
+        event_label: ctaType,
+        cta_type: ctaType,
+        section: section,
+        cta_text: ctaText,
+        destination: destination,
+        value: CONVERSION_VALUES[ctaType] || 1
+    });
+}
+
+// Track service interest with psychological context
+function trackServiceInterest(serviceName, interactionType, psychology = null) {
+    gtag('event', 'service_interest', {
+        event_category: 'Services',
+        event_label: serviceName,
+        service_name: serviceName,
+        interaction_type: interactionType,
+        psychological_appeal: psychology,
+        value: CONVERSION_VALUES.service_interest || 1
+    });
+    
+    // Track psychological optimization effectiveness
+    if (psychology) {
+        gtag('event', 'psychological_element_interaction', {
+            event_category: 'Psychology',
+            event_label: psychology,
+            element_type: 'service',
+            service_name: serviceName,
+            interaction_type: interactionType
+        });
+    }
+}
+
+// Track package interest with psychological context
+function trackPackageInterest(packageName, interactionType, psychology = null) {
+    gtag('event', 'package_interest', {
+        event_category: 'Packages',
+        event_label: packageName,
+        package_name: packageName,
+        interaction_type: interactionType,
+        psychological_appeal: psychology,
+        value: CONVERSION_VALUES.package_interest || 3
+    });
+    
+    // Track psychological optimization effectiveness
+    if (psychology) {
+        gtag('event', 'psychological_element_interaction', {
+            event_category: 'Psychology',
+            event_label: psychology,
+            element_type: 'package',
+            package_name: packageName,
+            interaction_type: interactionType
+        });
+    }
+    
+    // Track choice architecture effectiveness
+    trackChoiceArchitecture(packageName, psychology);
+}
+
+// Track journey progression through phases
+function trackJourneyProgression(fromPhase, toPhase) {
+    gtag('event', 'journey_progression', {
+        event_category: 'Journey',
+        event_label: `${fromPhase}_to_${toPhase}`,
+        from_phase: fromPhase,
+        to_phase: toPhase,
+        value: CONVERSION_VALUES.journey_progression || 2
+    });
+}
+
+// Track choice architecture effectiveness (Rule of 3, Goldilocks Effect, Decoy Effect)
+function trackChoiceArchitecture(choice, psychology) {
+    const architectureType = getArchitectureType(choice, psychology);
+    
+    gtag('event', 'choice_architecture', {
+        event_category: 'Psychology',
+        event_label: architectureType,
+        choice_made: choice,
+        psychological_appeal: psychology,
+        architecture_type: architectureType
+    });
+}
+
+// Determine which psychological principle was triggered
+function getArchitectureType(choice, psychology) {
+    if (psychology && psychology.includes('Most Popular')) {
+        return 'goldilocks_effect';
+    } else if (psychology && psychology.includes('Decoy')) {
+        return 'decoy_effect';
+    } else if (psychology && psychology.includes('Entry')) {
+        return 'entry_point';
+    }
+    return 'rule_of_three';
+}
+
+// Track A/B test performance for psychological optimization
+function trackPsychologicalOptimization() {
+    gtag('event', 'ab_test_exposure', {
+        event_category: 'A/B Testing',
+        event_label: 'journey_based_3_services',
+        test_variation: 'psychological_3_services',
+        service_count: 3,
+        package_count: 3,
+        psychological_principles: 'rule_of_three,goldilocks_effect,decoy_effect'
+    });
+}
+
+// This bundle is loaded after DOMContentLoaded, but guard anyway
+function startAnalytics() {
+    initAnalytics();
+    trackPsychologicalOptimization();
+}
+
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', startAnalytics);
+} else {
+    startAnalytics();
+}
@@ -5,266 +5,6 @@
 // Wait for DOM to be fully loaded
 document.addEventListener('DOMContentLoaded', function() {
     
-    // ===================================
-    // Enhanced Analytics Setup
-    // ===================================
-    
-    // Track all CTA buttons
-    function initCTATracking() {
-        // Primary CTAs (Book Property Visit, Contact buttons)
-        document.querySelectorAll('[data-cta="primary"], .cta-primary, .btn-primary').forEach(button => {
-            button.addEventListener('click', function(e) {
-                const section = this.getAttribute('data-section') || this.closest('section')?.className.split(' ')[0] || 'unknown';
-                const ctaText = this.textContent.trim();
-                const destination = this.getAttribute('href') || this.getAttribute('data-destination') || 'unknown';
-                
-                trackCTAClick('primary_cta', section, ctaText, destination);
-            });
-        });
-
-        // Secondary CTAs (View Services, Get Quote)
-        document.querySelectorAll('[data-cta="secondary"], .cta-secondary, .btn-secondary, .btn-outline').forEach(button => {
-            button.addEventListener('click', function(e) {
-                const section = this.getAttribute('data-section') || this.closest('section')?.className.split(' ')[0] || 'unknown';
-                const ctaText = this.textContent.trim();
-                const destination = this.getAttribute('href') || this.getAttribute('data-destination') || 'unknown';
-                
-                trackCTAClick('secondary_cta', section, ctaText, destination);
-            });
-        });
-
-        // Service-specific CTAs
-        document.querySelectorAll('.service-card .btn, .service-cta, [data-cta="service"]').forEach(button => {
-            button.addEventListener('click', function(e) {
-                const serviceCard = this.closest('.service-card');
-                const serviceName = this.getAttribute('data-service') || 
-                                  serviceCard?.querySelector('.service-title, h3')?.textContent.trim() || 'unknown';
-                const ctaText = this.textContent.trim();
-                const psychology = this.getAttribute('data-psychology') || 
-                                 serviceCard?.getAttribute('data-psychology') || 'none';
-                
-                trackCTAClick('service_inquiry', serviceName, ctaText, this.getAttribute('href') || '#contact');
-                trackServiceInterest(serviceName, 'cta_click', psychology);
-            });
-        });
-
-        // Package-specific CTAs with psychological tracking
-        document.querySelectorAll('.package-card .btn, [data-cta="package"]').forEach(button => {
-            button.addEventListener('click', function(e) {
-                const packageCard = this.closest('.package-card');
-                const packageName = this.getAttribute('data-package') || 
-                                  packageCard?.querySelector('.service-title, h4')?.textContent.trim() || 'unknown';
-                const ctaText = this.textContent.trim();
-                const psychology = this.getAttribute('data-psychology') || 
-                                 packageCard?.getAttribute('data-psychology') || 'none';
-                
-                trackCTAClick('package_inquiry', packageName, ctaText, this.getAttribute('href') || '#contact');
-                trackPackageInterest(packageName, 'cta_click', psychology);
-            });
-        });
-
-        // WhatsApp and phone links
-        document.querySelectorAll('a[href*="wa.me"], a[href*="whatsapp"], a[href^="tel:"]').forEach(link => {
-            link.addEventListener('click', function(e) {
-                const method = this.href.includes('wa.me') || this.href.includes('whatsapp') ? 'WhatsApp' : 'Phone';
-                const source = this.getAttribute('data-section') || 
-                              this.closest('section')?.className.split(' ')[0] || 'navigation';
-                
-                trackContactMethod(method, source);
-            });
-        });
-
-        // Email links
-        document.querySelectorAll('a[href^="mailto:"]').forEach(link => {
-            link.addEventListener('click', function(e) {
-                const source = this.getAttribute('data-section') || 
-                              this.closest('section')?.className.split(' ')[0] || 'navigation';
-                
-                gtag('event', 'email_click', {
-                    event_category: 'Contact',
-                    event_label: 'Email',
-                    source: source,
-                    value: 15
-                });
-            });
-        });
-
-        // Social media links
-        document.querySelectorAll('[data-cta="social"]').forEach(link => {
-            link.addEventListener('click', function(e) {
-                const platform = this.getAttribute('data-platform') || 'unknown';
-                const source = this.getAttribute('data-section') || 'unknown';
-                
-                gtag('event', 'social_click', {
-                    event_category: 'Social Media',
-                    event_label: platform,
-                    source: source,
-                    value: 3
-                });
-            });
-        });
-
-        // Navigation links
-        document.querySelectorAll('[data-cta="navigation"]').forEach(link => {
-            link.addEventListener('click', function(e) {
-                const destination = this.getAttribute('data-destination') || this.getAttribute('href');
-                
-                gtag('event', 'navigation_click', {
-                    event_category: 'Navigation',
-                    event_label: this.textContent.trim(),
-                    destination: destination,
-                    value: 2
-                });
-            });
-        });
-    }
-
-    // Track section visibility (for single-page navigation)
-    function initSectionTracking() {
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    const sectionName = entry.target.id || entry.target.className.split(' ')[0] || 'unknown';
-                    trackSectionView(sectionName);
-                }
-            });
-        }, {
-            threshold: 0.5, // Track when 50% of section is visible
-            rootMargin: '0px 0px -10% 0px'
-        });
-
-        document.querySelectorAll('section, .hero, .services, .testimonials').forEach(section => {
-            observer.observe(section);
-        });
-    }
-
-    // Track scroll depth
-    function initScrollTracking() {
-        let scrollDepthMarkers = [25, 50, 75, 90, 100];
-        let trackedMarkers = new Set();
-
-        window.addEventListener('scroll', function() {
-            const scrollPercent = Math.round((window.scrollY / (document.documentElement.scrollHeight - window.innerHeight)) * 100);
-            
-            scrollDepthMarkers.forEach(marker => {
-                if (scrollPercent >= marker && !trackedMarkers.has(marker)) {
-                    trackedMarkers.add(marker);
-                    trackScrollDepth(marker);
-                }
-            });
-        });
-    }
-
-    // Track form interactions
-    function initFormTracking() {
-        document.querySelectorAll('form').forEach(form => {
-            const formType = form.id || form.className || 'contact-form';
-            
-            // Track form start
-            form.addEventListener('focusin', function(e) {
-                if (e.target.tagName === 'INPUT' || e.target.tagName === 'TEXTAREA') {
-                    trackFormInteraction(formType, 'start', e.target.name || e.target.type);
-                }
-            }, { once: true });
-
-            // Track form submission
-            form.addEventListener('submit', function(e) {
-                trackFormInteraction(formType, 'submit', 'complete');
-                
-                // Track as conversion
-                gtag('event', 'conversion', {
-                    event_category: 'Forms',
-                    event_label: formType,
-                    value: 20
-                });
-            });
-
-            // Track field completions
-            form.querySelectorAll('input, textarea, select').forEach(field => {
-                field.addEventListener('blur', function() {
-                    if (this.value.trim() !== '') {
-                        trackFormInteraction(formType, 'field_complete', this.name || this.type);
-                    }
-                });
-            });
-        });
-    }
-
-    // Track service card interactions with journey phases
-    function initServiceTracking() {
-        document.querySelectorAll('.service-card').forEach(card => {
-            const serviceName = card.querySelector('.service-title, h3, h4')?.textContent.trim() || 'unknown';
-            const phase = card.getAttribute('data-phase') || 'unknown';
-            const isPackage = card.hasAttribute('data-package');
-            
-            // Track hover/focus interest with phase context
-            card.addEventListener('mouseenter', function() {
-                if (isPackage) {
-                    trackPackageInterest(serviceName, 'hover');
-                } else {
-                    trackServiceInterest(serviceName, 'hover', phase);
-                }
-            });
-
-            // Track detailed view with phase context
-            card.addEventListener('click', function(e) {
-                // Only track if not clicking a CTA button
-                if (!e.target.closest('.btn, .cta')) {
-                    if (isPackage) {
-                        trackPackageInterest(serviceName, 'card_click');
-                    } else {
-                        trackServiceInterest(serviceName, 'card_click', phase);
-                    }
-                }
-            });
-        });
-
-        // Track journey phase section views
-        document.querySelectorAll('.journey-phase').forEach(phase => {
-            const phaseType = phase.getAttribute('data-phase') || 'unknown';
-            const phaseTitle = phase.querySelector('.phase-title')?.textContent.trim() || phaseType;
-            
-            // Create intersection observer for phase visibility
-            const observer = new IntersectionObserver((entries) => {
-                entries.forEach(entry => {
-                    if (entry.isIntersecting) {
-                        gtag('event', 'journey_phase_view', {
-                            event_category: 'Journey',
-                            event_label: phaseType,
-                            phase_title: phaseTitle,
-                            phase_type: phaseType
-                        });
-                    }
-                });
-            }, { threshold: 0.5 });
-            
-            observer.observe(phase);
-        });
-    }
-
-    // Enhanced navigation tracking
-    function initNavigationTracking() {
-        document.querySelectorAll('a[href^="#"]').forEach(link => {
-            link.addEventListener('click', function(e) {
-                const targetSection = this.getAttribute('href').replace('#', '');
-                
-                gtag('event', 'internal_navigation', {
-                    event_category: 'Navigation',
-                    event_label: targetSection,
-                    destination: targetSection
-                });
-            });
-        });
-    }
-
-    // Initialize all tracking
-    initCTATracking();
-    initSectionTracking();
-    initScrollTracking();
-    initFormTracking();
-    initServiceTracking();
-    initNavigationTracking();
-
     // ===================================
     // Mobile Menu Toggle
     // ===================================
@@ -685,6 +425,44 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // ===================================
+    // Lazy FAQ Answers (build.faq_shards)
+    // ===================================
+    // A category with data-shard ships its answers as JSON; each answer
+    // holds a link to the fallback page until the shard is fetched.
+    const faqShards = {};
+    
+    function loadFaqShard(category) {
+        const url = category && category.getAttribute('data-shard');
+        if (!url) {
+            return Promise.resolve();
+        }
+        if (!faqShards[url]) {
+            faqShards[url] = fetch(url)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then(shard => {
+                    category.querySelectorAll('.faq-answer[data-answer]').forEach(answer => {
+                        const html = shard.answers[answer.getAttribute('data-answer')];
+                        if (html !== undefined) {
+                            answer.innerHTML = html;
+                        }
+                    });
+                    category.removeAttribute('data-shard');
+                })
+                .catch(error => {
+                    // Keep the fallback links; the next open retries
+                    delete faqShards[url];
+                    console.warn(`FAQ answers not loaded from ${url}:`, error);
+                });
+        }
+        return faqShards[url];
+    }
+    
     // ===================================
     // FAQ Accordion - Fortune 100 Professional Implementation
     // ===================================
@@ -719,10 +497,24 @@ document.addEventListener('DOMContentLoaded', function() {
                     // Set max-height to the scroll height for smooth animation
                     if (faqAnswer) {
                         faqAnswer.style.maxHeight = faqAnswer.scrollHeight + 'px';
+                        
+                        // Grow to the real answer once its shard arrives
+                        loadFaqShard(faqItem.closest('.faq-category')).then(() => {
+                            if (faqItem.classList.contains('active')) {
+                                faqAnswer.style.maxHeight = faqAnswer.scrollHeight + 'px';
+                            }
+                        });
                     }
                 }
             });
             
+            // Start fetching answers as soon as a question is likely to be opened
+            ['pointerenter', 'focus'].forEach(type => {
+                question.addEventListener(type, function() {
+                    loadFaqShard(this.closest('.faq-category'));
+                }, { once: true });
+            });
+            
             // Keyboard accessibility
             question.addEventListener('keydown', function(e) {
                 if (e.key === 'Enter' || e.key === ' ') {
@@ -747,38 +539,164 @@ document.addEventListener('DOMContentLoaded', function() {
         const faqCategories = document.querySelectorAll('.faq-category');
         
         // FAQ Search functionality
-        if (searchInput) {
-            searchInput.addEventListener('input', function() {
-                const searchTerm = this.value.toLowerCase().trim();
-                
-                faqItems.forEach(item => {
-                    const question = item.querySelector('.faq-question span').textContent.toLowerCase();
-                    const answer = item.querySelector('.faq-answer').textContent.toLowerCase();
-                    const matches = question.includes(searchTerm) || answer.includes(searchTerm);
-                    
-                    if (searchTerm === '' || matches) {
-                        item.classList.remove('hidden');
-                    } else {
-                        item.classList.add('hidden');
-                        // Close the item if it's open and being hidden
-                        item.classList.remove('active');
-                        const btn = item.querySelector('.faq-question');
-                        const answer = item.querySelector('.faq-answer');
-                        btn.setAttribute('aria-expanded', 'false');
-                        if (answer) {
-                            answer.style.maxHeight = '0';
+        // With a prebuilt index (data-index, see faq_index.py) a query is
+        // answered from the index and the DOM is only touched to show the
+        // results; without one, the items' text is scanned.
+        let faqIndex = null;
+        
+        function loadFaqIndex() {
+            const url = searchInput.getAttribute('data-index');
+            if (!url) {
+                return Promise.resolve(null);
+            }
+            if (!faqIndex) {
+                faqIndex = fetch(url)
+                    .then(response => {
+                        if (!response.ok) {
+                            throw new Error(`HTTP ${response.status}`);
                         }
+                        return response.json();
+                    })
+                    .then(index => {
+                        if (index.version !== 1) {
+                            throw new Error(`unsupported index version ${index.version}`);
+                        }
+                        index.keys = Object.keys(index.terms).sort();
+                        index.stopWords = new Set(index.stop_words);
+                        return index;
+                    })
+                    .catch(error => {
+                        console.warn(`FAQ search index not loaded from ${url}, scanning instead:`, error);
+                        return null;
+                    });
+            }
+            return faqIndex;
+        }
+        
+        // Same normalization as faq_index.py
+        function stemFaqWord(index, word) {
+            for (const [suffix, replacement] of index.suffixes) {
+                if (word.endsWith(suffix) && word.length - suffix.length >= index.min_stem) {
+                    return word.slice(0, word.length - suffix.length) + replacement;
+                }
+            }
+            return word;
+        }
+        
+        function faqQueryWords(index, query) {
+            const words = query.normalize('NFKD').replace(/\p{M}/gu, '').toLowerCase().match(/[a-z0-9]+/g) || [];
+            // The word being typed counts even if it is one letter or a stop
+            // word so far ("in" on its way to "insurance")
+            return words.filter((word, i) => i === words.length - 1 || (!index.stopWords.has(word) && word.length > 1));
+        }
+        
+        // Indexed terms starting with prefix (index.keys is sorted)
+        function faqTermsWithPrefix(index, prefix) {
+            let lo = 0;
+            let hi = index.keys.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (index.keys[mid] < prefix) {
+                    lo = mid + 1;
+                } else {
+                    hi = mid;
+                }
+            }
+            const terms = [];
+            for (let i = lo; i < index.keys.length && index.keys[i].startsWith(prefix); i++) {
+                terms.push(index.keys[i]);
+            }
+            return terms;
+        }
+        
+        // Ids of the items containing every word (the last as a prefix);
+        // null (show all) when the query has no words
+        function searchFaqIndex(index, query) {
+            const words = faqQueryWords(index, query);
+            if (words.length === 0) {
+                return null;
+            }
+            let docs = null;
+            words.forEach((word, i) => {
+                const stem = stemFaqWord(index, word);
+                const terms = i < words.length - 1
+                    ? [stem]
+                    : faqTermsWithPrefix(index, stem).concat(faqTermsWithPrefix(index, word));
+                const found = new Set();
+                terms.forEach(term => (index.terms[term] || []).forEach(doc => found.add(doc)));
+                docs = docs === null ? found : new Set([...docs].filter(doc => found.has(doc)));
+            });
+            return new Set([...docs].map(doc => index.docs[doc]));
+        }
+        
+        function scanFaqItems(searchTerm) {
+            if (searchTerm === '') {
+                return null;
+            }
+            const matches = new Set();
+            faqItems.forEach(item => {
+                const question = item.querySelector('.faq-question span').textContent.toLowerCase();
+                const answer = item.querySelector('.faq-answer').textContent.toLowerCase();
+                if (question.includes(searchTerm) || answer.includes(searchTerm)) {
+                    matches.add(item.id);
+                }
+            });
+            return matches;
+        }
+        
+        function showFaqResults(matches) {
+            faqItems.forEach(item => {
+                if (matches === null || matches.has(item.id)) {
+                    item.classList.remove('hidden');
+                } else {
+                    item.classList.add('hidden');
+                    // Close the item if it's open and being hidden
+                    item.classList.remove('active');
+                    const btn = item.querySelector('.faq-question');
+                    const answer = item.querySelector('.faq-answer');
+                    btn.setAttribute('aria-expanded', 'false');
+                    if (answer) {
+                        answer.style.maxHeight = '0';
                     }
+                }
+            });
+            
+            // Show/hide category headers based on visible items
+            faqCategories.forEach(category => {
+                const categoryItems = category.querySelectorAll('.faq-item:not(.hidden)');
+                if (categoryItems.length === 0) {
+                    category.style.display = 'none';
+                } else {
+                    category.style.display = 'block';
+                }
+            });
+        }
+        
+        if (searchInput) {
+            searchInput.addEventListener('focus', function() {
+                loadFaqIndex().then(index => {
+                    if (index) {
+                        return;
+                    }
+                    // Scanning matches answer text, so fetch any lazy answer shards first
+                    Promise.all(Array.from(faqCategories, loadFaqShard)).then(() => {
+                        const searchTerm = searchInput.value.toLowerCase().trim();
+                        if (searchTerm) {
+                            showFaqResults(scanFaqItems(searchTerm));
+                        }
+                    });
                 });
+            }, { once: true });
+            
+            searchInput.addEventListener('input', function() {
+                const searchTerm = this.value.toLowerCase().trim();
                 
-                // Show/hide category headers based on visible items
-                faqCategories.forEach(category => {
-                    const categoryItems = category.querySelectorAll('.faq-item:not(.hidden)');
-                    if (categoryItems.length === 0) {
-                        category.style.display = 'none';
-                    } else {
-                        category.style.display = 'block';
+                loadFaqIndex().then(index => {
+                    // A later keystroke runs its own search
+                    if (searchInput.value.toLowerCase().trim() !== searchTerm) {
+                        return;
                     }
+                    showFaqResults(index ? searchFaqIndex(index, searchTerm) : scanFaqItems(searchTerm));
                 });
                 
                 // Track search usage
@@ -916,120 +834,35 @@ function debounce(func, wait) {
 }
 
 // ===================================
-// Analytics Tracking Helper Functions
+// Deferred Analytics Bundle
 // ===================================
 
-// Track CTA button clicks with enhanced data
-function trackCTAClick(ctaType, section, ctaText, destination) {
-    gtag('event', 'cta_click', {
-        event_category: 'CTA',
-        event_label: ctaType,
-        cta_type: ctaType,
-        section: section,
-        cta_text: ctaText,
-        destination: destination,
-        value: CONVERSION_VALUES[ctaType] || 1
-    });
-}
-
-// Track service interest with psychological context
-function trackServiceInterest(serviceName, interactionType, psychology = null) {
-    gtag('event', 'service_interest', {
-        event_category: 'Services',
-        event_label: serviceName,
-        service_name: serviceName,
-        interaction_type: interactionType,
-        psychological_appeal: psychology,
-        value: CONVERSION_VALUES.service_interest || 1
-    });
-    
-    // Track psychological optimization effectiveness
-    if (psychology) {
-        gtag('event', 'psychological_element_interaction', {
-            event_category: 'Psychology',
-            event_label: psychology,
-            element_type: 'service',
-            service_name: serviceName,
-            interaction_type: interactionType
-        });
+// Tracking isn't needed to render or use the page, so analytics.js (the
+// data-analytics attribute of this script tag) is fetched only after the
+// page has loaded, when the browser is idle.
+(function() {
+    const script = document.currentScript;
+    const src = script && script.getAttribute('data-analytics');
+    if (!src) return;
+
+    function loadAnalytics() {
+        const analytics = document.createElement('script');
+        analytics.src = src;
+        analytics.async = true;
+        document.body.appendChild(analytics);
     }
-}
 
-// Track package interest with psychological context
-function trackPackageInterest(packageName, interactionType, psychology = null) {
-    gtag('event', 'package_interest', {
-        event_category: 'Packages',
-        event_label: packageName,
-        package_name: packageName,
-        interaction_type: interactionType,
-        psychological_appeal: psychology,
-        value: CONVERSION_VALUES.package_interest || 3
-    });
-    
-    // Track psychological optimization effectiveness
-    if (psychology) {
-        gtag('event', 'psychological_element_interaction', {
-            event_category: 'Psychology',
-            event_label: psychology,
-            element_type: 'package',
-            package_name: packageName,
-            interaction_type: interactionType
-        });
+    function schedule() {
+        if ('requestIdleCallback' in window) {
+            requestIdleCallback(loadAnalytics, { timeout: 3000 });
+        } else {
+            setTimeout(loadAnalytics, 200);
+        }
     }
-    
-    // Track choice architecture effectiveness
-    trackChoiceArchitecture(packageName, psychology);
-}
-
-// Track journey progression through phases
-function trackJourneyProgression(fromPhase, toPhase) {
-    gtag('event', 'journey_progression', {
-        event_category: 'Journey',
-        event_label: `${fromPhase}_to_${toPhase}`,
-        from_phase: fromPhase,
-        to_phase: toPhase,
-        value: CONVERSION_VALUES.journey_progression || 2
-    });
-}
-
-// Track choice architecture effectiveness (Rule of 3, Goldilocks Effect, Decoy Effect)
-function trackChoiceArchitecture(choice, psychology) {
-    const architectureType = getArchitectureType(choice, psychology);
-    
-    gtag('event', 'choice_architecture', {
-        event_category: 'Psychology',
-        event_label: architectureType,
-        choice_made: choice,
-        psychological_appeal: psychology,
-        architecture_type: architectureType
-    });
-}
 
-// Determine which psychological principle was triggered
-function getArchitectureType(choice, psychology) {
-    if (psychology && psychology.includes('Most Popular')) {
-        return 'goldilocks_effect';
-    } else if (psychology && psychology.includes('Decoy')) {
-        return 'decoy_effect';
-    } else if (psychology && psychology.includes('Entry')) {
-        return 'entry_point';
+    if (document.readyState === 'complete') {
+        schedule();
+    } else {
+        window.addEventListener('load', schedule);
     }
-    return 'rule_of_three';
-}
-
-// Track A/B test performance for psychological optimization
-function trackPsychologicalOptimization() {
-    gtag('event', 'ab_test_exposure', {
-        event_category: 'A/B Testing',
-        event_label: 'journey_based_3_services',
-        test_variation: 'psychological_3_services',
-        service_count: 3,
-        package_count: 3,
-        psychological_principles: 'rule_of_three,goldilocks_effect,decoy_effect'
-    });
-}
-
-// Initialize psychological optimization tracking on page load
-document.addEventListener('DOMContentLoaded', function() {
-    trackPsychologicalOptimization();
-});
+})();
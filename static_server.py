@@ -0,0 +1,437 @@
+"""Asyncio static file server for `site.py serve` and `site.py dev`.
+
+Serves docs/ the way a CDN in front of it would:
+
+- precompressed files: index.html.br / .gz (see precompress.py) are sent
+  with Content-Encoding when the client accepts them; Vary: Accept-Encoding
+- strong ETags (SHA-256 of the bytes sent, cached per file stat), with
+  304 Not Modified for If-None-Match / If-Modified-Since
+- single byte ranges (Range / If-Range, 206 and 416)
+- HTTP/1.1 keep-alive, with an idle timeout
+- os.sendfile (via loop.sendfile) for large bodies such as images
+- Cache-Control per kind of file: fingerprinted assets (name.<hash>.ext),
+  HTML, everything else
+- GitHub Pages URL rules: /dir -> /dir/, /dir/ -> /dir/index.html,
+  /page -> /page.html, 404.html for missing paths
+
+Only GET and HEAD are supported. A LiveReload-like object can be attached
+for `site.py dev`: its event stream is served at `livereload.path`, its
+client is injected into HTML responses, and nothing is cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable
+from urllib.parse import quote, unquote, urlsplit
+
+SERVER_NAME = "legs-static"
+
+DEFAULT_CACHE_CONTROL = {
+    "immutable": "public, max-age=31536000, immutable",  # name.<8 hex>.ext
+    "html": "no-cache",
+    "default": "public, max-age=3600",
+}
+
+# Fingerprinted names from SiteBuilder.fingerprint_assets (styles.1a2b3c4d.css)
+FINGERPRINTED_RE = re.compile(r"\.[0-9a-f]{8}\.[^./]+$")
+
+# Content-Encoding -> sibling suffix, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+SENDFILE_MIN_BYTES = 64 * 1024
+KEEPALIVE_TIMEOUT = 15.0
+MAX_HEADERS = 100
+
+STATUS_TEXT = {
+    200: "OK", 206: "Partial Content", 301: "Moved Permanently", 304: "Not Modified",
+    400: "Bad Request", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed",
+    416: "Range Not Satisfiable", 500: "Internal Server Error",
+}
+
+
+class _BadRequest(Exception):
+    pass
+
+
+def _http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    """Codings with q > 0 in an Accept-Encoding header."""
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None | bool:
+    """(start, end inclusive) for a single byte range.
+
+    None means ignore the header (serve the whole file), False means the
+    range can't be satisfied.
+    """
+    match = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", header)
+    if not match or not (match.group(1) or match.group(2)):
+        return None  # malformed or multiple ranges
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        length = int(last)
+        if length == 0:
+            return False
+        start, end = max(size - length, 0), size - 1
+    if start >= size:
+        return False
+    return start, end
+
+
+class _Representation:
+    """A file chosen to answer a request, plus its validators."""
+
+    def __init__(self, path: Path, stat: os.stat_result, etag: str, encoding: str | None):
+        self.path = path
+        self.stat = stat
+        self.etag = etag
+        self.encoding = encoding
+
+
+class StaticServer:
+    """Serve a directory over HTTP/1.1 with asyncio."""
+
+    def __init__(self, root: Path | str, host: str = "localhost", port: int = 8000,
+                 cache_control: dict[str, str] | None = None, livereload=None,
+                 log: Callable[[str], None] | None = None):
+        self.root = Path(root).resolve()
+        self.host = host
+        self.port = port
+        self.cache_control = {**DEFAULT_CACHE_CONTROL, **(cache_control or {})}
+        self.livereload = livereload
+        self.log = log
+        self._etags: dict[str, tuple[tuple, str]] = {}  # path -> (stat key, etag)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle_connection, self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+    def run(self) -> None:
+        """Blocking; stops on KeyboardInterrupt (raised to the caller)."""
+        asyncio.run(self.serve_forever())
+
+    # -- connections -------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEPALIVE_TIMEOUT)
+                except _BadRequest:
+                    await self._send_error(writer, 400, "GET", keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                keep_alive = self._keep_alive(version, headers)
+                keep_alive = await self._respond(writer, method, target, headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """(method, target, version, headers) or None at end of stream."""
+        line = await reader.readline()
+        while line in (b"\r\n", b"\n"):  # tolerate stray CRLF between requests
+            line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise _BadRequest()
+        method, target, version = parts
+        headers: dict[str, str] = {}
+        for _ in range(MAX_HEADERS):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                raise _BadRequest()
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise _BadRequest()
+        length = headers.get("content-length")
+        if length:  # GET/HEAD bodies are ignored, but must be consumed
+            if not length.isdigit() or int(length) > 1 << 20:
+                raise _BadRequest()
+            await reader.readexactly(int(length))
+        return method.upper(), target, version, headers
+
+    @staticmethod
+    def _keep_alive(version: str, headers: dict[str, str]) -> bool:
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return "keep-alive" in connection
+        return "close" not in connection
+
+    # -- responses ---------------------------------------------------------
+
+    async def _respond(self, writer, method, target, headers, keep_alive) -> bool:
+        """Answer one request; returns whether the connection stays open."""
+        path = unquote(urlsplit(target).path)
+        if self.livereload and path == self.livereload.path and method == "GET":
+            await self._stream_events(writer)
+            return False
+        if method not in ("GET", "HEAD"):
+            await self._send_error(writer, 405, method, keep_alive, {"Allow": "GET, HEAD"})
+            return keep_alive
+
+        resolved = self._resolve(path)
+        if isinstance(resolved, str):  # redirect
+            query = urlsplit(target).query
+            # The path was unquoted; header values must be Latin-1 (ASCII here)
+            location = quote(resolved + (f"?{query}" if query else ""), safe="/%?=&")
+            self._send_head(writer, 301, {"Location": location, "Content-Length": "0"}, keep_alive)
+            self._log(method, target, 301, 0)
+            return keep_alive
+        status = 200
+        if resolved is None:
+            resolved = self.root / "404.html"
+            status = 404
+            if not resolved.is_file():
+                await self._send_error(writer, 404, method, keep_alive)
+                self._log(method, target, 404, 0)
+                return keep_alive
+
+        if self.livereload and resolved.suffix == ".html":
+            body = self.livereload.inject(resolved.read_bytes())
+            extra = {"Content-Type": "text/html; charset=utf-8", "Content-Length": str(len(body)),
+                     "Cache-Control": "no-store"}
+            self._send_head(writer, status, extra, keep_alive)
+            if method == "GET":
+                writer.write(body)
+            self._log(method, target, status, len(body))
+            return keep_alive
+
+        rep = self._representation(resolved, headers.get("accept-encoding", ""))
+        size = rep.stat.st_size
+        response = {
+            "Content-Type": self._content_type(resolved),
+            "ETag": rep.etag,
+            "Last-Modified": _http_date(rep.stat.st_mtime),
+            "Cache-Control": self._cache_control(resolved),
+            "Accept-Ranges": "bytes",
+        }
+        if rep.encoding:
+            response["Content-Encoding"] = rep.encoding
+        if self._has_siblings(resolved):
+            response["Vary"] = "Accept-Encoding"
+
+        if status == 200 and self._not_modified(rep, headers):
+            for name in ("Content-Type", "Accept-Ranges", "Content-Encoding"):
+                response.pop(name, None)
+            self._send_head(writer, 304, response, keep_alive)
+            self._log(method, target, 304, 0)
+            return keep_alive
+
+        start, end = 0, size - 1
+        if status == 200 and "range" in headers and self._if_range_ok(rep, headers.get("if-range")):
+            byte_range = parse_range(headers["range"], size)
+            if byte_range is False:
+                response = {"Content-Range": f"bytes */{size}", "Content-Length": "0"}
+                self._send_head(writer, 416, response, keep_alive)
+                self._log(method, target, 416, 0)
+                return keep_alive
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        length = max(end - start + 1, 0)
+        response["Content-Length"] = str(length)
+        self._send_head(writer, status, response, keep_alive)
+        if method == "GET" and length:
+            await self._send_file(writer, rep.path, start, length)
+        self._log(method, target, status, length)
+        return keep_alive
+
+    def _send_head(self, writer, status: int, headers: dict[str, str], keep_alive: bool) -> None:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                 f"Date: {formatdate(usegmt=True)}",
+                 f"Server: {SERVER_NAME}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if keep_alive:
+            lines.append(f"Keep-Alive: timeout={int(KEEPALIVE_TIMEOUT)}")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _send_error(self, writer, status: int, method: str, keep_alive: bool,
+                          headers: dict[str, str] | None = None) -> None:
+        body = f"{status} {STATUS_TEXT.get(status, '')}\n".encode("utf-8")
+        response = {"Content-Type": "text/plain; charset=utf-8", "Content-Length": str(len(body)),
+                    "Cache-Control": "no-store", **(headers or {})}
+        self._send_head(writer, status, response, keep_alive)
+        if method != "HEAD":
+            writer.write(body)
+        await writer.drain()
+
+    async def _send_file(self, writer, path: Path, offset: int, count: int) -> None:
+        with open(path, "rb") as f:
+            if count >= SENDFILE_MIN_BYTES:
+                await writer.drain()
+                # os.sendfile where the transport supports it, buffered copy otherwise
+                await asyncio.get_running_loop().sendfile(writer.transport, f, offset, count)
+                return
+            f.seek(offset)
+            writer.write(f.read(count))
+
+    async def _stream_events(self, writer) -> None:
+        self._send_head(writer, 200, {"Content-Type": "text/event-stream", "Cache-Control": "no-store"}, True)
+        q = self.livereload.subscribe()
+        try:
+            writer.write(b": connected\n\n")
+            await writer.drain()
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(q.get(), 15)
+                    message = f"event: {event}\ndata: {data}\n\n"
+                except asyncio.TimeoutError:
+                    message = ": keep-alive\n\n"
+                writer.write(message.encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.livereload.unsubscribe(q)
+
+    def _log(self, method: str, target: str, status: int, length: int) -> None:
+        if self.log:
+            self.log(f"{method} {target} {status} {length}")
+
+    # -- files -------------------------------------------------------------
+
+    def _resolve(self, url_path: str) -> Path | str | None:
+        """File for a URL path, a redirect location (str), or None (404)."""
+        if "\x00" in url_path:
+            return None
+        relative = url_path.lstrip("/")
+        candidate = (self.root / relative).resolve()
+        if candidate != self.root and self.root not in candidate.parents:
+            return None  # escapes the served directory
+        if candidate.is_dir():
+            if not url_path.endswith("/"):
+                return url_path + "/"
+            candidate = candidate / "index.html"
+        elif not candidate.exists() and not candidate.suffix:
+            candidate = candidate.with_name(candidate.name + ".html")
+        if not candidate.is_file() or candidate.name.startswith("."):
+            return None
+        return candidate
+
+    def _has_siblings(self, path: Path) -> bool:
+        return any(path.with_name(path.name + suffix).exists() for _, suffix in ENCODINGS)
+
+    def _representation(self, path: Path, accept_encoding: str) -> _Representation:
+        """The best precompressed sibling the client accepts, or the file."""
+        accepted = _accepted_encodings(accept_encoding)
+        stat = path.stat()
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            sibling = path.with_name(path.name + suffix)
+            try:
+                sibling_stat = sibling.stat()
+            except FileNotFoundError:
+                continue
+            if sibling_stat.st_mtime_ns >= stat.st_mtime_ns:  # stale siblings are ignored
+                return _Representation(sibling, sibling_stat, self._etag(sibling, sibling_stat), encoding)
+        return _Representation(path, stat, self._etag(path, stat), None)
+
+    def _etag(self, path: Path, stat: os.stat_result) -> str:
+        key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        cached = self._etags.get(str(path))
+        if cached and cached[0] == key:
+            return cached[1]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        etag = f'"{h.hexdigest()[:32]}"'
+        self._etags[str(path)] = (key, etag)
+        return etag
+
+    @staticmethod
+    def _not_modified(rep: _Representation, headers: dict[str, str]) -> bool:
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [t.strip() for t in if_none_match.split(",")]
+            # Weak comparison, as RFC 9110 requires for If-None-Match
+            return "*" in tags or rep.etag in (t[2:] if t.startswith("W/") else t for t in tags)
+        since = headers.get("if-modified-since")
+        if since:
+            try:
+                return int(rep.stat.st_mtime) <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    def _if_range_ok(rep: _Representation, if_range: str | None) -> bool:
+        """Whether a Range header applies given If-Range (strong match only)."""
+        if if_range is None:
+            return True
+        if if_range.startswith('"'):
+            return if_range == rep.etag
+        try:
+            return int(rep.stat.st_mtime) == int(parsedate_to_datetime(if_range).timestamp())
+        except (TypeError, ValueError):
+            return False
+
+    def _cache_control(self, path: Path) -> str:
+        if FINGERPRINTED_RE.search(path.name):
+            return self.cache_control["immutable"]
+        if path.suffix == ".html":
+            return self.cache_control["html"]
+        return self.cache_control["default"]
+
+    @staticmethod
+    def _content_type(path: Path) -> str:
+        content_type, _ = mimetypes.guess_type(path.name)
+        content_type = content_type or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in (
+                "application/javascript", "application/json", "image/svg+xml", "application/xml"):
+            content_type += "; charset=utf-8"
+        return content_type
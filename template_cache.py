@@ -0,0 +1,62 @@
+"""Compiled-template caching for the Jinja2 environment.
+
+Two layers, both keyed by template content rather than modification time:
+
+- a FileSystemBytecodeCache (Jinja2 stores each template's compiled code
+  with a checksum of its source and recompiles when the source differs),
+  used by default;
+- precompiled mode: every template compiled ahead of time into a zip of
+  Python modules named after a digest of all template sources, loaded
+  with a ModuleLoader. Nothing is parsed or stat-checked at render time;
+  any template edit produces a new digest and a new archive.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import jinja2
+from jinja2 import Environment, FileSystemBytecodeCache
+
+
+def bytecode_cache(cache_dir: Path) -> FileSystemBytecodeCache:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(str(cache_dir))
+
+
+def templates_digest(template_dir: Path, env: Environment) -> str:
+    """Digest of every template's name and source, plus the settings that
+    change what they compile to."""
+    h = hashlib.sha256()
+    h.update(jinja2.__version__.encode())
+    options = (env.block_start_string, env.block_end_string, env.variable_start_string,
+               env.variable_end_string, env.trim_blocks, env.lstrip_blocks,
+               env.keep_trailing_newline, sorted(env.extensions))
+    h.update(repr(options).encode())
+    for path in sorted(p for p in template_dir.rglob("*") if p.is_file()):
+        h.update(path.relative_to(template_dir).as_posix().encode() + b"\0")
+        h.update(path.read_bytes() + b"\0")
+    return h.hexdigest()
+
+
+def precompiled_archive(env: Environment, template_dir: Path, cache_dir: Path) -> tuple[Path, bool]:
+    """Zip of the current templates compiled to modules, built if needed.
+
+    `env.loader` must be a source loader for template_dir. Returns
+    (archive, whether it was just built). Archives for other digests are
+    removed. Load it with jinja2.ModuleLoader.
+    """
+    digest = templates_digest(template_dir, env)[:16]
+    archive = cache_dir / f"templates-{digest}.zip"
+    built = False
+    if not archive.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = archive.with_suffix(".zip.tmp")
+        env.compile_templates(str(tmp), zip="deflated", ignore_errors=False)
+        tmp.replace(archive)
+        built = True
+    for old in cache_dir.glob("templates-*.zip"):
+        if old != archive:
+            old.unlink()
+    return archive, built
@@ -0,0 +1,109 @@
+"""Tests for the incremental build manifest (build_cache)."""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_site import generate  # noqa: E402
+from build import SiteBuilder  # noqa: E402
+from build_cache import MISSING, BuildManifest, DigestCache, file_digest, text_digest  # noqa: E402
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """A manifest with one output built from page.md and a render option."""
+    (tmp_path / "page.md").write_text("v1", encoding="utf-8")
+    (tmp_path / "page.html").write_text("<p>v1</p>", encoding="utf-8")
+    manifest = BuildManifest(tmp_path / "manifest.json")
+    digests = DigestCache(tmp_path)
+    digests.put("<options>", text_digest("minify"))
+    manifest.record("page.html", file_digest(tmp_path / "page.html"), {
+        "page.md": digests.digest("page.md"),
+        "partial.html": digests.digest("partial.html"),
+        "<options>": digests.digest("<options>"),
+    })
+    manifest.save()
+    return tmp_path
+
+
+def _fresh(root, options="minify"):
+    digests = DigestCache(root)
+    digests.put("<options>", text_digest(options))
+    manifest = BuildManifest(root / "manifest.json")
+    return manifest.is_fresh("page.html", root / "page.html", digests)
+
+
+def test_unchanged_output_is_fresh_after_reload(recorded):
+    assert _fresh(recorded)
+
+
+def test_changed_input_invalidates(recorded):
+    (recorded / "page.md").write_text("v2", encoding="utf-8")
+    assert not _fresh(recorded)
+
+
+def test_input_created_after_build_invalidates(recorded):
+    assert BuildManifest(recorded / "manifest.json").outputs["page.html"]["inputs"]["partial.html"] == MISSING
+    (recorded / "partial.html").write_text("<b>", encoding="utf-8")
+    assert not _fresh(recorded)
+
+
+def test_changed_render_options_invalidate(recorded):
+    assert not _fresh(recorded, options="no minify")
+
+
+def test_edited_or_deleted_output_invalidates(recorded):
+    (recorded / "page.html").write_text("<p>hand edit</p>", encoding="utf-8")
+    assert not _fresh(recorded)
+    (recorded / "page.html").unlink()
+    assert not _fresh(recorded)
+
+
+def test_manifest_from_another_version_is_ignored(recorded):
+    path = recorded / "manifest.json"
+    path.write_text(path.read_text(encoding="utf-8").replace('"version": 2', '"version": 1'), encoding="utf-8")
+    assert BuildManifest(path).outputs == {}
+    assert not _fresh(recorded)
+
+
+def test_refresh_only_updates_tracked_inputs(recorded):
+    manifest = BuildManifest(recorded / "manifest.json")
+    manifest.refresh("page.html", "new", {"page.md": "x", "styles.css": "y"})
+    entry = manifest.outputs["page.html"]
+    assert entry["digest"] == "new"
+    assert entry["inputs"]["page.md"] == "x"
+    assert "styles.css" not in entry["inputs"]
+
+
+@pytest.fixture(scope="module")
+def site(tmp_path_factory):
+    root = generate(tmp_path_factory.mktemp("site") / "site", images=False)
+    for page in sorted((root / "content" / "pages").glob("*.md"))[3:]:
+        page.unlink()
+    return root
+
+
+def _build(root, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return SiteBuilder(project_root=root).build(incremental=True, images=False, precompress=False, **options)
+
+
+def test_incremental_build_rerenders_only_what_changed(site):
+    assert len(_build(site).pages_written) == 3
+    assert _build(site).pages_written == []
+
+    page = sorted((site / "content" / "pages").glob("*.md"))[0]
+    page.write_text(page.read_text(encoding="utf-8") + "\nOne more line.\n", encoding="utf-8")
+    assert _build(site).pages_written == [page.stem + ".html"]
+
+
+def test_toggling_html_minification_rerenders_every_page(site):
+    _build(site)
+    assert len(_build(site, minify_html=True).pages_written) == 3
+    assert _build(site, minify_html=True).pages_written == []
+    assert len(_build(site).pages_written) == 3
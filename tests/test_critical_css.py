@@ -0,0 +1,55 @@
+"""Tests for critical_css."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from critical_css import critical_rules, fold_vocabulary, inline_critical_css  # noqa: E402
+
+PAGE = ('<html><head><link rel="stylesheet" href="styles.abc12345.css"></head><body>'
+        '<header class="header"><a class="logo" href="#hero">x</a></header>'
+        '<main><p class="below">y</p>{filler}<section class="hero"><h1 id="title">t</h1></section>'
+        '<footer class="after">z</footer></main></body></html>')
+CSS = (":root{--brand:red;--unused:blue}\n.logo{color:var(--brand)}\n.below{color:green}\n"
+       "#title{margin:0}\n@media print{.logo{color:black}}\n")
+
+
+def test_fold_vocabulary_covers_only_the_fold_roots():
+    used = fold_vocabulary(PAGE.format(filler=""), [".header", ".hero"])
+    assert used.classes == {"header", "logo", "hero"}
+    assert used.ids == {"title"}
+    assert "p" not in used.tags and "footer" not in used.tags
+
+
+def test_fold_root_far_down_the_page_is_still_found():
+    filler = '<div class="hero-ish" data-x="hero">.hero</div>' * 2000  # near-misses for the string scan
+    used = fold_vocabulary(PAGE.format(filler=filler), [".hero"])
+    assert used.classes == {"hero"}
+    assert used.ids == {"title"}
+
+
+def test_no_fold_root_gives_none():
+    assert fold_vocabulary(PAGE.format(filler=""), [".missing", "aside"]) is None
+
+
+def test_critical_rules_keep_fold_rules_and_drop_print_and_unused_properties():
+    used = fold_vocabulary(PAGE.format(filler=""), [".header"])
+    rules = critical_rules(CSS, used)
+    assert ".logo{color:var(--brand)}" in rules
+    assert "--brand:red" in rules
+    assert "--unused" not in rules and ".below" not in rules and "black" not in rules
+
+
+def test_inline_replaces_blocking_link_and_reinlines_in_place():
+    html = PAGE.format(filler="")
+    once = inline_critical_css(html, ".a{}\n", "styles.abc12345.css")
+    assert '<style id="critical-css">\n.a{}\n</style>' in once
+    assert 'rel="preload" href="styles.abc12345.css" as="style"' in once
+    assert '<noscript><link rel="stylesheet" href="styles.abc12345.css"></noscript>' in once
+    twice = inline_critical_css(once, ".b{}\n", "styles.abc12345.css")
+    assert twice == once.replace(".a{}", ".b{}")
+
+
+def test_inline_leaves_pages_without_the_stylesheet_alone():
+    assert inline_critical_css("<html><head></head></html>", ".a{}\n", "styles.css") is None
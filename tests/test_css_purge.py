@@ -0,0 +1,66 @@
+"""Tests for css_purge."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from css_purge import UsedSelectors, collect_html, collect_script, purge_css, selector_can_match  # noqa: E402
+
+HTML = '<div id="main" class="card featured"><a href="#" data-track="x">Go</a></div>'
+
+
+def test_collect_html_records_tags_classes_ids_and_attrs():
+    used = collect_html(HTML)
+    assert {"div", "a", "html", "body"} <= used.tags
+    assert used.classes == {"card", "featured"}
+    assert used.ids == {"main"}
+    assert {"href", "data-track", "class", "id"} <= used.attrs
+
+
+def test_selector_needs_every_class_id_tag_and_attribute():
+    used = collect_html(HTML)
+    assert selector_can_match(".card.featured > a:hover", used)
+    assert selector_can_match("#main a[data-track]", used)
+    assert selector_can_match(":not(.missing)", used)  # pseudo arguments never drop a selector
+    assert not selector_can_match(".card .missing", used)
+    assert not selector_can_match("#other", used)
+    assert not selector_can_match("table td", used)
+    assert not selector_can_match("a[download]", used)
+
+
+def test_purge_drops_rules_and_selectors_nothing_matches():
+    css = ".card{color:red}\n.gone{color:blue}\n.card, .gone{margin:0}\n"
+    assert purge_css(css, collect_html(HTML)) == ".card{color:red}\n.card{margin:0}\n"
+
+
+def test_purge_recurses_into_media_and_keeps_other_at_rules():
+    css = ('@import url("x.css");\n'
+           '@media (max-width: 600px) { .gone { color: red } }\n'
+           '@media print { .card { color: black } }\n'
+           '@font-face { font-family: X; src: url(x.woff2) }\n'
+           '@keyframes spin { to { transform: rotate(1turn) } }\n')
+    out = purge_css(css, collect_html(HTML))
+    assert "max-width" not in out
+    assert "@media print { .card { color: black } }" in out
+    assert "@font-face" in out and "@keyframes spin" in out and "@import" in out
+
+
+def test_braces_inside_strings_and_comments_do_not_confuse_the_walk():
+    css = '.card::after{content:"}"}\n/* .gone{} */\n.gone{content:"{"}\n.card{color:red}\n'
+    out = purge_css(css, collect_html(HTML))
+    assert out.replace("\n\n", "\n") == '.card::after{content:"}"}\n/* .gone{} */\n.card{color:red}\n'
+
+
+def test_script_words_and_safelist_keep_runtime_classes():
+    used = collect_html(HTML)
+    used.add_words(collect_script("el.classList.toggle('nav-open');"))
+    used.add_safelist(["/^is-/"])
+    assert selector_can_match(".nav-open", used)
+    assert selector_can_match(".is-active", used)
+    assert not selector_can_match(".was-active", used)
+
+
+def test_used_selectors_json_round_trip():
+    used = collect_html(HTML)
+    assert UsedSelectors.from_json(used.to_json()).key() == used.key()
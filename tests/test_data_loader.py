@@ -0,0 +1,22 @@
+"""Tests for data_loader.DataLoader."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_loader import DataLoader  # noqa: E402
+
+
+def test_load_returns_independent_copies(tmp_path):
+    path = tmp_path / "faq.yaml"
+    path.write_text("faqs:\n  general:\n    questions:\n      - question: Why?\n", encoding="utf-8")
+    loader = DataLoader(cache_dir=tmp_path / "cache")
+
+    first = loader.load(path)
+    first["faqs"]["general"]["questions"].append({"question": "Added"})
+    first["extra"] = True
+
+    second = loader.load(path)
+    assert second == {"faqs": {"general": {"questions": [{"question": "Why?"}]}}}
+    assert loader.parsed == 1  # served from the cache, not re-parsed
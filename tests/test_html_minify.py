@@ -0,0 +1,43 @@
+"""Tests for html_minify."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from html_minify import minify_html  # noqa: E402
+
+
+def test_comments_dropped_and_whitespace_collapsed():
+    assert minify_html("<p>a   b</p>\n\n  <!-- note -->\n<div>c</div>") == "<p>a b</p>\n<div>c</div>\n"
+
+
+def test_whitespace_around_a_dropped_comment_still_separates_inline_elements():
+    assert minify_html("<span>a</span>  <!-- x -->  <span>b</span>") == "<span>a</span> <span>b</span>\n"
+
+
+@pytest.mark.parametrize("html", [
+    "<pre>  a\n   b</pre>",
+    "<textarea>  x  </textarea>",
+    "<script>  var a = 1;  // c\n</script>",
+    '<script type="application/ld+json">{ "a":  1 }</script>',
+    "<style>  a  {  }  </style>",
+    '<p title="a   b">x</p>',
+    "<!--[if IE]><p>x</p><![endif]-->",
+])
+def test_raw_text_attributes_and_conditional_comments_untouched(html):
+    assert minify_html(html) == html + "\n"
+
+
+def test_keep_comments_by_prefix():
+    html = "<p>a</p> <!-- keep: x --> <!-- drop --> <b>c</b>"
+    assert minify_html(html, keep_comments=["keep:"]) == "<p>a</p> <!-- keep: x --> <b>c</b>\n"
+
+
+def test_idempotent_on_a_real_template():
+    source = (Path(__file__).resolve().parent.parent / "templates" / "base.html").read_text(encoding="utf-8")
+    once = minify_html(source)
+    assert minify_html(once) == once
+    assert len(once) < len(source)
@@ -0,0 +1,46 @@
+"""Tests for tools/image_optimizer.py."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+Image = pytest.importorskip("PIL.Image")
+
+from tools.image_optimizer import optimize_images  # noqa: E402
+
+SETTINGS = {"formats": ["webp"], "widths": [20], "max_width": 64, "quality": 80}
+
+
+def _files(root: Path) -> set[str]:
+    return {p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file()}
+
+
+def test_rebuild_removes_outputs_of_deleted_sources(tmp_path):
+    src, out, cache = tmp_path / "images", tmp_path / "docs" / "images", tmp_path / "cache"
+    (src / "icons").mkdir(parents=True)
+    Image.new("RGB", (40, 30), "red").save(src / "photo.png")
+    Image.new("RGB", (20, 15), "blue").save(src / "hero_400w.jpg")  # hand-made variant: copied
+    (src / "icons" / "logo.svg").write_text("<svg/>", encoding="utf-8")  # non-raster: copied
+
+    optimize_images(src, out, cache, SETTINGS, jobs=1)
+    assert {"photo.png", "photo.webp", "photo_20w.webp", "hero_400w.jpg", "icons/logo.svg"} <= _files(out)
+
+    (src / "photo.png").unlink()
+    (src / "hero_400w.jpg").unlink()
+    (src / "icons" / "logo.svg").unlink()
+    report = optimize_images(src, out, cache, SETTINGS, jobs=1)
+
+    assert _files(out) == {"image-manifest.json"}
+    assert not (out / "icons").exists()
+    assert report.removed == 5
+
+
+def test_empty_source_directory_writes_an_empty_manifest(tmp_path):
+    src, out = tmp_path / "images", tmp_path / "docs" / "images"
+    src.mkdir()
+    report = optimize_images(src, out, tmp_path / "cache", SETTINGS, jobs=1)
+    assert report.manifest == {}
+    assert _files(out) == {"image-manifest.json"}
@@ -0,0 +1,49 @@
+"""Tests for js_pipeline."""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from js_pipeline import bundle_js, minify_js  # noqa: E402
+
+
+@pytest.mark.parametrize("source, expected", [
+    ('var a = 1; // note\nvar b = "x // y";\n', 'var a=1;var b="x // y";\n'),
+    ("let t = `a  ${ b  +  c }  d`;", "let t=`a  ${ b  +  c }  d`;\n"),
+    ("var r = /[/]\\//g; /* c */", "var r=/[/]\\//g;\n"),
+    ("x = a / b / c;", "x=a / b / c;\n"),
+])
+def test_comments_and_whitespace_go_literals_stay(source, expected):
+    assert minify_js(source) == expected
+
+
+@pytest.mark.parametrize("source", [
+    "return\n/* c */ x",  # return; x
+    "a = b\n/re/g.test(c)",
+    "if (a) { b() }\n(c)()",
+    "a\n++b",
+])
+def test_line_breaks_kept_where_asi_depends_on_them(source):
+    assert "\n" in minify_js(source).rstrip("\n")
+
+
+def test_bundle_concatenates_sources_in_order(tmp_path):
+    (tmp_path / "a.js").write_text("var a = 1;\n", encoding="utf-8")
+    (tmp_path / "b.js").write_text("var b = a + 1;\n", encoding="utf-8")
+    bundled = bundle_js([tmp_path / "a.js", tmp_path / "b.js"])
+    assert bundled.index("var a") < bundled.index("var b")
+    assert bundle_js([tmp_path / "a.js", tmp_path / "b.js"], minify=True).count("\n") <= bundled.count("\n")
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+@pytest.mark.parametrize("script", sorted((ROOT / "static" / "js").glob("*.js")), ids=lambda p: p.name)
+def test_minified_site_scripts_still_parse(script, tmp_path):
+    out = tmp_path / script.name
+    out.write_text(minify_js(script.read_text(encoding="utf-8")), encoding="utf-8")
+    subprocess.run(["node", "--check", str(out)], check=True, capture_output=True)
@@ -0,0 +1,108 @@
+"""Tests for snapshots.SnapshotStore."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from snapshots import SnapshotStore  # noqa: E402
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "content" / "pages").mkdir(parents=True)
+    (root / "content" / "pages" / "home.md").write_text("home v1", encoding="utf-8")
+    (root / "site.config.yaml").write_text("a: 1\n", encoding="utf-8")
+    return root
+
+
+def _store(root):
+    return SnapshotStore(root / "backups", root)
+
+
+def _snapshot(store, name):
+    store.create(["content", "site.config.yaml"], name=name)
+    # names() orders by manifest mtime; keep the order unambiguous
+    stamp = 1_700_000_000 + len(store.names())
+    os.utime(store.manifests / f"{name}.json", (stamp, stamp))
+
+
+def test_restore_brings_back_modified_deleted_and_removes_added_files(project):
+    store = _store(project)
+    _snapshot(store, "backup_1")
+    pages = project / "content" / "pages"
+    (pages / "home.md").write_text("home v2", encoding="utf-8")
+    (pages / "new.md").write_text("new", encoding="utf-8")
+    (project / "site.config.yaml").unlink()
+
+    changes = store.restore("backup_1")
+
+    assert (pages / "home.md").read_text(encoding="utf-8") == "home v1"
+    assert (project / "site.config.yaml").read_text(encoding="utf-8") == "a: 1\n"
+    assert not (pages / "new.md").exists()
+    assert (changes.added, changes.modified, changes.removed) == (
+        ["site.config.yaml"], ["content/pages/home.md"], ["content/pages/new.md"])
+
+
+def test_unchanged_files_are_stored_once(project):
+    store = _store(project)
+    _snapshot(store, "backup_1")
+    _, stored, _ = store.create(["content", "site.config.yaml"], name="backup_2")
+    assert stored == 0
+    assert len(list(store.objects.glob("*/*"))) == 2
+
+
+def test_diff_against_working_tree(project):
+    store = _store(project)
+    _snapshot(store, "backup_1")
+    (project / "content" / "pages" / "home.md").write_text("home v2", encoding="utf-8")
+    assert store.diff("backup_1").modified == ["content/pages/home.md"]
+
+
+def test_prune_counts_prerestore_snapshots_separately(project):
+    store = _store(project)
+    for i in range(4):
+        (project / "content" / "pages" / "home.md").write_text(f"home {i}", encoding="utf-8")
+        _snapshot(store, f"backup_{i}")
+        _snapshot(store, f"prerestore_{i}")
+
+    removed, objects = store.prune(keep_last=2, keep_prerestore=1)
+
+    assert store.names() == ["backup_2", "backup_3", "prerestore_3"]
+    assert removed == 5
+    assert objects == 2  # the contents only backup_0/1 referenced
+    for name in store.names():  # every remaining snapshot still restores
+        for entry in store.load(name)["files"].values():
+            assert store.object_path(entry["digest"]).exists()
+
+
+def test_resolve_accepts_latest_and_unique_fragments(project):
+    store = _store(project)
+    _snapshot(store, "backup_20240101")
+    _snapshot(store, "backup_20240202")
+    assert store.resolve("latest") == "backup_20240202"
+    assert store.resolve("0101") == "backup_20240101"
+    with pytest.raises(ValueError):
+        store.resolve("backup_2024")
+
+
+def test_migrate_legacy_keeps_directories_unless_asked(project):
+    store = _store(project)
+    legacy = project / "backups" / "backup_20240101_120000"
+    (legacy / "content").mkdir(parents=True)
+    (legacy / "content" / "old.md").write_text("old", encoding="utf-8")
+
+    assert store.migrate_legacy() == ["backup_20240101_120000"]
+    assert legacy.exists()
+    assert store.load("backup_20240101_120000")["created"] == "2024-01-01T12:00:00"
+    assert store.migrate_legacy() == []  # already imported
+
+    store.manifests.joinpath("backup_20240101_120000.json").unlink()
+    store.migrate_legacy(remove=True)
+    assert not legacy.exists()
+    store.restore("backup_20240101_120000")
+    assert (project / "content" / "old.md").read_text(encoding="utf-8") == "old"
@@ -0,0 +1,97 @@
+"""Tests for static_server.StaticServer (over a real socket)."""
+
+import asyncio
+import gzip
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from static_server import StaticServer  # noqa: E402
+
+BODY = b"0123456789" * 100
+
+
+def _get(root, target, **headers):
+    """(status, headers, body) for one request with Connection: close."""
+    async def run():
+        server = await StaticServer(root, host="127.0.0.1", port=0).start()
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        lines = [f"GET {target} HTTP/1.1", "Host: localhost", "Connection: close"]
+        lines += [f"{name.replace('_', '-')}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        raw = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return raw
+
+    head, _, body = asyncio.run(run()).partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    parsed = {k.lower(): v for k, v in (line.split(": ", 1) for line in header_lines)}
+    return int(status_line.split()[1]), parsed, body
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "data.txt").write_bytes(BODY)
+    (tmp_path / "page.html").write_text("<p>page</p>", encoding="utf-8")
+    (tmp_path / "styles.css").write_text("body{}" * 50, encoding="utf-8")
+    (tmp_path / "styles.css.gz").write_bytes(gzip.compress(b"body{}" * 50))
+    (tmp_path / "日本").mkdir()
+    (tmp_path / "日本" / "index.html").write_text("<p>jp</p>", encoding="utf-8")
+    return tmp_path
+
+
+def test_range_returns_partial_content(site):
+    status, headers, body = _get(site, "/data.txt", Range="bytes=10-19")
+    assert status == 206
+    assert headers["content-range"] == f"bytes 10-19/{len(BODY)}"
+    assert body == BODY[10:20]
+
+
+def test_suffix_range_and_unsatisfiable_range(site):
+    status, _, body = _get(site, "/data.txt", Range="bytes=-5")
+    assert (status, body) == (206, BODY[-5:])
+    status, headers, _ = _get(site, "/data.txt", Range=f"bytes={len(BODY)}-")
+    assert status == 416
+    assert headers["content-range"] == f"bytes */{len(BODY)}"
+
+
+def test_if_range_with_stale_etag_sends_whole_file(site):
+    status, _, body = _get(site, "/data.txt", Range="bytes=0-9", If_Range='"stale"')
+    assert (status, body) == (200, BODY)
+
+
+def test_etag_revalidation_returns_304(site):
+    status, headers, _ = _get(site, "/data.txt")
+    assert status == 200
+    status, _, body = _get(site, "/data.txt", If_None_Match=headers["etag"])
+    assert (status, body) == (304, b"")
+    status, _, _ = _get(site, "/data.txt", If_None_Match='"other"')
+    assert status == 200
+
+
+def test_precompressed_sibling_for_accepting_clients(site):
+    status, headers, body = _get(site, "/styles.css", Accept_Encoding="gzip")
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == b"body{}" * 50
+    _, headers, body = _get(site, "/styles.css")
+    assert "content-encoding" not in headers and body == b"body{}" * 50
+
+
+def test_github_pages_url_rules(site):
+    assert _get(site, "/page")[2] == b"<p>page</p>"
+    assert _get(site, "/missing")[0] == 404
+    assert _get(site, "/../etc/passwd")[0] == 404
+
+
+def test_directory_redirect_with_non_latin1_path(site):
+    status, headers, _ = _get(site, "/%E6%97%A5%E6%9C%AC?x=1")
+    assert status == 301
+    assert headers["location"] == "/%E6%97%A5%E6%9C%AC/?x=1"
@@ -0,0 +1,51 @@
+"""Tests for template_cache."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from jinja2 import Environment, FileSystemLoader, ModuleLoader
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from template_cache import precompiled_archive, templates_digest  # noqa: E402
+
+
+@pytest.fixture
+def templates(tmp_path):
+    root = tmp_path / "templates"
+    (root / "partials").mkdir(parents=True)
+    (root / "base.html").write_text("<h1>{{ title }}</h1>{% include 'partials/foot.html' %}", encoding="utf-8")
+    (root / "partials" / "foot.html").write_text("<footer>v1</footer>", encoding="utf-8")
+    return root
+
+
+def _env(root):
+    return Environment(loader=FileSystemLoader(str(root)))
+
+
+def test_digest_follows_sources_and_settings(templates):
+    digest = templates_digest(templates, _env(templates))
+    assert templates_digest(templates, _env(templates)) == digest
+
+    trimmed = _env(templates)
+    trimmed.trim_blocks = True
+    assert templates_digest(templates, trimmed) != digest
+
+    (templates / "partials" / "foot.html").write_text("<footer>v2</footer>", encoding="utf-8")
+    assert templates_digest(templates, _env(templates)) != digest
+
+
+def test_archive_is_reused_until_a_template_changes(templates, tmp_path):
+    cache = tmp_path / "cache"
+    first, built = precompiled_archive(_env(templates), templates, cache)
+    assert built
+    assert precompiled_archive(_env(templates), templates, cache) == (first, False)
+
+    (templates / "partials" / "foot.html").write_text("<footer>v2</footer>", encoding="utf-8")
+    second, built = precompiled_archive(_env(templates), templates, cache)
+    assert built and second != first
+    assert list(cache.glob("templates-*.zip")) == [second]
+
+    env = Environment(loader=ModuleLoader(str(second)))
+    assert env.get_template("base.html").render(title="Hi") == "<h1>Hi</h1><footer>v2</footer>"
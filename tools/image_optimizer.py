@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""Parallel image optimization pipeline.
+
+Mirrors static/images into the output tree. Every JPEG/PNG source is
+re-encoded (never larger than the original, capped at `max_width`) and gets
+resized variants named `<stem>_<width>w.<ext>` plus full-size copies in the
+other configured formats (`<stem>.webp`, `<stem>.avif`). Files that already
+exist in the source tree under a variant's name win over generated ones, so
+hand-made variants keep working. Everything else is copied as-is.
+
+Generated files live in a content-hash cache (by default
+.build-cache/images/) so unchanged sources are never re-encoded; the output
+tree is filled from that cache. An image-manifest.json describing every
+variant (format, intrinsic width/height) is written next to the images for
+the build's responsive `picture` macro.
+
+Settings come from `tools.image_optimizer` in site.config.yaml.
+
+Usage:
+    python tools/image_optimizer.py [--source static/images] [--output docs/images]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from PIL import Image, features
+
+# Bump when encoding behavior changes so cached outputs are regenerated.
+PIPELINE_VERSION = 1
+
+DEFAULT_SETTINGS: dict[str, Any] = {
+    "enabled": True,
+    "quality": 85,
+    "formats": ["webp", "jpg"],
+    "widths": [400, 800, 1200],
+    "max_width": 2000,
+    "jobs": 0,
+}
+
+RASTER_SUFFIXES = {".jpg", ".jpeg", ".png"}
+EXTENSIONS = {"jpg": ".jpg", "png": ".png", "webp": ".webp", "avif": ".avif"}
+PIL_FORMATS = {"jpg": "JPEG", "png": "PNG", "webp": "WEBP", "avif": "AVIF"}
+
+# Sources that are themselves width variants are copied, not re-processed.
+VARIANT_RE = re.compile(r"_\d+w$")
+
+
+@dataclass
+class ImageReport:
+    processed: int = 0
+    cached: int = 0
+    copied: int = 0
+    removed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    manifest: dict[str, Any] = field(default_factory=dict)
+
+
+def load_settings(root: Path | str) -> dict[str, Any]:
+    """Read tools.image_optimizer from site.config.yaml, filling defaults."""
+    config_path = Path(root) / "site.config.yaml"
+    config: dict[str, Any] = {}
+    if config_path.exists():
+        with open(config_path, encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get("tools", {}).get("image_optimizer", {}) or {})
+    return settings
+
+
+def supported_formats(formats: list[str]) -> list[str]:
+    """Drop formats this Pillow build cannot encode."""
+    available = []
+    for fmt in formats:
+        fmt = "jpg" if fmt == "jpeg" else fmt
+        if fmt == "avif" and not _avif_available():
+            print("   ⚠️  AVIF encoding not available in this Pillow build; skipping AVIF")
+            continue
+        if fmt in PIL_FORMATS and fmt not in available:
+            available.append(fmt)
+    return available
+
+
+def _avif_available() -> bool:
+    try:
+        if features.check_module("avif"):
+            return True
+    except ValueError:  # Pillow older than 11.2 has no AVIF module
+        pass
+    try:
+        import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+        return True
+    except ImportError:
+        return False
+
+
+def _settings_digest(settings: dict[str, Any]) -> str:
+    relevant = {k: settings[k] for k in ("quality", "formats", "widths", "max_width")}
+    relevant["version"] = PIPELINE_VERSION
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()
+
+
+def _save(image: Image.Image, path: Path, fmt: str, quality: int) -> None:
+    if fmt == "jpg":
+        image.convert("RGB").save(path, "JPEG", quality=quality, optimize=True, progressive=True)
+    elif fmt == "png":
+        image.save(path, "PNG", optimize=True)
+    elif fmt == "webp":
+        image.save(path, "WEBP", quality=quality, method=6)
+    else:
+        image.save(path, PIL_FORMATS[fmt], quality=quality)
+
+
+def _resize(image: Image.Image, width: int) -> Image.Image:
+    if image.width <= width:
+        return image
+    height = round(image.height * width / image.width)
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def process_image(source: Path, rel: str, cache_root: Path, settings: dict[str, Any],
+                  reserved: frozenset[str]) -> list[dict[str, Any]]:
+    """Encode one source into cache_root; return the outputs it produced.
+
+    `reserved` holds sibling filenames that exist in the source tree and
+    must not be overwritten by generated variants.
+    """
+    rel_path = Path(rel)
+    out_dir = cache_root / rel_path.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    quality = int(settings["quality"])
+
+    with Image.open(source) as opened:
+        opened.load()
+        image = opened.copy()
+
+    has_alpha = image.mode in ("RGBA", "LA", "P") and (
+        image.mode != "P" or "transparency" in image.info
+    )
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    source_fmt = "png" if rel_path.suffix.lower() == ".png" else "jpg"
+    # JPEG can't carry transparency; fall back to PNG for alpha images.
+    formats = ["png" if (f == "jpg" and has_alpha) else f for f in settings["formats"]]
+    full = _resize(image, int(settings["max_width"]))
+
+    outputs: list[dict[str, Any]] = []
+
+    def emit(name: str, img: Image.Image, fmt: str) -> None:
+        if name in reserved and name != rel_path.name:
+            return
+        target = out_dir / name
+        _save(img, target, fmt, quality)
+        outputs.append({
+            "path": (rel_path.parent / name).as_posix(),
+            "width": img.width,
+            "height": img.height,
+            "format": fmt,
+        })
+
+    # Original name: re-encoded, but never larger than the source unless resized.
+    emit(rel_path.name, full, source_fmt)
+    original = out_dir / rel_path.name
+    if full is image and original.stat().st_size >= source.stat().st_size:
+        shutil.copyfile(source, original)
+
+    for fmt in dict.fromkeys(formats):
+        if fmt != source_fmt:
+            emit(rel_path.stem + EXTENSIONS[fmt], full, fmt)
+
+    for width in sorted(set(int(w) for w in settings["widths"])):
+        if width >= full.width:
+            continue
+        resized = _resize(image, width)
+        for fmt in dict.fromkeys(formats):
+            emit(f"{rel_path.stem}_{width}w{EXTENSIONS[fmt]}", resized, fmt)
+
+    return outputs
+
+
+def build_manifest(source_dir: Path, index: dict[str, Any]) -> dict[str, Any]:
+    """Describe every optimized source and all of its variants.
+
+    Keys are paths relative to the images directory. Hand-made siblings in
+    the source tree (`<stem>_<width>w.<ext>`, `<stem>.webp`) are included
+    alongside generated outputs.
+    """
+    manifest: dict[str, Any] = {}
+    for rel, entry in sorted(index.items()):
+        rel_path = Path(rel)
+        variants = {o["path"]: o for o in entry["outputs"]}
+        sibling_re = re.compile(rf"{re.escape(rel_path.stem)}(_\d+w)?\.(jpe?g|png|webp|avif)")
+        for sibling in (source_dir / rel_path.parent).iterdir():
+            sibling_rel = (rel_path.parent / sibling.name).as_posix()
+            if sibling_rel in variants or not sibling_re.fullmatch(sibling.name):
+                continue
+            with Image.open(sibling) as img:
+                width, height = img.size
+            fmt = sibling.suffix.lower().lstrip(".").replace("jpeg", "jpg")
+            variants[sibling_rel] = {"path": sibling_rel, "width": width, "height": height, "format": fmt}
+
+        original = variants.get(rel)
+        if not original:
+            continue
+        manifest[rel] = {
+            "width": original["width"],
+            "height": original["height"],
+            "format": original["format"],
+            "variants": sorted(variants.values(), key=lambda v: (v["format"], v["width"])),
+        }
+    return manifest
+
+
+def _process_task(task: tuple) -> tuple[str, list[dict[str, Any]]]:
+    source, rel, cache_root, settings, reserved = task
+    return rel, process_image(source, rel, cache_root, settings, reserved)
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _install(src: Path, dest: Path) -> None:
+    """Copy src to dest unless dest already matches by size and mtime."""
+    try:
+        s, d = src.stat(), dest.stat()
+        if s.st_size == d.st_size and int(s.st_mtime) == int(d.st_mtime):
+            return
+    except FileNotFoundError:
+        pass
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dest)
+
+
+def optimize_images(source_dir: Path | str, output_dir: Path | str, cache_dir: Path | str,
+                    settings: dict[str, Any], jobs: int | None = None,
+                    force: bool = False, install=None) -> ImageReport:
+    """Run the pipeline from source_dir into output_dir.
+
+    install(src, dest) puts a file in place; build.py passes its delta
+    sync (reflink/hardlink aware). Defaults to a size/mtime-checked copy.
+    """
+    install = install or _install
+    source_dir, output_dir, cache_dir = Path(source_dir), Path(output_dir), Path(cache_dir)
+    cache_root = cache_dir / "images"
+    index_path = cache_dir / "images.json"
+    report = ImageReport()
+
+    settings = dict(settings)
+    settings["formats"] = supported_formats(list(settings["formats"]))
+    settings_digest = _settings_digest(settings)
+
+    try:
+        index: dict[str, Any] = json.loads(index_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        index = {}
+
+    sources = sorted(p for p in source_dir.rglob("*") if p.is_file())
+    names_by_dir: dict[Path, set[str]] = {}
+    for path in sources:
+        names_by_dir.setdefault(path.parent, set()).add(path.name)
+
+    tasks = []
+    fresh_index: dict[str, Any] = {}
+    installed: set[str] = set()
+
+    for path in sources:
+        rel = path.relative_to(source_dir).as_posix()
+        report.bytes_in += path.stat().st_size
+        if path.suffix.lower() not in RASTER_SUFFIXES or VARIANT_RE.search(path.stem):
+            install(path, output_dir / rel)
+            installed.add(rel)
+            report.copied += 1
+            continue
+
+        digest = _file_digest(path)
+        entry = index.get(rel)
+        if (
+            not force
+            and entry
+            and entry.get("digest") == digest
+            and entry.get("settings") == settings_digest
+            and all((cache_root / o["path"]).exists() for o in entry["outputs"])
+        ):
+            fresh_index[rel] = entry
+            report.cached += 1
+            continue
+
+        fresh_index[rel] = {"digest": digest, "settings": settings_digest, "outputs": []}
+        reserved = frozenset(names_by_dir[path.parent])
+        tasks.append((path, rel, cache_root, settings, reserved))
+
+    if tasks:
+        workers = jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
+        workers = min(workers, len(tasks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_process_task, tasks))
+        else:
+            results = [_process_task(task) for task in tasks]
+        for rel, outputs in results:
+            fresh_index[rel]["outputs"] = outputs
+            report.processed += 1
+
+    for rel, entry in fresh_index.items():
+        for output in entry["outputs"]:
+            if output["path"] in installed:
+                continue
+            install(cache_root / output["path"], output_dir / output["path"])
+            installed.add(output["path"])
+
+    # Drop cached encodes no longer produced (deleted sources, changed settings).
+    for entry in index.values():
+        for output in entry.get("outputs", []):
+            stale = cache_root / output["path"]
+            if output["path"] not in installed and stale.exists():
+                stale.unlink()
+
+    report.manifest = build_manifest(source_dir, fresh_index)
+    manifest_path = output_dir / "image-manifest.json"
+    output_dir.mkdir(parents=True, exist_ok=True)  # nothing installed from an empty images/
+    manifest_json = json.dumps(report.manifest, indent=2, sort_keys=True) + "\n"
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != manifest_json:
+        manifest_path.write_text(manifest_json, encoding="utf-8")
+    installed.add(manifest_path.name)
+
+    # Like AssetSync.tree: anything in output_dir this run didn't produce
+    # (variants and passthrough copies of deleted sources) is stale.
+    for dest in sorted(output_dir.rglob("*"), reverse=True):
+        if dest.is_file() and dest.relative_to(output_dir).as_posix() not in installed:
+            dest.unlink()
+            report.removed += 1
+        elif dest.is_dir() and not any(dest.iterdir()):
+            dest.rmdir()
+
+    report.bytes_out = sum((output_dir / rel).stat().st_size for rel in installed)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(json.dumps(fresh_index, indent=2, sort_keys=True), encoding="utf-8")
+    return report
+
+
+def main() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Optimize site images")
+    parser.add_argument("--source", default=repo_root / "static" / "images", type=Path)
+    parser.add_argument("--output", default=repo_root / "docs" / "images", type=Path)
+    parser.add_argument("--cache", default=repo_root / ".build-cache", type=Path)
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Worker processes (0 = one per CPU core)")
+    parser.add_argument("--force", action="store_true", help="Re-encode every image, ignoring the cache")
+    args = parser.parse_args()
+
+    settings = load_settings(repo_root)
+    if not settings.get("enabled", True):
+        print("Image optimizer disabled in site.config.yaml")
+        return
+    if not args.source.exists():
+        sys.exit(f"Source directory not found: {args.source}")
+
+    jobs = args.jobs if args.jobs is not None else settings.get("jobs", 0)
+    report = optimize_images(args.source, args.output, args.cache, settings, jobs=jobs, force=args.force)
+    print(
+        f"Images: {report.processed} processed, {report.cached} cached, "
+        f"{report.copied} copied, {report.removed} removed "
+        f"({report.bytes_in:,} source bytes -> {report.bytes_out:,} output bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
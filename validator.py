@@ -7,17 +7,29 @@ so validation silently no-op'd. This implementation focuses on:
 - CSS parseability (cssutils)
 
 It is intentionally conservative: it reports issues but avoids false positives.
+
+Each document is parsed once (BeautifulSoup on the html5lib tree builder)
+and the whole run is memoized, so reporting doesn't re-validate.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import cssutils
 from bs4 import BeautifulSoup
-import html5lib
+
+
+# Bump whenever a check is added or changed so cached results are discarded.
+RULES_VERSION = 1
 
 
 @dataclass
@@ -27,70 +39,158 @@ class ValidationResult:
     warnings: list[str]
 
 
-class SiteValidator:
-    def __init__(self, output_dir: Path | str):
-        self.output_dir = Path(output_dir)
+def _check_html_file(html_path: Path) -> tuple[list[str], list[str]]:
+    """Validate one HTML document. Parses it exactly once (html5lib tree builder)."""
+    errors: list[str] = []
+    warnings: list[str] = []
 
-        # Keep cssutils quiet unless there's a real problem.
-        cssutils.log.setLevel("FATAL")
+    raw = html_path.read_text(encoding="utf-8", errors="replace")
+    try:
+        soup = BeautifulSoup(raw, "html5lib")
+    except Exception as exc:  # pragma: no cover
+        errors.append(f"{html_path.name}: HTML parse error: {exc}")
+        return errors, warnings
 
-    def validate_all(self) -> list[ValidationResult]:
-        results: list[ValidationResult] = []
-        results.append(self._validate_html())
-        results.append(self._validate_css())
-        return results
+    title = soup.find("title")
+    if not title or not (title.get_text(strip=True)):
+        errors.append(f"{html_path.name}: missing or empty <title>")
 
-    def _validate_html(self) -> ValidationResult:
-        errors: list[str] = []
-        warnings: list[str] = []
+    for img in soup.find_all("img"):
+        if img.has_attr("alt"):
+            continue
+        # Decorative images should still provide alt="".
+        warnings.append(f"{html_path.name}: <img> missing alt attribute")
+
+    return errors, warnings
+
+
+def _check_css_file(css_path: Path) -> tuple[list[str], list[str]]:
+    errors: list[str] = []
+    cssutils.log.setLevel("FATAL")
+    css_text = css_path.read_text(encoding="utf-8", errors="replace")
+    try:
+        cssutils.parseString(css_text)
+    except Exception as exc:  # pragma: no cover
+        errors.append(f"{css_path.name}: CSS parse error: {exc}")
+    return errors, []
 
-        html_files = sorted(self.output_dir.glob("*.html"))
-        if not html_files:
-            errors.append("No HTML files found in output directory")
-            return ValidationResult("html", errors, warnings)
 
-        for html_path in html_files:
-            raw = html_path.read_text(encoding="utf-8", errors="replace")
+def _timed_check(fn, path: Path):
+    """Run a check and return (outcome, profiler span) for --profile."""
+    started = time.perf_counter_ns()
+    outcome = fn(path)
+    duration = time.perf_counter_ns() - started
+    kind = "html" if fn is _check_html_file else "css"
+    return outcome, (f"{kind} {path.name}", "validate", started, duration,
+                     os.getpid(), threading.get_ident(), {})
 
-            # Parse with html5lib for robustness.
-            try:
-                document = html5lib.parse(raw, treebuilder="etree")
-                if document is None:
-                    errors.append(f"{html_path.name}: html5lib returned no document")
-            except Exception as exc:  # pragma: no cover
-                errors.append(f"{html_path.name}: HTML parse error: {exc}")
-                continue
 
-            soup = BeautifulSoup(raw, "html.parser")
+class SiteValidator:
+    """Validates a built site.
+
+    Results are computed once and memoized; generate_report() and
+    save_report() reuse them. Files are checked in a process pool when
+    there is more than one to check and more than one worker.
+
+    With a cache_path, per-file results are stored keyed by content hash
+    and RULES_VERSION; use_cache=True replays them for unchanged files
+    instead of re-parsing.
 
-            title = soup.find("title")
-            if not title or not (title.get_text(strip=True)):
-                errors.append(f"{html_path.name}: missing or empty <title>")
+    A profiler.Profiler passed as `profiler` receives a span per checked
+    file, including those checked in worker processes.
+    """
 
-            for img in soup.find_all("img"):
-                if img.has_attr("alt"):
-                    continue
-                # Decorative images should still provide alt="".
-                warnings.append(f"{html_path.name}: <img> missing alt attribute")
+    def __init__(self, output_dir: Path | str, jobs: int | None = None,
+                 cache_path: Path | str | None = None, use_cache: bool = False,
+                 profiler=None):
+        self.output_dir = Path(output_dir)
+        self.profiler = profiler
+        self.jobs = jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.use_cache = use_cache and self.cache_path is not None
+        self.checked: list[str] = []  # files actually parsed by the last run
+        self.replayed: list[str] = []  # files answered from the cache
+        self._results: list[ValidationResult] | None = None
 
-        return ValidationResult("html", errors, warnings)
+        # Keep cssutils quiet unless there's a real problem.
+        cssutils.log.setLevel("FATAL")
 
-    def _validate_css(self) -> ValidationResult:
-        errors: list[str] = []
-        warnings: list[str] = []
+    def _load_cache(self) -> dict[str, Any]:
+        if not self.cache_path:
+            return {}
+        try:
+            payload = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        if payload.get("rules") != RULES_VERSION:
+            return {}
+        return payload.get("files", {})
+
+    def _save_cache(self, files: dict[str, Any]) -> None:
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"rules": RULES_VERSION, "files": files}
+        self.cache_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+
+    def validate_all(self, refresh: bool = False) -> list[ValidationResult]:
+        if self._results is not None and not refresh:
+            return self._results
 
+        html_files = sorted(self.output_dir.glob("*.html"))
         css_path = self.output_dir / "styles.css"
+
+        tasks = [(_check_html_file, path) for path in html_files]
+        if css_path.exists():
+            tasks.append((_check_css_file, css_path))
+
+        cache = self._load_cache()
+        fresh_cache: dict[str, Any] = {}
+        outcomes: dict[str, tuple[list[str], list[str]]] = {}
+        pending = []
+        for fn, path in tasks:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest() if self.cache_path else ""
+            entry = cache.get(path.name)
+            if self.use_cache and entry and entry["digest"] == digest:
+                outcomes[path.name] = (entry["errors"], entry["warnings"])
+                fresh_cache[path.name] = entry
+            else:
+                pending.append((fn, path, digest))
+
+        workers = min(self.jobs, len(pending))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_timed_check, fn, path) for fn, path, _ in pending]
+                timed = [f.result() for f in futures]
+        else:
+            timed = [_timed_check(fn, path) for fn, path, _ in pending]
+        results = [outcome for outcome, _ in timed]
+        if self.profiler is not None:
+            self.profiler.extend([span for _, span in timed])
+
+        for (_, path, digest), (errors, warnings) in zip(pending, results):
+            outcomes[path.name] = (errors, warnings)
+            fresh_cache[path.name] = {"digest": digest, "errors": errors, "warnings": warnings}
+
+        self.checked = [path.name for _, path, _ in pending]
+        self.replayed = [name for name in outcomes if name not in self.checked]
+        self._save_cache(fresh_cache)
+
+        html = ValidationResult("html", [], [])
+        if not html_files:
+            html.errors.append("No HTML files found in output directory")
+        css = ValidationResult("css", [], [])
         if not css_path.exists():
-            errors.append("Missing styles.css in output")
-            return ValidationResult("css", errors, warnings)
+            css.errors.append("Missing styles.css in output")
 
-        css_text = css_path.read_text(encoding="utf-8", errors="replace")
-        try:
-            cssutils.parseString(css_text)
-        except Exception as exc:  # pragma: no cover
-            errors.append(f"styles.css: CSS parse error: {exc}")
+        for fn, path in tasks:
+            target = html if fn is _check_html_file else css
+            errors, warnings = outcomes[path.name]
+            target.errors.extend(errors)
+            target.warnings.extend(warnings)
 
-        return ValidationResult("css", errors, warnings)
+        self._results = [html, css]
+        return self._results
 
     def generate_report(self) -> str:
         results = self.validate_all()
@@ -124,6 +224,4 @@ class SiteValidator:
                 for r in results
             ],
         }
-        import json
-
         path.write_text(json.dumps(payload, indent=2), encoding="utf-8")